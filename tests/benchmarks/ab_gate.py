@@ -0,0 +1,256 @@
+# Copyright (c) Microsoft Corporation. All rights reserved.
+# Licensed under the MIT License.
+"""A/B performance gate between two extension bundle versions.
+
+Runs the same benchmarks against a baseline bundle (by default the
+previous release served by the mock extension site) and a candidate
+bundle (by default bundleConfig.json's), alternating the order every
+round so drift on the machine affects both equally. Each run restarts
+the host with the bundle pinned in host.json and yields one sample per
+metric:
+
+* ``<function>.p50_ms`` and ``<function>.p95_ms``: per-binding latency
+  from the invocations the host logged (lower is better).
+* ``throughput_per_s``: completed invocations per second over the
+  workload (higher is better).
+
+A metric regresses when its median moved in the bad direction by more
+than ``--threshold`` (relative) and the Mann-Whitney U test finds the two
+sets of runs different at ``--alpha``; Cliff's delta is reported as the
+effect size. Either condition alone is not enough: small shifts can be
+significant and large ones can be noise with few runs. The exit code is
+1 when any metric regressed::
+
+    python -m tests.benchmarks.ab_gate --baseline 4.24.0 --candidate 4.25.0 \\
+        --benchmark tests/benchmarks/http_functions=tests.benchmarks.workloads:http_ping \\
+        --repeat 8 --output ab_gate
+"""
+
+import argparse
+import csv
+import json
+import logging
+import os
+import pathlib
+import statistics
+import sys
+
+from tests.benchmarks import sweep
+from tests.benchmarks.cold_start import available_bundle_versions
+from tests.benchmarks.stats import cliffs_delta, mann_whitney_u
+from tests.tools.extension_load_report import version_key
+from tests.utils import testutils
+from tests.utils.run_namespace import get_run_id
+
+DEFAULT_BENCHMARKS = [
+    'tests/benchmarks/http_functions=tests.benchmarks.workloads:http_ping',
+]
+DEFAULT_THRESHOLD = 0.10
+DEFAULT_ALPHA = 0.05
+
+CSV_FIELDS = ['benchmark', 'metric', 'baseline_n', 'candidate_n', 'baseline_median',
+              'candidate_median', 'change', 'u', 'p', 'cliffs_delta', 'regressed']
+
+
+def parse_benchmark(spec):
+    """Split ``app_dir=module:function`` into the app directory and workload spec."""
+    app_dir, sep, workload = spec.partition('=')
+    if not sep or ':' not in workload:
+        raise ValueError(f"Benchmark must be 'app_dir=module:function', got '{spec}'")
+    return pathlib.Path(app_dir), workload
+
+
+def previous_version(versions, version):
+    """Return the highest of ``versions`` below ``version``, or None."""
+    earlier = [v for v in versions if version_key(v) < version_key(version)]
+    return max(earlier, key=version_key) if earlier else None
+
+
+def higher_is_better(metric):
+    return metric.startswith('throughput')
+
+
+def run_metrics(result):
+    """Flatten a sweep.run_combination result into the gated metrics."""
+    metrics = {'throughput_per_s': result['metrics'].get('throughput_per_s')}
+    for function, stats in result['functions'].items():
+        metrics[f'{function}.p50_ms'] = stats.get('p50_ms')
+        metrics[f'{function}.p95_ms'] = stats.get('p95_ms')
+    return {name: value for name, value in metrics.items() if value is not None}
+
+
+def run_ab(benchmarks, baseline, candidate, repeat=5, log_profile='benchmark',
+           run=sweep.run_combination):
+    """Run every benchmark ``repeat`` times against both bundle versions.
+
+    Args:
+        benchmarks: List of ``(app_dir, workload_spec)``.
+        run: Callable with sweep.run_combination's signature; replaced
+            when testing the gate itself.
+
+    Raises:
+        RuntimeError: If a run's host.json does not pin the requested version.
+
+    Returns:
+        One dict per run with ``benchmark``, ``bundle_version``, ``run``
+        and ``metrics``.
+    """
+    samples = []
+    for index in range(repeat):
+        # ABBA ordering: neither version always runs first
+        order = (baseline, candidate) if index % 2 == 0 else (candidate, baseline)
+        for app_dir, workload in benchmarks:
+            for version in order:
+                result = run(app_dir, {}, sweep.load_workload(workload), log_profile,
+                             bundle_version=version)
+                # A run on another bundle would compare a version against itself
+                if result.get('bundle_version') != f'[{version}]':
+                    raise RuntimeError(
+                        f"{app_dir.name} ran with bundle {result.get('bundle_version')} "
+                        f"instead of the pinned [{version}]")
+                metrics = run_metrics(result)
+                logging.info(f"{app_dir.name} / {version} #{index}: {metrics}")
+                samples.append({'benchmark': app_dir.name, 'bundle_version': version,
+                                'run': index, 'metrics': metrics})
+    return samples
+
+
+def compare(samples, baseline, candidate, threshold=DEFAULT_THRESHOLD, alpha=DEFAULT_ALPHA):
+    """Compare the candidate's samples of every metric with the baseline's.
+
+    ``change`` is the relative change of the median, positive when the
+    candidate is worse whatever the direction of the metric.
+    """
+    values = {}
+    for sample in samples:
+        for metric, value in sample['metrics'].items():
+            key = (sample['benchmark'], metric)
+            values.setdefault(key, {baseline: [], candidate: []})
+            values[key].setdefault(sample['bundle_version'], []).append(value)
+
+    rows = []
+    for (benchmark, metric), by_version in sorted(values.items()):
+        old, new = by_version[baseline], by_version[candidate]
+        row = {'benchmark': benchmark, 'metric': metric, 'baseline_n': len(old),
+               'candidate_n': len(new), 'baseline_median': None, 'candidate_median': None,
+               'change': None, 'u': None, 'p': None, 'cliffs_delta': None,
+               'regressed': False}
+        if old and new:
+            old_median, new_median = statistics.median(old), statistics.median(new)
+            change = (new_median - old_median) / old_median if old_median else 0.0
+            if higher_is_better(metric):
+                change = -change
+            u, p = mann_whitney_u(new, old)
+            row.update(baseline_median=round(old_median, 3),
+                       candidate_median=round(new_median, 3), change=round(change, 4),
+                       u=u, p=round(p, 4), cliffs_delta=round(cliffs_delta(new, old), 3),
+                       regressed=change > threshold and p < alpha)
+        rows.append(row)
+    return rows
+
+
+def write_results(samples, rows, directory, name='ab_gate', metadata=None):
+    """Write ``<name>.json`` (samples and comparison) and ``<name>.csv`` (comparison).
+
+    Returns:
+        The paths of the JSON and CSV files.
+    """
+    directory = pathlib.Path(directory)
+    os.makedirs(directory, exist_ok=True)
+
+    json_path = directory / f'{name}.json'
+    with open(json_path, 'w') as f:
+        json.dump({'metadata': metadata or {}, 'comparison': rows, 'samples': samples},
+                  f, indent=2)
+
+    csv_path = directory / f'{name}.csv'
+    with open(csv_path, 'w', newline='') as f:
+        writer = csv.DictWriter(f, fieldnames=CSV_FIELDS)
+        writer.writeheader()
+        writer.writerows(rows)
+    return json_path, csv_path
+
+
+def _format(value, spec='.2f'):
+    return format(value, spec) if value is not None else '-'
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument('--baseline',
+                        help='Baseline bundle version (default: the release before '
+                             'the candidate on the mock site)')
+    parser.add_argument('--candidate',
+                        help="Candidate bundle version (default: bundleConfig.json's)")
+    parser.add_argument('--benchmark', action='append', dest='benchmarks',
+                        help="'app_dir=module:function'; may be repeated "
+                             f"(default: {DEFAULT_BENCHMARKS[0]})")
+    parser.add_argument('--repeat', type=int, default=6, help='Runs per bundle version')
+    parser.add_argument('--threshold', type=float, default=DEFAULT_THRESHOLD,
+                        help='Relative change of the median that counts as a regression')
+    parser.add_argument('--alpha', type=float, default=DEFAULT_ALPHA,
+                        help='Significance level of the Mann-Whitney U test')
+    parser.add_argument('--log-profile', default='benchmark')
+    parser.add_argument('--output', default='ab_gate',
+                        help='Directory for ab_gate.json and ab_gate.csv')
+    parser.add_argument('--print-baseline', action='store_true',
+                        help='Only print the baseline version and exit; with '
+                             'FUNCTIONS_EXTENSIONBUNDLE_SOURCE_URI pointing at the CDN, '
+                             'this picks the release to download for the mock site')
+    args = parser.parse_args(argv)
+    logging.basicConfig(level=logging.INFO, format='%(message)s')
+
+    try:
+        benchmarks = [parse_benchmark(spec) for spec in args.benchmarks or DEFAULT_BENCHMARKS]
+    except ValueError as e:
+        parser.error(str(e))
+    benchmarks = [(app_dir if app_dir.is_absolute() else (pathlib.Path.cwd() / app_dir).resolve(),
+                   workload) for app_dir, workload in benchmarks]
+
+    candidate = args.candidate or testutils._get_bundle_version()
+    baseline = args.baseline or previous_version(available_bundle_versions(), candidate)
+    if not baseline:
+        parser.error(f"No bundle version before {candidate} on the mock site; "
+                     "pass --baseline")
+    if baseline == candidate:
+        parser.error("Baseline and candidate are the same bundle version")
+    if args.print_baseline:
+        print(baseline)
+        return 0
+    logging.info(f"Comparing bundle {candidate} against {baseline}")
+
+    samples = run_ab(benchmarks, baseline, candidate, args.repeat, args.log_profile)
+    rows = compare(samples, baseline, candidate, args.threshold, args.alpha)
+
+    print(f"{'benchmark':<16}{'metric':<28}{baseline:>10}{candidate:>10}"
+          f"{'change':>9}{'p':>8}{'delta':>7}")
+    for row in rows:
+        change = _format(row['change'] * 100 if row['change'] is not None else None, '+.1f')
+        print(f"{row['benchmark']:<16}{row['metric']:<28}"
+              f"{_format(row['baseline_median']):>10}{_format(row['candidate_median']):>10}"
+              f"{change + '%':>9}{_format(row['p'], '.3f'):>8}"
+              f"{_format(row['cliffs_delta']):>7}{'  REGRESSED' if row['regressed'] else ''}")
+
+    paths = write_results(samples, rows, args.output, metadata={
+        'baseline': baseline,
+        'candidate': candidate,
+        'benchmarks': [f'{app_dir}={workload}' for app_dir, workload in benchmarks],
+        'repeat': args.repeat,
+        'threshold': args.threshold,
+        'alpha': args.alpha,
+        'platform': sys.platform,
+        'host_version': os.environ.get('HOST_VERSION'),
+        'run_id': get_run_id(),
+    })
+    print(f"A/B results written to {paths[0]} and {paths[1]}")
+
+    regressed = [row for row in rows if row['regressed']]
+    if regressed:
+        print(f"{len(regressed)} metric(s) regressed by more than {args.threshold:.0%} "
+              f"(p < {args.alpha})")
+        return 1
+    return 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
@@ -0,0 +1,292 @@
+# Copyright (c) Microsoft Corporation. All rights reserved.
+# Licensed under the MIT License.
+"""Cold-start time across Core Tools and extension bundle versions.
+
+For every combination of Core Tools build (``webhost-<HOST_VERSION>`` in
+tests/build), bundle version served by the mock extension site and
+bundle cache state, the runner starts the minimal ``http_functions`` app
+repeatedly and measures the time from ``Popen`` to the first successful
+HTTP invocation:
+
+* ``cold``: the host gets an empty bundle download directory, so the
+  measurement includes the bundle download and extraction.
+* ``warm``: the download directory already holds the bundle (an unmeasured
+  priming start fills it), as on a restarted app.
+
+The bundle version is pinned with an exact ``[x.y.z]`` range in host.json
+and the cache is selected with ``extensionBundle.downloadPath``. Runs are
+interleaved in a random order each round so drift on the machine spreads
+over all combinations. The operating system's file cache is not dropped.
+
+Results are the raw samples plus, per combination, the distribution and
+bootstrap confidence intervals of the mean and median::
+
+    python -m tests.benchmarks.cold_start --host-versions 4.1046.100 4.1047.100 \\
+        --bundle-versions 4.24.0 4.25.0 --repeat 10 --output cold_start
+"""
+
+import argparse
+import collections
+import contextlib
+import csv
+import itertools
+import json
+import logging
+import os
+import pathlib
+import random
+import shutil
+import socket
+import subprocess
+import sys
+import tempfile
+import time
+import urllib.error
+import urllib.request
+
+from tests.benchmarks.stats import describe
+from tests.utils import testutils
+from tests.utils.host_logs import HostLogCapture, HostLogReader
+from tests.utils.port_reservation import reserve_port
+from tests.utils.run_namespace import get_run_id
+
+APP_DIR = pathlib.Path(__file__).parent / 'http_functions'
+FUNCTION_ROUTE = 'api/ping'
+CACHE_MODES = ('cold', 'warm')
+POLL_INTERVAL = 0.05
+
+SUMMARY_FIELDS = ['host_version', 'bundle_version', 'cache', 'n', 'errors', 'mean',
+                  'stdev', 'min', 'p50', 'p95', 'max', 'mean_ci_low', 'mean_ci_high',
+                  'median_ci_low', 'median_ci_high']
+
+
+def available_host_versions(build_dir=testutils.BUILD_DIR):
+    """Return the versions of the Core Tools builds extracted by test_setup.py."""
+    return sorted(path.name[len('webhost-'):]
+                  for path in pathlib.Path(build_dir).glob('webhost-*') if path.is_dir())
+
+
+def available_bundle_versions(source_uri=None, bundle_id=None, timeout=5):
+    """Return the bundle versions listed by the mock site's index.json, or []."""
+    source_uri = source_uri or os.environ.get(
+        'FUNCTIONS_EXTENSIONBUNDLE_SOURCE_URI',
+        testutils.DEFAULT_FUNCTIONS_EXTENSIONBUNDLE_SOURCE_URI)
+    url = (f"{source_uri.rstrip('/')}/ExtensionBundles/"
+           f"{bundle_id or testutils._get_bundle_id()}/index.json")
+    try:
+        with urllib.request.urlopen(url, timeout=timeout) as response:
+            return list(json.load(response))
+    except (OSError, ValueError) as e:
+        logging.warning(f"Could not read bundle versions from {url}: {e}")
+        return []
+
+
+@contextlib.contextmanager
+def _environ(**values):
+    """Set (or, for None, unset) environment variables for the block."""
+    saved = {name: os.environ.get(name) for name in values}
+    try:
+        for name, value in values.items():
+            if value is None:
+                os.environ.pop(name, None)
+            else:
+                os.environ[name] = value
+        yield
+    finally:
+        for name, value in saved.items():
+            if value is None:
+                os.environ.pop(name, None)
+            else:
+                os.environ[name] = value
+
+
+def write_host_json(app_dir, bundle_version, download_path, log_profile='benchmark'):
+    """Write a host.json pinning ``bundle_version`` and its download directory."""
+    host_json = testutils.build_host_json(log_profile, bundle_version=bundle_version)
+    host_json['extensionBundle']['downloadPath'] = str(download_path)
+    (pathlib.Path(app_dir) / 'host.json').write_text(json.dumps(host_json, indent=4) + '\n')
+
+
+def measure_start(app_dir=APP_DIR, timeout=120, log_profile='benchmark'):
+    """Start the host once; return the seconds until the first successful invocation.
+
+    Raises:
+        RuntimeError: If the host exits first.
+        TimeoutError: If no invocation succeeds within ``timeout`` seconds.
+    """
+    lease = reserve_port()
+    capture = HostLogCapture()
+    launched = time.perf_counter()
+    proc = testutils.popen_webhost(stdout=subprocess.PIPE, stderr=subprocess.STDOUT,
+                                   script_root=app_dir, port=lease.port,
+                                   log_profile=log_profile)
+    reader = HostLogReader(proc.stdout, sink=capture).start()
+    webhost = testutils._WebHostProxy(proc, f'http://{testutils.LOCALHOST}:{lease.port}',
+                                      reader, port_lease=lease)
+    url = f'http://{testutils.LOCALHOST}:{lease.port}/{FUNCTION_ROUTE}'
+    try:
+        while True:
+            try:
+                with urllib.request.urlopen(url, timeout=5) as response:
+                    if response.status == 200:
+                        return time.perf_counter() - launched
+            except (urllib.error.URLError, ConnectionError, socket.timeout):
+                pass  # Not listening yet, or the function is not indexed yet
+            if proc.poll() is not None:
+                raise RuntimeError(f"Host exited with code {proc.returncode}:\n"
+                                   f"{capture.tail()[-2000:]}")
+            if time.perf_counter() - launched > timeout:
+                raise TimeoutError(f"No successful invocation within {timeout} seconds")
+            time.sleep(POLL_INTERVAL)
+    finally:
+        webhost.close()
+
+
+def run_matrix(host_versions, bundle_versions, cache_modes=CACHE_MODES, repeat=5,
+               app_dir=APP_DIR, timeout=120, seed=None, measure=measure_start):
+    """Measure every combination ``repeat`` times.
+
+    The host runs on a private copy of ``app_dir`` whose host.json is
+    rewritten for every sample; ``app_dir`` itself is not modified.
+
+    Args:
+        measure: Callable ``measure(app_dir, timeout)`` returning seconds;
+            measure_start unless testing the runner itself.
+
+    Returns:
+        One dict per measurement with ``host_version``, ``bundle_version``,
+        ``cache``, ``run`` and either ``seconds`` or ``error``.
+    """
+    combinations = list(itertools.product(host_versions, bundle_versions, cache_modes))
+    rng = random.Random(seed)
+    samples = []
+    primed = set()
+    with tempfile.TemporaryDirectory(prefix='cold_start_') as tmp:
+        tmp = pathlib.Path(tmp)
+        app_copy = testutils._materialize_func_app(pathlib.Path(app_dir))
+        try:
+            for run in range(repeat):
+                order = combinations[:]
+                rng.shuffle(order)
+                for host_version, bundle_version, cache in order:
+                    sample = {'host_version': host_version, 'bundle_version': bundle_version,
+                              'cache': cache, 'run': run}
+                    if cache == 'cold':
+                        download_path = tmp / f'cold-{host_version}-{bundle_version}-{run}'
+                    else:
+                        download_path = tmp / f'warm-{host_version}-{bundle_version}'
+                    write_host_json(app_copy, bundle_version, download_path)
+                    # CORE_TOOLS_EXE_PATH would take precedence over HOST_VERSION
+                    with _environ(HOST_VERSION=host_version, CORE_TOOLS_EXE_PATH=None):
+                        try:
+                            if cache == 'warm' and download_path not in primed:
+                                measure(app_copy, timeout)
+                                primed.add(download_path)
+                            sample['seconds'] = round(measure(app_copy, timeout), 3)
+                        except (RuntimeError, TimeoutError) as e:
+                            sample['error'] = str(e).splitlines()[0]
+                    if cache == 'cold':
+                        shutil.rmtree(download_path, ignore_errors=True)
+                    logging.info(f"{host_version} / {bundle_version} / {cache} #{run}: "
+                                 f"{sample.get('seconds', sample.get('error'))}")
+                    samples.append(sample)
+        finally:
+            testutils.remove_path(app_copy)
+    return samples
+
+
+def summarize(samples):
+    """Return the distribution of the samples of every combination."""
+    groups = collections.OrderedDict()
+    for sample in samples:
+        key = (sample['host_version'], sample['bundle_version'], sample['cache'])
+        groups.setdefault(key, []).append(sample)
+    summary = []
+    for (host_version, bundle_version, cache), group in sorted(groups.items()):
+        seconds = [s['seconds'] for s in group if 'seconds' in s]
+        summary.append({'host_version': host_version, 'bundle_version': bundle_version,
+                        'cache': cache, 'errors': len(group) - len(seconds),
+                        **describe(seconds)})
+    return summary
+
+
+def write_results(samples, summary, directory, name='cold_start', metadata=None):
+    """Write ``<name>.json`` (samples and summary) and ``<name>.csv`` (summary).
+
+    Returns:
+        The paths of the JSON and CSV files.
+    """
+    directory = pathlib.Path(directory)
+    os.makedirs(directory, exist_ok=True)
+
+    json_path = directory / f'{name}.json'
+    with open(json_path, 'w') as f:
+        json.dump({'metadata': metadata or {}, 'summary': summary, 'samples': samples},
+                  f, indent=2)
+
+    csv_path = directory / f'{name}.csv'
+    with open(csv_path, 'w', newline='') as f:
+        writer = csv.DictWriter(f, fieldnames=SUMMARY_FIELDS, extrasaction='ignore')
+        writer.writeheader()
+        for row in summary:
+            mean_ci, median_ci = row.get('mean_ci', [None, None]), row.get('median_ci',
+                                                                        [None, None])
+            writer.writerow({**row, 'mean_ci_low': mean_ci[0], 'mean_ci_high': mean_ci[1],
+                             'median_ci_low': median_ci[0], 'median_ci_high': median_ci[1]})
+    return json_path, csv_path
+
+
+def _format(value):
+    return f'{value:.2f}' if value is not None else '-'
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument('--host-versions', nargs='+',
+                        help='Core Tools versions (default: every webhost-* in tests/build)')
+    parser.add_argument('--bundle-versions', nargs='+',
+                        help="Bundle versions (default: the mock site's index.json)")
+    parser.add_argument('--cache', nargs='+', choices=CACHE_MODES, default=list(CACHE_MODES))
+    parser.add_argument('--repeat', type=int, default=5, help='Runs per combination')
+    parser.add_argument('--timeout', type=float, default=120,
+                        help='Seconds to wait for the first invocation')
+    parser.add_argument('--seed', type=int, help='Seed for the run order')
+    parser.add_argument('--output', default='cold_start',
+                        help='Directory for cold_start.json and cold_start.csv')
+    args = parser.parse_args(argv)
+    logging.basicConfig(level=logging.INFO)
+
+    host_versions = args.host_versions or available_host_versions()
+    bundle_versions = args.bundle_versions or available_bundle_versions()
+    if not host_versions:
+        parser.error("No Core Tools builds found; run 'invoke -c test_setup webhost' "
+                     "or pass --host-versions")
+    if not bundle_versions:
+        parser.error("No bundle versions found; start the mock extension site "
+                     "or pass --bundle-versions")
+
+    samples = run_matrix(host_versions, bundle_versions, args.cache, args.repeat,
+                         timeout=args.timeout, seed=args.seed)
+    summary = summarize(samples)
+
+    print(f"{'host':<14}{'bundle':<10}{'cache':<7}{'n':>4}{'median':>9}"
+          f"{'95% CI':>16}{'p95':>8}{'errors':>8}")
+    for row in summary:
+        ci = row.get('median_ci', [None, None])
+        print(f"{row['host_version']:<14}{row['bundle_version']:<10}{row['cache']:<7}"
+              f"{row['n']:>4}{_format(row.get('p50')):>9}"
+              f"{_format(ci[0]) + '-' + _format(ci[1]):>16}"
+              f"{_format(row.get('p95')):>8}{row['errors']:>8}")
+
+    paths = write_results(samples, summary, args.output, metadata={
+        'repeat': args.repeat,
+        'seed': args.seed,
+        'platform': sys.platform,
+        'run_id': get_run_id(),
+    })
+    print(f"Cold-start results written to {paths[0]} and {paths[1]}")
+    return 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
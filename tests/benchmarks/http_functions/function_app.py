@@ -0,0 +1,12 @@
+import logging
+
+import azure.functions as func
+
+app = func.FunctionApp(http_auth_level=func.AuthLevel.ANONYMOUS)
+
+
+@app.route(route="ping")
+def ping(req: func.HttpRequest) -> func.HttpResponse:
+    # One log line per invocation, like most test functions
+    logging.info('ping received')
+    return func.HttpResponse('pong')
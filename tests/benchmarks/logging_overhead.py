@@ -0,0 +1,124 @@
+# Copyright (c) Microsoft Corporation. All rights reserved.
+# Licensed under the MIT License.
+"""Per-invocation overhead of the host logging profiles.
+
+Starts the ``http_functions`` app once per logging profile, sends the same
+number of sequential requests to a trivial HTTP function and compares the
+client-side latency and the host-reported duration against the
+``benchmark`` profile.
+
+Requires a Core Tools build (HOST_VERSION or CORE_TOOLS_EXE_PATH) and the
+mock extension site, like the emulator tests::
+
+    python -m tests.benchmarks.logging_overhead --requests 500 \\
+        --output logging_overhead.json
+"""
+
+import argparse
+import json
+import logging
+import os
+import pathlib
+import sys
+import time
+
+from tests.utils import testutils
+from tests.utils.invocation_metrics import percentile
+from tests.utils.logging_profiles import LOGGING_PROFILES
+
+APP_DIR = pathlib.Path(__file__).parent / 'http_functions'
+BASELINE_PROFILE = 'benchmark'
+
+
+def measure_profile(profile, requests, warmup):
+    """Start the host with ``profile`` and time ``requests`` invocations.
+
+    Returns:
+        Dict with client latency and host duration statistics in ms.
+    """
+    # A private copy, so the profile's host.json is always the one used
+    with testutils._func_app_copy(APP_DIR, profile) as app_dir:
+        webhost = testutils.start_webhost(script_dir=app_dir, log_profile=profile)
+        try:
+            for _ in range(warmup):
+                webhost.request('GET', 'ping').raise_for_status()
+
+            mark = webhost.logs.mark()
+            latencies = []
+            started = time.perf_counter()
+            for _ in range(requests):
+                request_start = time.perf_counter()
+                webhost.request('GET', 'ping').raise_for_status()
+                latencies.append((time.perf_counter() - request_start) * 1000)
+            elapsed = time.perf_counter() - started
+
+            # Give the host a moment to log the last Executed lines
+            testutils.wait_until(
+                lambda: len([i for i in webhost.logs.invocations('ping', since=mark)
+                             if i.status]) >= requests,
+                timeout=10, description='host invocation logs')
+            durations = [i.duration_ms
+                         for i in webhost.logs.invocations('ping', since=mark)
+                         if i.status]
+        finally:
+            webhost.close()
+
+    return {
+        'requests': requests,
+        'throughput_rps': round(requests / elapsed, 1),
+        'latency_mean_ms': round(sum(latencies) / len(latencies), 3),
+        'latency_p50_ms': round(percentile(latencies, 50), 3),
+        'latency_p95_ms': round(percentile(latencies, 95), 3),
+        'host_duration_mean_ms': round(sum(durations) / len(durations), 3),
+    }
+
+
+def compare_to_baseline(results, baseline=BASELINE_PROFILE):
+    """Add per-invocation overhead relative to ``baseline`` to ``results``."""
+    if baseline not in results:
+        return results
+    base = results[baseline]
+    for stats in results.values():
+        stats['overhead_mean_ms'] = round(
+            stats['latency_mean_ms'] - base['latency_mean_ms'], 3)
+        stats['overhead_p50_ms'] = round(
+            stats['latency_p50_ms'] - base['latency_p50_ms'], 3)
+    return results
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument('--profiles', nargs='+', default=list(LOGGING_PROFILES),
+                        choices=list(LOGGING_PROFILES))
+    parser.add_argument('--requests', type=int, default=200)
+    parser.add_argument('--warmup', type=int, default=20)
+    parser.add_argument('--output', help='Write the results as JSON here')
+    args = parser.parse_args(argv)
+
+    logging.basicConfig(level=logging.INFO)
+    results = {}
+    for profile in args.profiles:
+        logging.info(f"Measuring logging profile '{profile}'")
+        results[profile] = measure_profile(profile, args.requests, args.warmup)
+    compare_to_baseline(results)
+
+    print(f"{'profile':<12}{'rps':>8}{'mean ms':>10}{'p50 ms':>10}"
+          f"{'p95 ms':>10}{'host ms':>10}{'overhead':>10}")
+    for profile, stats in results.items():
+        print(f"{profile:<12}{stats['throughput_rps']:>8}"
+              f"{stats['latency_mean_ms']:>10}{stats['latency_p50_ms']:>10}"
+              f"{stats['latency_p95_ms']:>10}{stats['host_duration_mean_ms']:>10}"
+              f"{stats.get('overhead_mean_ms', ''):>10}")
+
+    if args.output:
+        with open(args.output, 'w') as f:
+            json.dump({'metadata': {
+                           'host_version': os.environ.get('HOST_VERSION'),
+                           'bundle_version': testutils._get_bundle_version(),
+                       },
+                       'profiles': results}, f, indent=2)
+    return 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
@@ -0,0 +1,133 @@
+# Copyright (c) Microsoft Corporation. All rights reserved.
+# Licensed under the MIT License.
+"""Summary statistics for repeated benchmark measurements.
+
+Startup and latency samples are skewed and usually few (tens of runs),
+so confidence intervals are percentile bootstrap intervals rather than
+normal approximations. The resampling is seeded: the same samples always
+give the same interval. Two sets of samples are compared with the
+Mann-Whitney U test, which makes no assumption about their distribution,
+and Cliff's delta as the effect size.
+"""
+
+import collections
+import functools
+import math
+import random
+import statistics
+
+from tests.utils.invocation_metrics import percentile
+
+DEFAULT_RESAMPLES = 2000
+# Largest sample size for which the exact U distribution is used
+EXACT_LIMIT = 25
+
+
+def bootstrap_ci(values, statistic=statistics.median, confidence=0.95,
+                 resamples=DEFAULT_RESAMPLES, seed=0):
+    """Return the percentile bootstrap confidence interval of ``statistic``.
+
+    Returns:
+        ``(low, high)``, or ``(None, None)`` for fewer than two values.
+    """
+    values = list(values)
+    if len(values) < 2:
+        return None, None
+    rng = random.Random(seed)
+    estimates = [statistic(rng.choices(values, k=len(values))) for _ in range(resamples)]
+    tail = (1 - confidence) / 2 * 100
+    return percentile(estimates, tail), percentile(estimates, 100 - tail)
+
+
+def describe(values, confidence=0.95):
+    """Return count, mean, spread, percentiles and bootstrap intervals of ``values``."""
+    values = list(values)
+    if not values:
+        return {'n': 0}
+    mean_low, mean_high = bootstrap_ci(values, statistics.mean, confidence)
+    median_low, median_high = bootstrap_ci(values, statistics.median, confidence)
+    return {
+        'n': len(values),
+        'mean': statistics.mean(values),
+        'stdev': statistics.stdev(values) if len(values) > 1 else 0.0,
+        'min': min(values),
+        'p50': percentile(values, 50),
+        'p95': percentile(values, 95),
+        'max': max(values),
+        'mean_ci': [mean_low, mean_high],
+        'median_ci': [median_low, median_high],
+    }
+
+
+def _midranks(values):
+    """Return the 1-based ranks of ``values``, ties getting their average rank."""
+    order = sorted(range(len(values)), key=values.__getitem__)
+    ranks = [0.0] * len(values)
+    i = 0
+    while i < len(order):
+        j = i
+        while j + 1 < len(order) and values[order[j + 1]] == values[order[i]]:
+            j += 1
+        for k in range(i, j + 1):
+            ranks[order[k]] = (i + j) / 2 + 1
+        i = j + 1
+    return ranks
+
+
+@functools.lru_cache(maxsize=None)
+def _u_counts(n1, n2):
+    """Number of orderings giving each U value, for samples of n1 and n2 without ties."""
+    if n1 == 0 or n2 == 0:
+        return (1,)
+    counts = [0] * (n1 * n2 + 1)
+    # The largest value comes from the first sample (adding n2 to U) or the second
+    for u, count in enumerate(_u_counts(n1 - 1, n2)):
+        counts[u + n2] += count
+    for u, count in enumerate(_u_counts(n1, n2 - 1)):
+        counts[u] += count
+    return tuple(counts)
+
+
+def mann_whitney_u(a, b):
+    """Two-sided Mann-Whitney U test of ``a`` against ``b``.
+
+    The p-value is exact for samples of up to EXACT_LIMIT values without
+    ties and otherwise comes from the normal approximation with tie and
+    continuity corrections.
+
+    Returns:
+        ``(u, p)``: U counts the pairs in which the ``a`` value is larger
+        (ties count one half); p is 1.0 if either sample is empty.
+    """
+    a, b = list(a), list(b)
+    n1, n2 = len(a), len(b)
+    if not n1 or not n2:
+        return 0.0, 1.0
+    ranks = _midranks(a + b)
+    u = sum(ranks[:n1]) - n1 * (n1 + 1) / 2
+    n = n1 + n2
+
+    tied = len(set(a + b)) < n
+    if not tied and max(n1, n2) <= EXACT_LIMIT:
+        counts = _u_counts(n1, n2)
+        total = sum(counts)
+        k = int(round(u))
+        tail = min(sum(counts[:k + 1]), sum(counts[k:])) / total
+        return u, min(1.0, 2 * tail)
+
+    ties = collections.Counter(a + b).values()
+    variance = n1 * n2 / 12 * ((n + 1) - sum(t ** 3 - t for t in ties) / (n * (n - 1)))
+    if variance <= 0:
+        return u, 1.0
+    z = max(0.0, abs(u - n1 * n2 / 2) - 0.5) / math.sqrt(variance)
+    return u, min(1.0, 2 * (1 - statistics.NormalDist().cdf(z)))
+
+
+def cliffs_delta(a, b):
+    """Return P(a > b) - P(a < b) over all pairs, from -1 to 1 (0: no difference)."""
+    a, b = list(a), list(b)
+    if not a or not b:
+        return 0.0
+    greater = sum(x > y for x in a for y in b)
+    smaller = sum(x < y for x in a for y in b)
+    return (greater - smaller) / (len(a) * len(b))
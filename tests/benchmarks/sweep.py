@@ -0,0 +1,245 @@
+# Copyright (c) Microsoft Corporation. All rights reserved.
+# Licensed under the MIT License.
+"""Sweep host.json extension settings and record throughput/latency.
+
+The runner restarts the host for every combination in a grid of extension
+settings, runs a workload against it and records the invocations the host
+logged while the workload ran. A grid maps dotted ``extensions`` paths to
+the values to try::
+
+    {
+        "queues.batchSize": [8, 16, 32],
+        "queues.newBatchThreshold": [4, 16]
+    }
+
+A workload is a callable ``workload(webhost) -> dict`` that drives the
+function app and returns once the invocations it caused have completed;
+the dict it returns is stored with the results. Run a sweep with::
+
+    python -m tests.benchmarks.sweep --app tests/benchmarks/http_functions \\
+        --grid '{"http.maxConcurrentRequests": [10, 50, 100]}' \\
+        --workload tests.benchmarks.workloads:http_ping \\
+        --output sweep_results
+
+To tune the Storage queue trigger, sweep the ``queue_functions`` emulator
+app with the ``queue_drain`` workload, which reports the enqueue-to-trigger
+latency distribution and drain throughput of QUEUE_MESSAGES messages::
+
+    python -m tests.benchmarks.sweep --app tests/emulator_tests/queue_functions \\
+        --grid '{"queues.batchSize": [8, 16, 32], "queues.newBatchThreshold": [4, 16]}' \\
+        --workload tests.benchmarks.workloads:queue_drain --repeat 3
+
+``eventhub_drain`` does the same for the Event Hubs batch trigger of
+``eventhub_batch_functions`` and adds a histogram of the batch sizes::
+
+    python -m tests.benchmarks.sweep --app tests/emulator_tests/eventhub_batch_functions \\
+        --grid '{"eventHubs.maxEventBatchSize": [10, 100], "eventHubs.prefetchCount": [0, 300]}' \\
+        --workload tests.benchmarks.workloads:eventhub_drain --repeat 3
+
+Like the emulator tests, this needs a Core Tools build, the mock extension
+site and whatever emulators the app uses.
+"""
+
+import argparse
+import csv
+import importlib
+import itertools
+import json
+import logging
+import os
+import pathlib
+import sys
+import time
+
+from tests.utils import testutils
+from tests.utils.invocation_metrics import percentile, summarize_invocations
+from tests.utils.run_namespace import get_run_id
+
+METRIC_FIELDS = ['invocations', 'failed', 'elapsed_s', 'throughput_per_s',
+                 'duration_mean_ms', 'duration_p50_ms', 'duration_p95_ms',
+                 'duration_p99_ms']
+
+
+def expand_grid(grid):
+    """Yield one nested extension settings dict per grid combination.
+
+    Args:
+        grid: Dict mapping dotted paths (e.g. ``queues.batchSize``) to a
+            list of values.
+    """
+    paths = sorted(grid)
+    for values in itertools.product(*(grid[path] for path in paths)):
+        settings = {}
+        for path, value in zip(paths, values):
+            settings = testutils.merge_settings(settings, _nest(path, value))
+        yield settings
+
+
+def _nest(path, value):
+    for key in reversed(path.split('.')):
+        value = {key: value}
+    return value
+
+
+def flatten_settings(settings, prefix=''):
+    """Turn nested settings back into ``{'queues.batchSize': 16}`` form."""
+    flat = {}
+    for key, value in settings.items():
+        path = f'{prefix}{key}'
+        if isinstance(value, dict):
+            flat.update(flatten_settings(value, f'{path}.'))
+        else:
+            flat[path] = value
+    return flat
+
+
+def summarize_run(invocations, elapsed):
+    """Aggregate the invocations completed during one workload run."""
+    completed = [inv for inv in invocations if inv.status is not None]
+    durations = [inv.duration_ms for inv in completed]
+    failed = sum(not inv.succeeded for inv in completed)
+    return {
+        'invocations': len(completed),
+        'failed': failed,
+        'elapsed_s': round(elapsed, 3),
+        'throughput_per_s': round(len(completed) / elapsed, 2) if elapsed else None,
+        'duration_mean_ms': (round(sum(durations) / len(durations), 2)
+                             if durations else None),
+        'duration_p50_ms': percentile(durations, 50),
+        'duration_p95_ms': percentile(durations, 95),
+        'duration_p99_ms': percentile(durations, 99),
+    }
+
+
+def run_combination(app_dir, settings, workload, log_profile='benchmark',
+                    bundle_version=None):
+    """Start the host with ``settings``, run ``workload`` and measure it.
+
+    The host runs on a private copy of ``app_dir`` whose host.json is
+    always written for this combination. ``bundle_version`` pins a bundle
+    version other than bundleConfig.json's; the result's ``bundle_version``
+    is the range host.json was written with.
+    """
+    webhost = None
+    with testutils._func_app_copy(app_dir, log_profile, settings,
+                                  bundle_version=bundle_version) as app_copy:
+        host_json = json.loads((app_copy / 'host.json').read_text())
+        try:
+            webhost = testutils.start_webhost(script_dir=app_copy,
+                                              log_profile=log_profile)
+            mark = webhost.logs.mark()
+            started = time.perf_counter()
+            extra = workload(webhost) or {}
+            elapsed = time.perf_counter() - started
+            invocations = webhost.logs.invocations(since=mark)
+        finally:
+            if webhost is not None:
+                webhost.close()
+
+    return {
+        'settings': settings,
+        'metrics': summarize_run(invocations, elapsed),
+        'functions': summarize_invocations(invocations),
+        'workload': extra,
+        'bundle_version': host_json['extensionBundle']['version'],
+    }
+
+
+def run_sweep(app_dir, grid, workload, repeat=1, log_profile='benchmark'):
+    """Run ``workload`` once per grid combination (``repeat`` times each).
+
+    Returns:
+        List of result dicts with ``settings``, ``metrics``, ``functions``
+        and ``workload`` keys, in grid order.
+    """
+    results = []
+    combinations = list(expand_grid(grid))
+    for index, settings in enumerate(combinations, 1):
+        for attempt in range(repeat):
+            logging.info(f"Sweep {index}/{len(combinations)} "
+                         f"(run {attempt + 1}/{repeat}): {flatten_settings(settings)}")
+            result = run_combination(app_dir, settings, workload, log_profile)
+            result['run'] = attempt
+            results.append(result)
+            logging.info(f"  {result['metrics']}")
+    return results
+
+
+def write_sweep_results(results, directory, name='sweep', metadata=None):
+    """Write ``<name>.json`` and a flat ``<name>.csv`` into ``directory``.
+
+    Returns:
+        The paths of the JSON and CSV files.
+    """
+    directory = pathlib.Path(directory)
+    os.makedirs(directory, exist_ok=True)
+
+    json_path = directory / f'{name}.json'
+    with open(json_path, 'w') as f:
+        json.dump({'metadata': metadata or {}, 'results': results}, f, indent=2)
+
+    setting_fields = sorted({path for result in results
+                             for path in flatten_settings(result['settings'])})
+    # Scalar workload results (e.g. queue_drain latencies) become extra columns
+    workload_fields = sorted({f'workload.{key}' for result in results
+                              for key, value in result.get('workload', {}).items()
+                              if isinstance(value, (int, float, str, type(None)))})
+    csv_path = directory / f'{name}.csv'
+    with open(csv_path, 'w', newline='') as f:
+        writer = csv.DictWriter(f, fieldnames=setting_fields + ['run'] + METRIC_FIELDS
+                                + workload_fields, extrasaction='ignore')
+        writer.writeheader()
+        for result in results:
+            writer.writerow({**flatten_settings(result['settings']),
+                             'run': result.get('run', 0), **result['metrics'],
+                             **{f'workload.{key}': value
+                                for key, value in result.get('workload', {}).items()}})
+
+    return json_path, csv_path
+
+
+def load_workload(spec):
+    """Import a workload given as ``package.module:function``."""
+    module_name, _, attr = spec.partition(':')
+    if not attr:
+        raise ValueError(f"Workload must be 'module:function', got '{spec}'")
+    return getattr(importlib.import_module(module_name), attr)
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument('--app', required=True,
+                        help='Function app directory (relative to tests/ or absolute)')
+    parser.add_argument('--grid', required=True,
+                        help='Grid as JSON, or the path of a JSON file')
+    parser.add_argument('--workload', required=True,
+                        help="Workload callable as 'module:function'")
+    parser.add_argument('--repeat', type=int, default=1)
+    parser.add_argument('--log-profile', default='benchmark')
+    parser.add_argument('--output', default='sweep_results',
+                        help='Directory for sweep.json and sweep.csv')
+    args = parser.parse_args(argv)
+
+    grid_path = pathlib.Path(args.grid)
+    grid = json.loads(grid_path.read_text() if grid_path.is_file() else args.grid)
+    app_dir = pathlib.Path(args.app)
+    if not app_dir.is_absolute():
+        app_dir = (pathlib.Path.cwd() / app_dir).resolve()
+
+    logging.basicConfig(level=logging.INFO)
+    results = run_sweep(app_dir, grid, load_workload(args.workload),
+                        repeat=args.repeat, log_profile=args.log_profile)
+    paths = write_sweep_results(results, args.output, metadata={
+        'app': str(app_dir),
+        'grid': grid,
+        'workload': args.workload,
+        'run_id': get_run_id(),
+        'host_version': os.environ.get('HOST_VERSION'),
+        'bundle_version': testutils._get_bundle_version(),
+    })
+    print(f"Sweep results written to {paths[0]} and {paths[1]}")
+    return 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
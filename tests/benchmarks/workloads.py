@@ -0,0 +1,305 @@
+# Copyright (c) Microsoft Corporation. All rights reserved.
+# Licensed under the MIT License.
+"""Workloads for sweep.py.
+
+Each workload takes the running webhost, drives its function app and
+returns once the invocations it caused have completed. The returned dict
+is stored with the sweep results.
+"""
+
+import concurrent.futures
+import json
+import logging
+import os
+import time
+import uuid
+
+from tests.utils import testutils
+from tests.utils.invocation_metrics import percentile
+from tests.utils.run_namespace import delete_run_queues, scoped_name
+
+# Overrides for the workload size, so sweeps can be scaled from the CLI
+SWEEP_REQUESTS = 'SWEEP_REQUESTS'
+SWEEP_CONCURRENCY = 'SWEEP_CONCURRENCY'
+QUEUE_MESSAGES = 'QUEUE_MESSAGES'
+QUEUE_SENDER = 'QUEUE_SENDER'
+
+# Queue and result key of the benchmark functions in queue_functions
+BENCHMARK_QUEUE = 'benchqueue'
+BENCHMARK_RESULT_KEY = 'queue_trigger_benchmark'
+SENDERS = ('client', 'http')
+EVENTHUB_EVENTS = 'EVENTHUB_EVENTS'
+EVENTHUB_SENDER = 'EVENTHUB_SENDER'
+EVENTHUB_SEND_BATCH = 'EVENTHUB_SEND_BATCH'
+
+# Event hub (see utils/eventhub/config.json) and result key of the
+# benchmark functions in eventhub_batch_functions
+BENCHMARK_EVENTHUB = 'python-worker-ci-eventhub-benchmark'
+EVENTHUB_RESULT_KEY = 'eventhub_benchmark'
+EVENTHUB_CONNECTION = 'AzureWebJobsEventHubConnectionString'
+
+
+def http_ping(webhost, requests=None, concurrency=None):
+    """Send concurrent requests to the ``ping`` function in http_functions."""
+    requests = requests or int(os.environ.get(SWEEP_REQUESTS, 500))
+    concurrency = concurrency or int(os.environ.get(SWEEP_CONCURRENCY, 16))
+    mark = webhost.logs.mark()
+
+    with concurrent.futures.ThreadPoolExecutor(concurrency) as pool:
+        responses = list(pool.map(lambda _: webhost.request('GET', 'ping'),
+                                  range(requests)))
+
+    testutils.wait_until(
+        lambda: sum(inv.status is not None
+                    for inv in webhost.logs.invocations('ping', since=mark)) >= requests,
+        timeout=30, description='ping invocations logged')
+    return {
+        'requests': requests,
+        'concurrency': concurrency,
+        'errors': sum(not r.ok for r in responses),
+    }
+
+
+def _rounded(value):
+    return round(value, 2) if value is not None else None
+
+
+def summarize_queue_drain(reports, messages, enqueue_elapsed):
+    """Summarize the reports of queue_trigger_benchmark for one drain.
+
+    Args:
+        reports: Payloads with ``seq``, ``sent`` and ``triggered`` epoch
+            seconds and ``dequeue_count``. A message delivered more than
+            once counts with its first delivery.
+        messages: Number of messages enqueued.
+        enqueue_elapsed: Seconds it took to enqueue them.
+    """
+    first = {}
+    for report in sorted(reports, key=lambda r: r['triggered']):
+        first.setdefault(report['seq'], report)
+    latencies = [(r['triggered'] - r['sent']) * 1000 for r in first.values()]
+    drain_s = (max(r['triggered'] for r in first.values())
+               - min(r['sent'] for r in first.values())) if first else None
+    return {
+        'messages': messages,
+        'drained': len(first),
+        'redelivered': sum(r.get('dequeue_count', 1) > 1 for r in reports),
+        'enqueue_s': round(enqueue_elapsed, 3),
+        'enqueue_per_s': _rounded(messages / enqueue_elapsed if enqueue_elapsed else None),
+        'drain_s': _rounded(drain_s),
+        'drain_per_s': _rounded(len(first) / drain_s if drain_s else None),
+        'latency_p50_ms': _rounded(percentile(latencies, 50)),
+        'latency_p95_ms': _rounded(percentile(latencies, 95)),
+        'latency_p99_ms': _rounded(percentile(latencies, 99)),
+        'latency_max_ms': _rounded(max(latencies) if latencies else None),
+    }
+
+
+def _send_with_client(bodies, concurrency):
+    """Enqueue ``bodies`` directly with azure-storage-queue."""
+    try:
+        from azure.core.exceptions import ResourceExistsError
+        from azure.storage.queue import QueueClient, TextBase64EncodePolicy
+    except ImportError:
+        raise RuntimeError("The 'client' sender needs the azure-storage-queue package; "
+                           f"install it or set {QUEUE_SENDER}=http")
+    # The Storage extension expects base64 messages (messageEncoding default)
+    client = QueueClient.from_connection_string(
+        testutils.get_storage_connection_string(), scoped_name(BENCHMARK_QUEUE),
+        message_encode_policy=TextBase64EncodePolicy())
+    try:
+        client.create_queue()
+    except ResourceExistsError:
+        pass
+    with concurrent.futures.ThreadPoolExecutor(concurrency) as pool:
+        list(pool.map(lambda body: client.send_message(body()), bodies))
+
+
+def _send_through_host(webhost, bodies, concurrency):
+    """Enqueue ``bodies`` through the put_queue_benchmark output binding."""
+    with concurrent.futures.ThreadPoolExecutor(concurrency) as pool:
+        list(pool.map(lambda body: webhost.request('POST', 'put_queue_benchmark',
+                                                   data=body(), expected_status=200),
+                      bodies))
+
+
+def queue_drain(webhost, messages=None, sender=None, concurrency=None, timeout=300):
+    """Enqueue messages for queue_trigger_benchmark in queue_functions and drain them.
+
+    Each message carries the time it was sent and the trigger reports when
+    it started, so the result holds the enqueue-to-trigger latency
+    distribution and the drain throughput. The ``client`` sender enqueues
+    from this process with ``concurrency`` parallel sends (the queue service
+    has no batch put); ``http`` goes through the host's output binding and
+    so also loads the host while it drains.
+    """
+    messages = messages or int(os.environ.get(QUEUE_MESSAGES, 1000))
+    sender = sender or os.environ.get(QUEUE_SENDER, 'client')
+    concurrency = concurrency or int(os.environ.get(SWEEP_CONCURRENCY, 16))
+    if sender not in SENDERS:
+        raise ValueError(f"Unknown queue sender '{sender}', expected one of {SENDERS}")
+
+    # Reports of an earlier drain (e.g. late redeliveries) carry another batch
+    batch = uuid.uuid4().hex
+    sink = testutils.get_result_sink()
+    sink.clear(BENCHMARK_RESULT_KEY)
+    # The timestamp is taken when the message is sent, not when it is built
+    bodies = [lambda seq=seq: json.dumps({'batch': batch, 'seq': seq, 'sent': time.time()})
+              for seq in range(messages)]
+
+    started = time.perf_counter()
+    if sender == 'client':
+        _send_with_client(bodies, concurrency)
+    else:
+        _send_through_host(webhost, bodies, concurrency)
+    enqueue_elapsed = time.perf_counter() - started
+
+    def reports():
+        return [r for r in sink.results(BENCHMARK_RESULT_KEY) if r.get('batch') == batch]
+
+    try:
+        testutils.wait_until(
+            lambda: len({r['seq'] for r in reports()}) >= messages,
+            timeout=timeout, description='benchmark queue drained')
+    except TimeoutError as e:
+        logging.warning(f"{e}; reporting the messages drained so far")
+    finally:
+        delete_run_queues(testutils.get_storage_connection_string(), [BENCHMARK_QUEUE])
+
+    return {'sender': sender, 'concurrency': concurrency,
+            **summarize_queue_drain(reports(), messages, enqueue_elapsed)}
+
+
+def summarize_eventhub_drain(reports, events, send_elapsed):
+    """Summarize the batches reported by the eventhub_benchmark trigger.
+
+    Args:
+        reports: Payloads with the ``triggered`` epoch seconds, the batch
+            ``size`` and the ``events`` of this run as ``[seq, sent]``.
+            Batches may also hold events of other runs; they count towards
+            the batch size but not the latency.
+        events: Number of events sent.
+        send_elapsed: Seconds it took to send them.
+    """
+    first = {}
+    sizes = []
+    for report in sorted(reports, key=lambda r: r['triggered']):
+        sizes.append(report['size'])
+        for seq, sent in report['events']:
+            first.setdefault(seq, (sent, report['triggered']))
+    latencies = [(triggered - sent) * 1000 for sent, triggered in first.values()]
+    drain_s = (max(t for _, t in first.values())
+               - min(s for s, _ in first.values())) if first else None
+    histogram = {}
+    for size in sorted(sizes):
+        histogram[size] = histogram.get(size, 0) + 1
+    return {
+        'events': events,
+        'drained': len(first),
+        'redelivered': sum(len(r['events']) for r in reports) - len(first),
+        'send_s': round(send_elapsed, 3),
+        'send_per_s': _rounded(events / send_elapsed if send_elapsed else None),
+        'drain_s': _rounded(drain_s),
+        'drain_per_s': _rounded(len(first) / drain_s if drain_s else None),
+        'batches': len(sizes),
+        'batch_size_mean': _rounded(sum(sizes) / len(sizes) if sizes else None),
+        'batch_size_p50': percentile(sizes, 50),
+        'batch_size_max': max(sizes) if sizes else None,
+        'batch_size_histogram': histogram,
+        'latency_p50_ms': _rounded(percentile(latencies, 50)),
+        'latency_p95_ms': _rounded(percentile(latencies, 95)),
+        'latency_p99_ms': _rounded(percentile(latencies, 99)),
+        'latency_max_ms': _rounded(max(latencies) if latencies else None),
+    }
+
+
+def _send_events_with_client(chunks):
+    """Send every chunk of event bodies with azure-eventhub, splitting full batches."""
+    try:
+        from azure.eventhub import EventData, EventHubProducerClient
+    except ImportError:
+        raise RuntimeError("The 'client' sender needs the azure-eventhub package; "
+                           f"install it or set {EVENTHUB_SENDER}=http")
+    connection = os.environ.get(EVENTHUB_CONNECTION)
+    if not connection:
+        raise RuntimeError(f"{EVENTHUB_CONNECTION} is not set")
+    producer = EventHubProducerClient.from_connection_string(
+        connection, eventhub_name=BENCHMARK_EVENTHUB)
+    with producer:
+        for chunk in chunks:
+            batch = producer.create_batch()
+            for body in chunk():
+                try:
+                    batch.add(EventData(body))
+                except ValueError:  # The batch reached its size limit
+                    producer.send_batch(batch)
+                    batch = producer.create_batch()
+                    batch.add(EventData(body))
+            producer.send_batch(batch)
+
+
+def _send_events_through_host(webhost, chunks, concurrency):
+    """Send every chunk through the eventhub_output_benchmark output binding."""
+    with concurrent.futures.ThreadPoolExecutor(concurrency) as pool:
+        list(pool.map(lambda chunk: webhost.request(
+            'POST', 'eventhub_output_benchmark',
+            data='[' + ','.join(chunk()) + ']', expected_status=200), chunks))
+
+
+def eventhub_drain(webhost, events=None, sender=None, send_batch=None, concurrency=None,
+                   timeout=300):
+    """Send events for eventhub_benchmark in eventhub_batch_functions and drain them.
+
+    Events carry the time their chunk was sent and the trigger reports every
+    batch it received, so the result holds the send-to-trigger latency
+    distribution, the drain throughput and a histogram of the batch sizes
+    the host delivered. The ``client`` sender uses azure-eventhub from this
+    process in ``send_batch`` event chunks; ``http`` posts the chunks as
+    JSON arrays to the host's output binding.
+    """
+    events = events or int(os.environ.get(EVENTHUB_EVENTS, 2000))
+    sender = sender or os.environ.get(EVENTHUB_SENDER, 'client')
+    send_batch = send_batch or int(os.environ.get(EVENTHUB_SEND_BATCH, 100))
+    concurrency = concurrency or int(os.environ.get(SWEEP_CONCURRENCY, 4))
+    if sender not in SENDERS:
+        raise ValueError(f"Unknown event hub sender '{sender}', "
+                         f"expected one of {SENDERS}")
+
+    # Without a checkpoint the trigger also reads events of earlier runs
+    batch = uuid.uuid4().hex
+    sink = testutils.get_result_sink()
+    sink.clear(EVENTHUB_RESULT_KEY)
+
+    def chunk(start):
+        # Stamped when the chunk is sent, not when the work is planned
+        def bodies():
+            sent = time.time()
+            return [json.dumps({'batch': batch, 'seq': seq, 'sent': sent})
+                    for seq in range(start, min(start + send_batch, events))]
+        return bodies
+    chunks = [chunk(start) for start in range(0, events, send_batch)]
+
+    started = time.perf_counter()
+    if sender == 'client':
+        _send_events_with_client(chunks)
+    else:
+        _send_events_through_host(webhost, chunks, concurrency)
+    send_elapsed = time.perf_counter() - started
+
+    def reports():
+        own = []
+        for report in sink.results(EVENTHUB_RESULT_KEY):
+            mine = [[seq, sent] for run, seq, sent in report['events'] if run == batch]
+            if mine:
+                own.append({**report, 'events': mine})
+        return own
+
+    try:
+        testutils.wait_until(
+            lambda: len({seq for r in reports() for seq, _ in r['events']}) >= events,
+            timeout=timeout, description='benchmark event hub drained')
+    except TimeoutError as e:
+        logging.warning(f"{e}; reporting the events drained so far")
+
+    return {'sender': sender, 'send_batch': send_batch,
+            **summarize_eventhub_drain(reports(), events, send_elapsed)}
@@ -14,6 +14,9 @@ Based on:
 """
 import json
 import logging
+import os
+import urllib.request
+
 import azure.functions as func
 
 app = func.FunctionApp()
@@ -22,6 +25,20 @@ app = func.FunctionApp()
 _triggered_docs = []
 _batch_triggered_docs = []
 
+
+def _report_result(key, payload):
+    """Push a trigger result to the test harness result sink, if configured."""
+    sink_url = os.environ.get('RESULT_SINK_URL')
+    if not sink_url:
+        return
+    req = urllib.request.Request(
+        f"{sink_url}/{key}", data=json.dumps(payload).encode('utf-8'),
+        headers={'Content-Type': 'application/json'}, method='POST')
+    try:
+        urllib.request.urlopen(req, timeout=5).close()
+    except Exception as e:
+        logging.warning(f"Failed to report result for {key}: {e}")
+
 # =============================================================================
 # COSMOS DB TRIGGER BINDINGS
 # =============================================================================
@@ -34,7 +51,7 @@ _batch_triggered_docs = []
     connection="AzureWebJobsCosmosDBConnectionString",
     create_lease_container_if_not_exists=True)
 @app.blob_output(arg_name="$return", connection="AzureWebJobsStorage",
-                 path="bundle-tests/test-cosmosdb-triggered.txt")
+                 path="bundle-tests/%RUN_ID%/test-cosmosdb-triggered.txt")
 def cosmosdb_trigger(docs: func.DocumentList) -> str:
     """Change feed trigger - writes first document to blob"""
     if not docs:
@@ -43,6 +60,7 @@ def cosmosdb_trigger(docs: func.DocumentList) -> str:
     try:
         for doc in docs:
             _triggered_docs.append(json.loads(doc.to_json()))
+            _report_result('cosmosdb_trigger', json.loads(doc.to_json()))
         return docs[0].to_json()
     except (json.JSONDecodeError, IndexError) as e:
         logging.error(f"Error processing trigger documents: {e}")
@@ -78,7 +96,7 @@ def cosmosdb_trigger_batch(docs: func.DocumentList):
     create_lease_container_if_not_exists=True,
     feed_poll_delay=1000)
 @app.blob_output(arg_name="$return", connection="AzureWebJobsStorage",
-                 path="bundle-tests/test-cosmosdb-feed-delay.txt")
+                 path="bundle-tests/%RUN_ID%/test-cosmosdb-feed-delay.txt")
 def cosmosdb_trigger_feed_delay(docs: func.DocumentList) -> str:
     """Change feed trigger with custom feed_poll_delay (1 second)"""
     return json.dumps({
@@ -200,7 +218,7 @@ def put_feed_delay_document(req: func.HttpRequest, doc: func.Out[func.Document])
 
 @app.route(route="get_cosmosdb_triggered")
 @app.blob_input(arg_name="file", connection="AzureWebJobsStorage",
-                path="bundle-tests/test-cosmosdb-triggered.txt")
+                path="bundle-tests/%RUN_ID%/test-cosmosdb-triggered.txt")
 def get_cosmosdb_triggered(req: func.HttpRequest,
                            file: func.InputStream) -> str:
     """Get the content written by cosmosdb_trigger"""
@@ -209,7 +227,7 @@ def get_cosmosdb_triggered(req: func.HttpRequest,
 
 @app.route(route="get_feed_delay_triggered")
 @app.blob_input(arg_name="file", connection="AzureWebJobsStorage",
-                path="bundle-tests/test-cosmosdb-feed-delay.txt")
+                path="bundle-tests/%RUN_ID%/test-cosmosdb-feed-delay.txt")
 def get_feed_delay_triggered(req: func.HttpRequest,
                              file: func.InputStream) -> str:
     """Get the content written by cosmosdb_trigger_feed_delay"""
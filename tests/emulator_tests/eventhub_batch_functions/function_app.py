@@ -1,8 +1,13 @@
 # Copyright (c) Microsoft Corporation. All rights reserved.
 # Licensed under the MIT License.
+import concurrent.futures
 import json
+import logging
 import os
+import threading
+import time
 import typing
+import urllib.request
 
 import azure.functions as func
 from azure.eventhub import EventData, EventHubProducerClient
@@ -10,6 +15,20 @@ from azure.eventhub import EventData, EventHubProducerClient
 app = func.FunctionApp()
 
 
+def _report_result(key, payload):
+    """Push a trigger result to the test harness result sink, if configured."""
+    sink_url = os.environ.get('RESULT_SINK_URL')
+    if not sink_url:
+        return
+    req = urllib.request.Request(
+        f"{sink_url}/{key}", data=json.dumps(payload).encode('utf-8'),
+        headers={'Content-Type': 'application/json'}, method='POST')
+    try:
+        urllib.request.urlopen(req, timeout=5).close()
+    except Exception as e:
+        logging.warning(f"Failed to report result for {key}: {e}")
+
+
 # This is an actual EventHub trigger which handles Eventhub events in batches.
 # It serializes multiple event data into a json and store it into a blob.
 @app.function_name(name="eventhub_multiple")
@@ -20,7 +39,7 @@ app = func.FunctionApp()
     data_type="string",
     cardinality="many")
 @app.blob_output(arg_name="$return",
-                 path="bundle-tests/test-eventhub-batch-triggered.txt",
+                 path="bundle-tests/%RUN_ID%/test-eventhub-batch-triggered.txt",
                  connection="AzureWebJobsStorage")
 def eventhub_multiple(events) -> str:
     table_entries = []
@@ -49,7 +68,7 @@ def eventhub_output_batch(req: func.HttpRequest, out: func.Out[str]) -> str:
 @app.function_name(name="get_eventhub_batch_triggered")
 @app.route(route="get_eventhub_batch_triggered")
 @app.blob_input(arg_name="testEntities",
-                path="bundle-tests/test-eventhub-batch-triggered.txt",
+                path="bundle-tests/%RUN_ID%/test-eventhub-batch-triggered.txt",
                 connection="AzureWebJobsStorage")
 def get_eventhub_batch_triggered(req: func.HttpRequest, testEntities: func.InputStream):
     return func.HttpResponse(status_code=200, body=testEntities.read().decode('utf-8'))
@@ -59,7 +78,7 @@ def get_eventhub_batch_triggered(req: func.HttpRequest, testEntities: func.Input
 @app.function_name(name="get_metadata_batch_triggered")
 @app.route(route="get_metadata_batch_triggered")
 @app.blob_input(arg_name="file",
-                path="bundle-tests/test-metadata-batch-triggered.txt",
+                path="bundle-tests/%RUN_ID%/test-metadata-batch-triggered.txt",
                 connection="AzureWebJobsStorage")
 def get_metadata_batch_triggered(req: func.HttpRequest,
                                  file: func.InputStream) -> str:
@@ -78,7 +97,7 @@ def get_metadata_batch_triggered(req: func.HttpRequest,
     data_type="binary",
     cardinality="many")
 @app.blob_output(arg_name="$return",
-                 path="bundle-tests/test-metadata-batch-triggered.txt",
+                 path="bundle-tests/%RUN_ID%/test-metadata-batch-triggered.txt",
                  connection="AzureWebJobsStorage")
 def metadata_multiple(events: typing.List[func.EventHubEvent]) -> bytes:
     event_list = []
@@ -96,31 +115,122 @@ def metadata_multiple(events: typing.List[func.EventHubEvent]) -> bytes:
     return json.dumps(event_list)
 
 
+# Producers of metadata_output_batch, kept for the life of the worker so a
+# request does not pay for connection setup. EventHubProducerClient is not
+# thread-safe, so each producer has a lock and concurrent sends use several.
+MAX_SEND_CONCURRENCY = 4
+_producers = []
+_producers_lock = threading.Lock()
+
+
+def _get_producers(count):
+    """Return ``count`` (producer, lock) pairs, creating producers on first use."""
+    with _producers_lock:
+        while len(_producers) < count:
+            _producers.append((EventHubProducerClient.from_connection_string(
+                os.getenv('AzureWebJobsEventHubConnectionString'),
+                eventhub_name='python-worker-ci-eventhub-batch-metadata'),
+                threading.Lock()))
+        return _producers[:count]
+
+
+class EventTooLargeError(ValueError):
+    """An event does not fit even in an empty batch."""
+
+
+def _add_to_batch(batch, event):
+    """Add ``event`` to ``batch``; return False if the batch is full.
+
+    Raises:
+        EventTooLargeError: If the batch is empty, so no batch can hold it.
+    """
+    try:
+        batch.add(event)
+        return True
+    except ValueError:
+        if not len(batch):
+            raise EventTooLargeError(
+                f"Event exceeds the maximum batch size of "
+                f"{batch.max_size_in_bytes} bytes")
+        return False
+
+
+def _split_into_batches(producer, events):
+    """Fill as many batches as the events need; a full batch raises ValueError."""
+    batches = [producer.create_batch()]
+    for event in events:
+        if not _add_to_batch(batches[-1], event):
+            batches.append(producer.create_batch())
+            _add_to_batch(batches[-1], event)
+    return [batch for batch in batches if len(batch)]
+
+
 # An HttpTrigger to generating EventHub event from azure-eventhub SDK.
 # Events generated from azure-eventhub contain the full metadata.
+# ?count=N events are split over as many batches as needed, which
+# ?concurrency=M (at most MAX_SEND_CONCURRENCY) producers send in parallel.
 @app.function_name(name="metadata_output_batch")
 @app.route(route="metadata_output_batch")
 def main(req: func.HttpRequest):
     # Get event count from http request query parameter
     count = int(req.params.get('count', '1'))
+    concurrency = min(max(int(req.params.get('concurrency', '1')), 1),
+                      MAX_SEND_CONCURRENCY)
 
     # Parse event metadata from http request
     json_string = req.get_body().decode('utf-8')
     event_dict = json.loads(json_string)
 
-    # Create an EventHub Client and event batch
-    client = EventHubProducerClient.from_connection_string(
-        os.getenv('AzureWebJobsEventHubConnectionString'),
-        eventhub_name='python-worker-ci-eventhub-batch-metadata')
-
     # Generate new event based on http request with full metadata
-    event_data_batch = client.create_batch()
+    producers = _get_producers(concurrency)
     random_number = int(event_dict.get('body', '0'))
-    for i in range(count):
-        event_data_batch.add(EventData(str(random_number + i)))
-
-    # Send out event into event hub
-    with client:
-        client.send_batch(event_data_batch)
+    producer, lock = producers[0]
+    with lock:
+        try:
+            batches = _split_into_batches(
+                producer, (EventData(str(random_number + i)) for i in range(count)))
+        except EventTooLargeError as e:
+            return func.HttpResponse(str(e), status_code=400)
+
+    # Send out events into event hub, each producer sending every
+    # concurrency-th batch
+    def send(index):
+        producer, lock = producers[index]
+        with lock:
+            for batch in batches[index::concurrency]:
+                producer.send_batch(batch)
+
+    with concurrent.futures.ThreadPoolExecutor(concurrency) as pool:
+        list(pool.map(send, range(concurrency)))
+    logging.info(f"Sent {count} events in {len(batches)} batch(es)")
 
     return 'OK'
+
+
+# Benchmark mode (tests/benchmarks/workloads.py:eventhub_drain): every event
+# carries the time it was sent; the trigger reports each batch it received.
+@app.function_name(name="eventhub_benchmark")
+@app.event_hub_message_trigger(
+    arg_name="events",
+    event_hub_name="python-worker-ci-eventhub-benchmark",
+    connection="AzureWebJobsEventHubConnectionString",
+    data_type="string",
+    cardinality="many")
+def eventhub_benchmark(events) -> None:
+    triggered = time.time()
+    bodies = [json.loads(event.get_body()) for event in events]
+    _report_result('eventhub_benchmark', {
+        'triggered': triggered,
+        'size': len(bodies),
+        'events': [[body['batch'], body['seq'], body['sent']] for body in bodies],
+    })
+
+
+# Sends the JSON array in the request body as one event per element
+@app.function_name(name="eventhub_output_benchmark")
+@app.event_hub_output(arg_name="$return",
+                      connection="AzureWebJobsEventHubConnectionString",
+                      event_hub_name="python-worker-ci-eventhub-benchmark")
+@app.route(route="eventhub_output_benchmark", binding_arg_name="out")
+def eventhub_output_benchmark(req: func.HttpRequest, out: func.Out[str]) -> str:
+    return req.get_body().decode('utf-8')
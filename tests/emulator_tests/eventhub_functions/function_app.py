@@ -1,6 +1,8 @@
 import json
+import logging
 import os
 import typing
+import urllib.request
 
 import azure.functions as func
 from azure.eventhub import EventData
@@ -9,6 +11,20 @@ from azure.eventhub.aio import EventHubProducerClient
 app = func.FunctionApp()
 
 
+def _report_result(key, payload):
+    """Push a trigger result to the test harness result sink, if configured."""
+    sink_url = os.environ.get('RESULT_SINK_URL')
+    if not sink_url:
+        return
+    req = urllib.request.Request(
+        f"{sink_url}/{key}", data=json.dumps(payload).encode('utf-8'),
+        headers={'Content-Type': 'application/json'}, method='POST')
+    try:
+        urllib.request.urlopen(req, timeout=5).close()
+    except Exception as e:
+        logging.warning(f"Failed to report result for {key}: {e}")
+
+
 # An HttpTrigger to generating EventHub event from EventHub Output Binding
 @app.function_name(name="eventhub_output")
 @app.route(route="eventhub_output")
@@ -28,9 +44,10 @@ def eventhub_output(req: func.HttpRequest, event: func.Out[str]):
                                connection="AzureWebJobsEventHubConnectionString"
                                )
 @app.blob_output(arg_name="$return",
-                 path="bundle-tests/test-eventhub-triggered.txt",
+                 path="bundle-tests/%RUN_ID%/test-eventhub-triggered.txt",
                  connection="AzureWebJobsStorage")
 def eventhub_trigger(event: func.EventHubEvent) -> bytes:
+    _report_result('eventhub_trigger', event.get_body().decode('utf-8'))
     return event.get_body()
 
 
@@ -38,7 +55,7 @@ def eventhub_trigger(event: func.EventHubEvent) -> bytes:
 @app.function_name(name="get_eventhub_triggered")
 @app.route(route="get_eventhub_triggered")
 @app.blob_input(arg_name="file",
-                path="bundle-tests/test-eventhub-triggered.txt",
+                path="bundle-tests/%RUN_ID%/test-eventhub-triggered.txt",
                 connection="AzureWebJobsStorage")
 def get_eventhub_triggered(req: func.HttpRequest,
                            file: func.InputStream) -> str:
@@ -49,7 +66,7 @@ def get_eventhub_triggered(req: func.HttpRequest,
 @app.function_name(name="get_metadata_triggered")
 @app.route(route="get_metadata_triggered")
 @app.blob_input(arg_name="file",
-                path="bundle-tests/test-metadata-triggered.txt",
+                path="bundle-tests/%RUN_ID%/test-metadata-triggered.txt",
                 connection="AzureWebJobsStorage")
 async def get_metadata_triggered(req: func.HttpRequest,
                                  file: func.InputStream) -> str:
@@ -91,7 +108,7 @@ async def metadata_output(req: func.HttpRequest):
     event_hub_name="python-worker-ci-eventhub-one-metadata",
     connection="AzureWebJobsEventHubConnectionString")
 @app.blob_output(arg_name="$return",
-                 path="bundle-tests/test-metadata-triggered.txt",
+                 path="bundle-tests/%RUN_ID%/test-metadata-triggered.txt",
                  connection="AzureWebJobsStorage")
 async def metadata_trigger(event: func.EventHubEvent) -> bytes:
     event_dict: typing.Mapping[str, typing.Any] = {
@@ -104,4 +121,5 @@ async def metadata_trigger(event: func.EventHubEvent) -> bytes:
         'metadata': event.metadata
     }
 
+    _report_result('metadata_trigger', event_dict)
     return json.dumps(event_dict)
@@ -1,4 +1,7 @@
 import json
+import logging
+import os
+import urllib.request
 
 import azure.functions as func
 
@@ -8,21 +11,36 @@ app = func.FunctionApp()
 _kafka_metadata_result = {}
 
 
+def _report_result(key, payload):
+    """Push a trigger result to the test harness result sink, if configured."""
+    sink_url = os.environ.get('RESULT_SINK_URL')
+    if not sink_url:
+        return
+    req = urllib.request.Request(
+        f"{sink_url}/{key}", data=json.dumps(payload).encode('utf-8'),
+        headers={'Content-Type': 'application/json'}, method='POST')
+    try:
+        urllib.request.urlopen(req, timeout=5).close()
+    except Exception as e:
+        logging.warning(f"Failed to report result for {key}: {e}")
+
+
 # A Kafka trigger which stores the event value into a storage blob.
 # The Kafka event body is a JSON envelope with Offset, Partition, Topic,
 # Value, Headers, Key fields. We extract the Value field.
 @app.function_name(name="kafka_trigger")
 @app.kafka_trigger(arg_name="event",
-                   topic="e2e-test-topic",
+                   topic="e2e-test-topic-%RUN_ID%",
                    broker_list="BrokerList",
                    consumer_group="e2e_tests",
                    data_type="string")
 @app.blob_output(arg_name="$return",
-                 path="bundle-tests/test-kafka-triggered.txt",
+                 path="bundle-tests/%RUN_ID%/test-kafka-triggered.txt",
                  connection="AzureWebJobsStorage")
 def kafka_trigger(event: func.KafkaEvent) -> str:
     body = event.get_body()
     event_data = json.loads(body)
+    _report_result('kafka_trigger', event_data.get('Value', ''))
     return event_data.get('Value', '')
 
 
@@ -30,7 +48,7 @@ def kafka_trigger(event: func.KafkaEvent) -> str:
 @app.function_name(name="get_kafka_triggered")
 @app.route(route="get_kafka_triggered")
 @app.blob_input(arg_name="file",
-                path="bundle-tests/test-kafka-triggered.txt",
+                path="bundle-tests/%RUN_ID%/test-kafka-triggered.txt",
                 connection="AzureWebJobsStorage")
 def get_kafka_triggered(req: func.HttpRequest,
                         file: func.InputStream) -> str:
@@ -41,7 +59,7 @@ def get_kafka_triggered(req: func.HttpRequest,
 @app.function_name(name="kafka_output")
 @app.route(route="kafka_output")
 @app.kafka_output(arg_name="event",
-                  topic="e2e-output-topic",
+                  topic="e2e-output-topic-%RUN_ID%",
                   broker_list="BrokerList")
 def kafka_output(req: func.HttpRequest, event: func.Out[str]):
     event.set(req.get_body().decode('utf-8'))
@@ -51,16 +69,17 @@ def kafka_output(req: func.HttpRequest, event: func.Out[str]):
 # A Kafka trigger on the output topic that stores the event value into blob
 @app.function_name(name="kafka_output_trigger")
 @app.kafka_trigger(arg_name="event",
-                   topic="e2e-output-topic",
+                   topic="e2e-output-topic-%RUN_ID%",
                    broker_list="BrokerList",
                    consumer_group="e2e_output_tests",
                    data_type="string")
 @app.blob_output(arg_name="$return",
-                 path="bundle-tests/test-kafka-output-triggered.txt",
+                 path="bundle-tests/%RUN_ID%/test-kafka-output-triggered.txt",
                  connection="AzureWebJobsStorage")
 def kafka_output_trigger(event: func.KafkaEvent) -> str:
     body = event.get_body()
     event_data = json.loads(body)
+    _report_result('kafka_output_trigger', event_data.get('Value', ''))
     return event_data.get('Value', '')
 
 
@@ -68,7 +87,7 @@ def kafka_output_trigger(event: func.KafkaEvent) -> str:
 @app.function_name(name="get_kafka_output_triggered")
 @app.route(route="get_kafka_output_triggered")
 @app.blob_input(arg_name="file",
-                path="bundle-tests/test-kafka-output-triggered.txt",
+                path="bundle-tests/%RUN_ID%/test-kafka-output-triggered.txt",
                 connection="AzureWebJobsStorage")
 def get_kafka_output_triggered(req: func.HttpRequest,
                                file: func.InputStream) -> str:
@@ -78,7 +97,7 @@ def get_kafka_output_triggered(req: func.HttpRequest,
 # A Kafka trigger with metadata. Stores result in a global variable.
 @app.function_name(name="kafka_metadata_trigger")
 @app.kafka_trigger(arg_name="event",
-                   topic="e2e-metadata-topic",
+                   topic="e2e-metadata-topic-%RUN_ID%",
                    broker_list="BrokerList",
                    consumer_group="e2e_metadata_tests",
                    data_type="string")
@@ -94,6 +113,7 @@ def kafka_metadata_trigger(event: func.KafkaEvent):
         'key': event.key,
         'timestamp': event.timestamp,
     }
+    _report_result('kafka_metadata_trigger', _kafka_metadata_result)
 
 
 # Retrieve the metadata trigger result from in-process global variable
@@ -1,17 +1,34 @@
 import json
 import logging
+import os
+import time
 import typing
+import urllib.request
 
 import azure.functions as func
 
 app = func.FunctionApp()
 
 
+def _report_result(key, payload):
+    """Push a trigger result to the test harness result sink, if configured."""
+    sink_url = os.environ.get('RESULT_SINK_URL')
+    if not sink_url:
+        return
+    req = urllib.request.Request(
+        f"{sink_url}/{key}", data=json.dumps(payload).encode('utf-8'),
+        headers={'Content-Type': 'application/json'}, method='POST')
+    try:
+        urllib.request.urlopen(req, timeout=5).close()
+    except Exception as e:
+        logging.warning(f"Failed to report result for {key}: {e}")
+
+
 @app.function_name(name="get_queue_blob")
 @app.route(route="get_queue_blob")
 @app.blob_input(arg_name="file",
                 connection="AzureWebJobsStorage",
-                path="bundle-tests/test-queue-blob.txt")
+                path="bundle-tests/%RUN_ID%/test-queue-blob.txt")
 def get_queue_blob(req: func.HttpRequest, file: func.InputStream) -> str:
     return json.dumps({
         'queue': json.loads(file.read().decode('utf-8'))
@@ -22,7 +39,7 @@ def get_queue_blob(req: func.HttpRequest, file: func.InputStream) -> str:
 @app.route(route="get_queue_blob_message_return")
 @app.blob_input(arg_name="file",
                 connection="AzureWebJobsStorage",
-                path="bundle-tests/test-queue-blob-message-return.txt")
+                path="bundle-tests/%RUN_ID%/test-queue-blob-message-return.txt")
 def get_queue_blob_message_return(req: func.HttpRequest,
                                   file: func.InputStream) -> str:
     return file.read().decode('utf-8')
@@ -32,7 +49,7 @@ def get_queue_blob_message_return(req: func.HttpRequest,
 @app.route(route="get_queue_blob_return")
 @app.blob_input(arg_name="file",
                 connection="AzureWebJobsStorage",
-                path="bundle-tests/test-queue-blob-return.txt")
+                path="bundle-tests/%RUN_ID%/test-queue-blob-return.txt")
 def get_queue_blob_return(req: func.HttpRequest, file: func.InputStream) -> str:
     return file.read().decode('utf-8')
 
@@ -41,7 +58,7 @@ def get_queue_blob_return(req: func.HttpRequest, file: func.InputStream) -> str:
 @app.route(route="get_queue_untyped_blob_return")
 @app.blob_input(arg_name="file",
                 connection="AzureWebJobsStorage",
-                path="bundle-tests/test-queue-untyped-blob-return.txt")
+                path="bundle-tests/%RUN_ID%/test-queue-untyped-blob-return.txt")
 def get_queue_untyped_blob_return(req: func.HttpRequest,
                                   file: func.InputStream) -> str:
     return file.read().decode('utf-8')
@@ -51,7 +68,7 @@ def get_queue_untyped_blob_return(req: func.HttpRequest,
 @app.route(route="put_queue")
 @app.queue_output(arg_name="msg",
                   connection="AzureWebJobsStorage",
-                  queue_name="testqueue")
+                  queue_name="testqueue-%RUN_ID%")
 def put_queue(req: func.HttpRequest, msg: func.Out[str]):
     msg.set(req.get_body())
 
@@ -62,7 +79,7 @@ def put_queue(req: func.HttpRequest, msg: func.Out[str]):
 @app.route(route="put_queue_message_return", binding_arg_name="resp")
 @app.queue_output(arg_name="$return",
                   connection="AzureWebJobsStorage",
-                  queue_name="testqueue-message-return")
+                  queue_name="testqueue-message-return-%RUN_ID%")
 def main(req: func.HttpRequest, resp: func.Out[str]) -> bytes:
     return func.QueueMessage(body=req.get_body())
 
@@ -71,7 +88,7 @@ def main(req: func.HttpRequest, resp: func.Out[str]) -> bytes:
 @app.route(route="put_queue_multiple_out", binding_arg_name="resp")
 @app.queue_output(arg_name="msg",
                   connection="AzureWebJobsStorage",
-                  queue_name="testqueue-return-multiple-outparam")
+                  queue_name="testqueue-return-multiple-outparam-%RUN_ID%")
 def put_queue_multiple_out(req: func.HttpRequest,
                            resp: func.Out[func.HttpResponse],
                            msg: func.Out[func.QueueMessage]) -> None:
@@ -84,7 +101,7 @@ def put_queue_multiple_out(req: func.HttpRequest,
 @app.route(route="put_queue_return", binding_arg_name="resp")
 @app.queue_output(arg_name="$return",
                   connection="AzureWebJobsStorage",
-                  queue_name="testqueue-return")
+                  queue_name="testqueue-return-%RUN_ID%")
 def put_queue_return(req: func.HttpRequest, resp: func.Out[str]) -> bytes:
     return req.get_body()
 
@@ -93,7 +110,7 @@ def put_queue_return(req: func.HttpRequest, resp: func.Out[str]) -> bytes:
 @app.route(route="put_queue_multiple_return")
 @app.queue_output(arg_name="msgs",
                   connection="AzureWebJobsStorage",
-                  queue_name="testqueue-return-multiple")
+                  queue_name="testqueue-return-multiple-%RUN_ID%")
 def put_queue_multiple_return(req: func.HttpRequest,
                               msgs: func.Out[typing.List[str]]):
     msgs.set(['one', 'two'])
@@ -103,7 +120,7 @@ def put_queue_multiple_return(req: func.HttpRequest,
 @app.route(route="put_queue_untyped_return", binding_arg_name="resp")
 @app.queue_output(arg_name="$return",
                   connection="AzureWebJobsStorage",
-                  queue_name="testqueue-untyped-return")
+                  queue_name="testqueue-untyped-return-%RUN_ID%")
 def put_queue_untyped_return(req: func.HttpRequest,
                              resp: func.Out[str]) -> bytes:
     return func.QueueMessage(body=req.get_body())
@@ -111,11 +128,11 @@ def put_queue_untyped_return(req: func.HttpRequest,
 
 @app.function_name(name="queue_trigger")
 @app.queue_trigger(arg_name="msg",
-                   queue_name="testqueue",
+                   queue_name="testqueue-%RUN_ID%",
                    connection="AzureWebJobsStorage")
 @app.blob_output(arg_name="$return",
                  connection="AzureWebJobsStorage",
-                 path="bundle-tests/test-queue-blob.txt")
+                 path="bundle-tests/%RUN_ID%/test-queue-blob.txt")
 def queue_trigger(msg: func.QueueMessage) -> str:
     result = json.dumps({
         'id': msg.id,
@@ -130,47 +147,54 @@ def queue_trigger(msg: func.QueueMessage) -> str:
         'dequeue_count': msg.dequeue_count
     })
 
+    _report_result('queue_trigger', json.loads(result))
     return result
 
 
 @app.function_name(name="queue_trigger_message_return")
 @app.queue_trigger(arg_name="msg",
-                   queue_name="testqueue-message-return",
+                   queue_name="testqueue-message-return-%RUN_ID%",
                    connection="AzureWebJobsStorage")
 @app.blob_output(arg_name="$return",
                  connection="AzureWebJobsStorage",
-                 path="bundle-tests/test-queue-blob-message-return.txt")
+                 path="bundle-tests/%RUN_ID%/test-queue-blob-message-return.txt")
 def queue_trigger_message_return(msg: func.QueueMessage) -> bytes:
+    _report_result('queue_trigger_message_return',
+                   msg.get_body().decode('utf-8'))
     return msg.get_body()
 
 
 @app.function_name(name="queue_trigger_return")
 @app.queue_trigger(arg_name="msg",
-                   queue_name="testqueue-return",
+                   queue_name="testqueue-return-%RUN_ID%",
                    connection="AzureWebJobsStorage")
 @app.blob_output(arg_name="$return",
                  connection="AzureWebJobsStorage",
-                 path="bundle-tests/test-queue-blob-return.txt")
+                 path="bundle-tests/%RUN_ID%/test-queue-blob-return.txt")
 def queue_trigger_return(msg: func.QueueMessage) -> bytes:
+    _report_result('queue_trigger_return', msg.get_body().decode('utf-8'))
     return msg.get_body()
 
 
 @app.function_name(name="queue_trigger_return_multiple")
 @app.queue_trigger(arg_name="msg",
-                   queue_name="testqueue-return-multiple",
+                   queue_name="testqueue-return-multiple-%RUN_ID%",
                    connection="AzureWebJobsStorage")
 def queue_trigger_return_multiple(msg: func.QueueMessage) -> None:
     logging.info('trigger on message: %s', msg.get_body().decode('utf-8'))
+    _report_result('queue_trigger_return_multiple',
+                   msg.get_body().decode('utf-8'))
 
 
 @app.function_name(name="queue_trigger_untyped")
 @app.queue_trigger(arg_name="msg",
-                   queue_name="testqueue-untyped-return",
+                   queue_name="testqueue-untyped-return-%RUN_ID%",
                    connection="AzureWebJobsStorage")
 @app.blob_output(arg_name="$return",
                  connection="AzureWebJobsStorage",
-                 path="bundle-tests/test-queue-untyped-blob-return.txt")
+                 path="bundle-tests/%RUN_ID%/test-queue-untyped-blob-return.txt")
 def queue_trigger_untyped(msg: str) -> str:
+    _report_result('queue_trigger_untyped', msg)
     return msg
 
 
@@ -178,8 +202,39 @@ def queue_trigger_untyped(msg: str) -> str:
 @app.route(route="put_queue_return_multiple", binding_arg_name="resp")
 @app.queue_output(arg_name="msgs",
                   connection="AzureWebJobsStorage",
-                  queue_name="testqueue-return-multiple")
+                  queue_name="testqueue-return-multiple-%RUN_ID%")
 def put_queue_return_multiple(req: func.HttpRequest,
                               resp: func.Out[str],
                               msgs: func.Out[typing.List[str]]):
-    msgs.set(['one', 'two'])
+    # Derived from the request body so a test can tell its messages apart
+    data = req.get_body().decode()
+    msgs.set([f'{data}-one', f'{data}-two'])
+
+
+# Benchmark mode (tests/benchmarks/workloads.py:queue_drain): every message
+# carries the time it was sent, so the trigger only reports when it started.
+@app.function_name(name="put_queue_benchmark")
+@app.route(route="put_queue_benchmark")
+@app.queue_output(arg_name="msg",
+                  connection="AzureWebJobsStorage",
+                  queue_name="benchqueue-%RUN_ID%")
+def put_queue_benchmark(req: func.HttpRequest, msg: func.Out[str]):
+    msg.set(req.get_body().decode('utf-8'))
+
+    return 'OK'
+
+
+@app.function_name(name="queue_trigger_benchmark")
+@app.queue_trigger(arg_name="msg",
+                   queue_name="benchqueue-%RUN_ID%",
+                   connection="AzureWebJobsStorage")
+def queue_trigger_benchmark(msg: func.QueueMessage) -> None:
+    triggered = time.time()
+    body = json.loads(msg.get_body().decode('utf-8'))
+    _report_result('queue_trigger_benchmark', {
+        'batch': body['batch'],
+        'seq': body['seq'],
+        'sent': body['sent'],
+        'triggered': triggered,
+        'dequeue_count': msg.dequeue_count,
+    })
@@ -19,12 +19,12 @@ app = func.FunctionApp()
     arg_name="message",
     type="rabbitmqtrigger",
     connectionStringSetting="RabbitMQConnectionString",
-    queueName="e2e-test-queue",
+    queueName="e2e-test-queue-%RUN_ID%",
     data_type="string"
 )
 @app.blob_output(
     arg_name="$return",
-    path="bundle-tests/test-rabbitmq-triggered.txt",
+    path="bundle-tests/%RUN_ID%/test-rabbitmq-triggered.txt",
     connection="AzureWebJobsStorage"
 )
 def rabbitmq_trigger(message: str) -> str:
@@ -37,7 +37,7 @@ def rabbitmq_trigger(message: str) -> str:
 @app.route(route="get_rabbitmq_triggered")
 @app.blob_input(
     arg_name="file",
-    path="bundle-tests/test-rabbitmq-triggered.txt",
+    path="bundle-tests/%RUN_ID%/test-rabbitmq-triggered.txt",
     connection="AzureWebJobsStorage"
 )
 def get_rabbitmq_triggered(req: func.HttpRequest,
@@ -52,7 +52,7 @@ def get_rabbitmq_triggered(req: func.HttpRequest,
     arg_name="rabbitmqOutput",
     type="rabbitmq",
     connectionStringSetting="RabbitMQConnectionString",
-    queueName="e2e-output-queue"
+    queueName="e2e-output-queue-%RUN_ID%"
 )
 def rabbitmq_output(req: func.HttpRequest,
                     rabbitmqOutput: func.Out[str]) -> str:
@@ -68,12 +68,12 @@ def rabbitmq_output(req: func.HttpRequest,
     arg_name="message",
     type="rabbitmqtrigger",
     connectionStringSetting="RabbitMQConnectionString",
-    queueName="e2e-output-queue",
+    queueName="e2e-output-queue-%RUN_ID%",
     data_type="string"
 )
 @app.blob_output(
     arg_name="$return",
-    path="bundle-tests/test-rabbitmq-output-triggered.txt",
+    path="bundle-tests/%RUN_ID%/test-rabbitmq-output-triggered.txt",
     connection="AzureWebJobsStorage"
 )
 def rabbitmq_output_trigger(message: str) -> str:
@@ -86,7 +86,7 @@ def rabbitmq_output_trigger(message: str) -> str:
 @app.route(route="get_rabbitmq_output_triggered")
 @app.blob_input(
     arg_name="file",
-    path="bundle-tests/test-rabbitmq-output-triggered.txt",
+    path="bundle-tests/%RUN_ID%/test-rabbitmq-output-triggered.txt",
     connection="AzureWebJobsStorage"
 )
 def get_rabbitmq_output_triggered(req: func.HttpRequest,
@@ -1,10 +1,27 @@
 import json
+import logging
+import os
+import urllib.request
 
 import azure.functions as func
 
 app = func.FunctionApp()
 
 
+def _report_result(key, payload):
+    """Push a trigger result to the test harness result sink, if configured."""
+    sink_url = os.environ.get('RESULT_SINK_URL')
+    if not sink_url:
+        return
+    req = urllib.request.Request(
+        f"{sink_url}/{key}", data=json.dumps(payload).encode('utf-8'),
+        headers={'Content-Type': 'application/json'}, method='POST')
+    try:
+        urllib.request.urlopen(req, timeout=5).close()
+    except Exception as e:
+        logging.warning(f"Failed to report result for {key}: {e}")
+
+
 @app.route(route="put_message")
 @app.service_bus_queue_output(
     arg_name="msg",
@@ -17,7 +34,7 @@ def put_message(req: func.HttpRequest, msg: func.Out[str]):
 
 @app.route(route="get_servicebus_triggered")
 @app.blob_input(arg_name="file",
-                path="bundle-tests/test-servicebus-triggered.txt",
+                path="bundle-tests/%RUN_ID%/test-servicebus-triggered.txt",
                 connection="AzureWebJobsStorage")
 def get_servicebus_triggered(req: func.HttpRequest,
                              file: func.InputStream) -> str:
@@ -30,7 +47,7 @@ def get_servicebus_triggered(req: func.HttpRequest,
     connection="AzureWebJobsServiceBusConnectionString",
     queue_name="testqueue")
 @app.blob_output(arg_name="$return",
-                 path="bundle-tests/test-servicebus-triggered.txt",
+                 path="bundle-tests/%RUN_ID%/test-servicebus-triggered.txt",
                  connection="AzureWebJobsStorage")
 def servicebus_trigger(msg: func.ServiceBusMessage) -> str:
     result = json.dumps({
@@ -70,4 +87,5 @@ def servicebus_trigger(msg: func.ServiceBusMessage) -> str:
         'transaction_partition_key': msg.transaction_partition_key
     })
 
+    _report_result('servicebus_trigger', json.loads(result))
     return result
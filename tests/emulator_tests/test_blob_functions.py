@@ -1,9 +1,9 @@
 # Copyright (c) Microsoft Corporation. All rights reserved.
 # Licensed under the MIT License.
-import time
+import uuid
 
-from requests import JSONDecodeError
 from tests.utils import testutils
+from tests.utils.run_namespace import scoped_blob_path
 
 
 class TestBlobFunctions(testutils.WebHostTestCase):
@@ -89,62 +89,39 @@ class TestBlobFunctions(testutils.WebHostTestCase):
         self.assertEqual(r.text, 'FROM RETURN')
 
     def test_blob_trigger(self):
-        data = "DummyData"
+        data = f"DummyData-{uuid.uuid4().hex}"
 
         r = self.webhost.request('POST', 'put_blob_trigger',
                                  data=data.encode('utf-8'))
         self.assertEqual(r.status_code, 200)
         self.assertEqual(r.text, 'OK')
 
-        # Blob trigger may be processed after some delay
-        # We check it every 2 seconds to allow the trigger to be fired
-        max_retries = 10
-        for try_no in range(max_retries):
-            time.sleep(2)
+        # Blob trigger may be processed after some delay, so wait until
+        # the trigger has pushed the content we just uploaded
+        response = self.result_sink.wait_for(
+            'blob_trigger',
+            match=lambda b: b['content'] == data,
+            timeout=20)
 
-            try:
-                # Check that the trigger has fired
-                r = self.webhost.request('GET', 'get_blob_triggered')
-                self.assertEqual(r.status_code, 200)
-                response = r.json()
-
-                self.assertEqual(response['name'],
-                                 'bundle-tests/test-blob-trigger.txt')
-                self.assertEqual(response['content'], data)
-
-                break
-            # JSONDecodeError will be thrown if the response is empty.
-            except (AssertionError, JSONDecodeError):
-                if try_no == max_retries - 1:
-                    raise
+        self.assertEqual(response['name'],
+                         scoped_blob_path('test-blob-trigger.txt'))
+        self.assertEqual(response['content'], data)
 
     def test_blob_trigger_with_large_content(self):
-        data = 'DummyDataDummyDataDummyData' * 1024 * 1024  # 27 MB
+        data = uuid.uuid4().hex + 'DummyDataDummyDataDummyData' * 1024 * 1024  # 27 MB
 
         r = self.webhost.request('POST', 'put_blob_trigger',
                                  data=data.encode('utf-8'))
         self.assertEqual(r.status_code, 200)
         self.assertEqual(r.text, 'OK')
 
-        # Blob trigger may be processed after some delay
-        # We check it every 2 seconds to allow the trigger to be fired
-        max_retries = 10
-        for try_no in range(max_retries):
-            try:
-                # Check that the trigger has fired
-                r = self.webhost.request('GET', 'get_blob_triggered')
-
-                # Waiting for blob to get updated
-                time.sleep(2)
-
-                self.assertEqual(r.status_code, 200)
-                response = r.json()
-
-                self.assertEqual(response['name'],
-                                 'bundle-tests/test-blob-trigger.txt')
-                self.assertEqual(response['content'], data)
-                break
-            # JSONDecodeError will be thrown if the response is empty.
-            except (AssertionError, JSONDecodeError):
-                if try_no == max_retries - 1:
-                    raise
+        # Blob trigger may be processed after some delay, so wait until
+        # the trigger has pushed the content we just uploaded
+        response = self.result_sink.wait_for(
+            'blob_trigger',
+            match=lambda b: b['content'] == data,
+            timeout=20)
+
+        self.assertEqual(response['name'],
+                         scoped_blob_path('test-blob-trigger.txt'))
+        self.assertEqual(response['content'], data)
@@ -86,29 +86,31 @@ def poll_until(condition_fn, max_retries=10, retry_delay=1, description="conditi
     """Poll until condition is met or timeout.
 
     This is the recommended pattern for avoiding flaky tests. Instead of
-    fixed sleep times, we poll with retries until the expected condition
-    is met, returning early on success.
+    fixed sleep times, we poll with backoff (see testutils.wait_until)
+    until the expected condition is met, returning early on success.
 
     Args:
         condition_fn: Callable that returns (success: bool, result: any)
-        max_retries: Maximum number of polling attempts
-        retry_delay: Delay in seconds between attempts
+        max_retries: Polling budget, together with retry_delay
+        retry_delay: Maximum delay in seconds between attempts
         description: Description for logging
 
     Returns:
         The result from condition_fn when successful, or last result on timeout
     """
     result = None
-    for attempt in range(max_retries):
+
+    def check():
+        nonlocal result
         success, result = condition_fn()
-        if success:
-            logger.info(f"{description} succeeded on attempt {attempt + 1}")
-            return result
-        if attempt < max_retries - 1:
-            logger.info(f"Waiting for {description} "
-                        f"(attempt {attempt + 1}/{max_retries})...")
-            time.sleep(retry_delay)
-    logger.warning(f"{description} not met after {max_retries} attempts")
+        return success
+
+    try:
+        testutils.wait_until(check, timeout=max_retries * retry_delay,
+                             backoff=testutils.Backoff(maximum=retry_delay),
+                             description=description)
+    except TimeoutError:
+        logger.warning(f"{description} not met after {max_retries * retry_delay}s")
     return result
 
 
@@ -158,7 +160,7 @@ class TestCosmosDBFunctions(testutils.WebHostTestCase):
 
     def test_cosmosdb_trigger(self):
         """Test basic CosmosDB change feed trigger"""
-        data = str(round(time.time()))
+        data = uuid.uuid4().hex
         doc = {'id': 'cosmosdb-trigger-test', 'data': data}
 
         logger.info("Creating document in CosmosDB...")
@@ -168,11 +170,10 @@ class TestCosmosDBFunctions(testutils.WebHostTestCase):
         self.assertEqual(r.text, 'OK')
 
         logger.info("Waiting for CosmosDB trigger to execute...")
-        r = self.webhost.wait_and_request('GET', 'get_cosmosdb_triggered',
-                                          wait_time=5, max_retries=10,
-                                          expected_status=200)
-
-        response = r.json()
+        response = self.result_sink.wait_for(
+            'cosmosdb_trigger',
+            match=lambda d: d.get('id') == doc['id'] and d.get('data') == data,
+            timeout=15)
         response.pop('_metadata', None)
 
         self.assertEqual(response['id'], doc['id'])
@@ -1,5 +1,4 @@
 import json
-import time
 
 
 from tests.utils import testutils
@@ -23,17 +22,26 @@ class TestDurableFunctions(testutils.WebHostTestCase):
 
         # poll status
         import requests
-        for _ in range(30):
+
+        def finished():
             s = requests.get(status_query_uri)
             if s.status_code == 200:
                 data = json.loads(s.text)
                 runtime_status = (data.get('runtimeStatus') or data.get('runtime_status') or '').lower()
                 if runtime_status in ('completed', 'failed', 'terminated'):
-                    # Ensure instance_id captured
-                    instance_id = instance_id or data.get('id')
-                    return instance_id, data
-            time.sleep(1)
-        self.fail('orchestration did not complete in time')
+                    return data
+            return None
+
+        try:
+            data = testutils.wait_until(
+                finished, timeout=30,
+                ignored_exceptions=(requests.exceptions.RequestException,),
+                description=f'orchestration {function_name} finished')
+        except TimeoutError:
+            self.fail('orchestration did not complete in time')
+        # Ensure instance_id captured
+        instance_id = instance_id or data.get('id')
+        return instance_id, data
 
     def test_orchestration_output(self):
         """Test orchestration completes and returns expected city greetings"""
@@ -3,7 +3,7 @@
 import json
 import logging
 import sys
-import time
+import uuid
 
 from unittest import skipIf
 
@@ -31,7 +31,7 @@ class TestEventHubFunctions(testutils.WebHostTestCase):
 
     def test_eventhub_trigger(self):
         # Generate a unique event body for the EventHub event
-        data = str(round(time.time()))
+        data = uuid.uuid4().hex
         doc = {'id': data}
 
         # Invoke eventhub_output HttpTrigger to generate an EventHub Event
@@ -42,14 +42,14 @@ class TestEventHubFunctions(testutils.WebHostTestCase):
                                 expected_status=200)
         self.assertEqual(r.text, 'OK')
 
-        # Wait for eventhub_trigger to execute and convert event into blob
+        # Wait for eventhub_trigger to execute and push the event body
         logger.info("Waiting for EventHub trigger to execute...")
-        r = self.webhost.wait_and_request('GET', 'get_eventhub_triggered',
-                                         wait_time=10,  # EventHub needs more time
-                                         max_retries=10,
-                                         expected_status=200)
-        
-        response = r.json()
+        body = self.result_sink.wait_for(
+            'eventhub_trigger',
+            match=lambda b: json.loads(b) == doc,
+            timeout=20)  # EventHub needs more time
+
+        response = json.loads(body)
 
         # Check if the event body matches the initial data
         self.assertEqual(response, doc)
@@ -60,9 +60,9 @@ class TestEventHubFunctions(testutils.WebHostTestCase):
     @testutils.retryable_test(3, 5)
     def test_eventhub_trigger_with_metadata(self):
         # Generate a unique event body for EventHub event
-        random_number = str(round(time.time()) % 1000)
+        token = uuid.uuid4().hex
         req_body = {
-            'body': random_number
+            'body': token
         }
 
         # Invoke metadata_output HttpTrigger to generate an EventHub event from azure-eventhub SDK
@@ -73,16 +73,15 @@ class TestEventHubFunctions(testutils.WebHostTestCase):
                                 expected_status=200)
         self.assertIn('OK', r.text)
 
-        # Wait for eventhub_trigger to execute and convert event metadata into blob
+        # Wait for metadata_trigger to execute and push the event metadata
         logger.info("Waiting for EventHub metadata trigger to execute...")
-        r = self.webhost.wait_and_request('GET', 'get_metadata_triggered',
-                                         wait_time=10,  # EventHub needs more time
-                                         max_retries=10,
-                                         expected_status=200)
-
-        # Check if the event body matches the unique random_number
-        event = r.json()
-        self.assertEqual(event['body'], random_number)
+        event = self.result_sink.wait_for(
+            'metadata_trigger',
+            match=lambda e: e['body'] == token,
+            timeout=20)  # EventHub needs more time
+
+        # Check if the event body matches the unique token
+        self.assertEqual(event['body'], token)
 
         # EventhubEvent property check
         # Reenable these lines after enqueued_time property is fixed
@@ -3,19 +3,25 @@
 import json
 import logging
 import os
-import time
+import uuid
 
 from confluent_kafka import Producer
+from confluent_kafka.admin import AdminClient, NewTopic
 from tests.utils import testutils
+from tests.utils.run_namespace import keep_run_resources, scoped_name
 
 logger = logging.getLogger(__name__)
 
 
+def _get_broker():
+    return os.environ.get('BrokerList', 'localhost:9092')
+
+
 def _produce_kafka_message(topic: str, value: str,
                            broker: str = None):
     """Produce a message to a Kafka topic using confluent-kafka."""
     if broker is None:
-        broker = os.environ.get('BrokerList', 'localhost:9092')
+        broker = _get_broker()
     producer = Producer({'bootstrap.servers': broker})
     producer.produce(topic, value=value.encode('utf-8'))
     undelivered = producer.flush(timeout=10)
@@ -45,28 +51,63 @@ class TestKafkaFunctions(testutils.WebHostTestCase):
     def get_script_dir(cls):
         return testutils.EMULATOR_TESTS_FOLDER / 'kafka_functions'
 
+    # Topics used by the E2E test functions, as "<name>-%RUN_ID%"
+    TOPICS = ('e2e-test-topic', 'e2e-output-topic', 'e2e-metadata-topic')
+
     @classmethod
     def get_libraries_to_install(cls):
         return ['confluent-kafka']
 
+    @classmethod
+    def setUpClass(cls):
+        """Create this run's topics, then start the WebHost.
+
+        The triggers subscribe before any message is produced; a topic
+        that does not exist yet would only be picked up at the consumer's
+        next metadata refresh.
+        """
+        admin = AdminClient({'bootstrap.servers': _get_broker()})
+        topics = [NewTopic(scoped_name(t), num_partitions=1,
+                           replication_factor=1) for t in cls.TOPICS]
+        for topic, future in admin.create_topics(topics).items():
+            try:
+                future.result()
+            except Exception as e:
+                # Already created by an earlier class of the same run
+                logger.info("Kafka topic %s not created: %s", topic, e)
+        super().setUpClass()
+
+    @classmethod
+    def tearDownClass(cls):
+        super().tearDownClass()
+        if keep_run_resources():
+            return
+        admin = AdminClient({'bootstrap.servers': _get_broker()})
+        topics = [scoped_name(t) for t in cls.TOPICS]
+        for topic, future in admin.delete_topics(topics).items():
+            try:
+                future.result()
+            except Exception as e:
+                logger.warning("Kafka topic %s not deleted: %s", topic, e)
+
     @testutils.retryable_test(3, 5)
     def test_kafka_trigger(self):
         # Generate a unique event body for the Kafka event
-        data = str(round(time.time()))
+        data = uuid.uuid4().hex
         doc = {'id': data}
 
         # Produce a Kafka message directly via confluent-kafka client
         logger.info("Producing Kafka message...")
-        _produce_kafka_message('e2e-test-topic', json.dumps(doc))
+        _produce_kafka_message(scoped_name('e2e-test-topic'), json.dumps(doc))
 
-        # Wait for kafka_trigger to execute and store event into blob
+        # Wait for kafka_trigger to execute and push the event value
         logger.info("Waiting for Kafka trigger to execute...")
-        r = self.webhost.wait_and_request('GET', 'get_kafka_triggered',
-                                         wait_time=15,
-                                         max_retries=10,
-                                         expected_status=200)
+        value = self.result_sink.wait_for(
+            'kafka_trigger',
+            match=lambda v: json.loads(v) == doc,
+            timeout=25)
 
-        response = r.json()
+        response = json.loads(value)
 
         # Check if the event body matches the initial data
         self.assertEqual(response, doc)
@@ -79,7 +120,7 @@ class TestKafkaFunctions(testutils.WebHostTestCase):
         2. kafka_output_trigger picks up the message and stores it in blob
         3. Retrieve from blob via get_kafka_output_triggered and verify
         """
-        data = str(round(time.time()))
+        data = uuid.uuid4().hex
         doc = {'id': data}
 
         # Invoke kafka_output HttpTrigger to send message via output binding
@@ -90,14 +131,14 @@ class TestKafkaFunctions(testutils.WebHostTestCase):
                                 expected_status=200)
         self.assertEqual(r.text, 'OK')
 
-        # Wait for kafka_output_trigger to execute and store event into blob
+        # Wait for kafka_output_trigger to execute and push the event value
         logger.info("Waiting for Kafka output trigger to execute...")
-        r = self.webhost.wait_and_request('GET', 'get_kafka_output_triggered',
-                                         wait_time=15,
-                                         max_retries=10,
-                                         expected_status=200)
+        value = self.result_sink.wait_for(
+            'kafka_output_trigger',
+            match=lambda v: json.loads(v) == doc,
+            timeout=25)
 
-        response = r.json()
+        response = json.loads(value)
 
         # Check if the event body matches the initial data
         self.assertEqual(response, doc)
@@ -105,29 +146,27 @@ class TestKafkaFunctions(testutils.WebHostTestCase):
     @testutils.retryable_test(3, 5)
     def test_kafka_trigger_with_metadata(self):
         # Generate a unique event body for metadata test
-        random_number = str(round(time.time()) % 1000)
+        token = uuid.uuid4().hex
 
         # Produce a Kafka message directly via confluent-kafka client
         logger.info("Producing Kafka message with metadata...")
-        _produce_kafka_message('e2e-metadata-topic', random_number)
+        _produce_kafka_message(scoped_name('e2e-metadata-topic'),
+                               token)
 
-        # Wait for kafka_metadata_trigger to execute and store metadata
-        # in the global variable, then read it via get_kafka_metadata_triggered
+        # Wait for kafka_metadata_trigger to execute and push its metadata
         logger.info("Waiting for Kafka metadata trigger to execute...")
-        r = self.webhost.wait_and_request('GET',
-                                         'get_kafka_metadata_triggered',
-                                         wait_time=15,
-                                         max_retries=10,
-                                         expected_status=200)
+        event = self.result_sink.wait_for(
+            'kafka_metadata_trigger',
+            match=lambda e: e['body'] == token,
+            timeout=25)
 
-        # Parse and verify the response
-        event = r.json()
+        # Verify the pushed metadata
 
         self.assertIsInstance(event, dict,
                              f"Expected dict, got {type(event)}: {event}")
-        self.assertEqual(event['body'], random_number)
+        self.assertEqual(event['body'], token)
 
         # KafkaEvent property check
-        self.assertEqual(event['topic'], 'e2e-metadata-topic')
+        self.assertEqual(event['topic'], scoped_name('e2e-metadata-topic'))
         self.assertIsNotNone(event['partition'])
         self.assertIsNotNone(event['offset'])
@@ -15,9 +15,7 @@ Inspired by: https://github.com/Azure/azure-functions-mysql-extension/tree/main/
 """
 import json
 import logging
-import time
 from mysql.connector import Error
-from requests import JSONDecodeError
 from tests.utils import testutils
 from tests.emulator_tests.mysql_functions.mysql_test_utils import (
     PersonDAO,
@@ -97,17 +95,9 @@ class TestMySqlFunctions(testutils.WebHostTestCase):
 
         logger.info(f"Inserted person: ID={person[0]}, Name={person[1]}, Address={person[2]}")
 
-        max_retries = 3
-        for try_no in range(max_retries):
-            time.sleep(2)
-
-            try:
-                result = self.person_dao.get_person_by_id(row_id)
-                self.assertEqual(result[2], "Function Triggered")
-                break
-            except (AssertionError, JSONDecodeError):
-                if try_no == max_retries - 1:
-                    raise
+        testutils.wait_until(
+            lambda: self.person_dao.get_person_by_id(row_id)[2] == "Function Triggered",
+            timeout=6, description="MySQL trigger updated person row")
 
     def test_mysql_insert_connectivity(self):
         """Test MySQL connection and data insertion"""
@@ -278,25 +268,7 @@ class TestMySqlFunctions(testutils.WebHostTestCase):
         )
         self.assertEqual(r.status_code, 201)
 
-        max_retries = 10
-        tracked_changes = []
-
-        for attempt in range(max_retries):
-            time.sleep(2)
-
-            r = self.webhost.request(
-                "GET",
-                "gettrackedchanges?productId=50",
-                max_retries=2,
-                expected_status=200,
-            )
-
-            if r.status_code == 200:
-                tracked_changes = r.json()
-                if len(tracked_changes) > 0:
-                    break
-
-            logger.info(f"Waiting for trigger (attempt {attempt + 1}/{max_retries})...")
+        tracked_changes = testutils.wait_for_tracked_changes(self.webhost, 50)
 
         self.assertGreater(len(tracked_changes), 0, "No trigger changes recorded")
 
@@ -333,7 +305,7 @@ class TestMySqlFunctions(testutils.WebHostTestCase):
         )
         self.assertEqual(r.status_code, 201)
 
-        time.sleep(5)
+        testutils.wait_for_tracked_changes(self.webhost, product_id, "Insert", timeout=5)
 
         self.webhost.request(
             "POST", "cleartrackedchanges", max_retries=3, expected_status=200
@@ -349,30 +321,8 @@ class TestMySqlFunctions(testutils.WebHostTestCase):
         )
         self.assertEqual(r.status_code, 201)
 
-        max_retries = 10
-        tracked_changes = []
-
-        for attempt in range(max_retries):
-            time.sleep(2)
-
-            r = self.webhost.request(
-                "GET",
-                f"gettrackedchanges?productId={product_id}",
-                max_retries=2,
-                expected_status=200,
-            )
-
-            if r.status_code == 200:
-                tracked_changes = r.json()
-                # Upsert generates Insert operation
-                insert_changes = [c for c in tracked_changes
-                                  if c["Operation"] == "Insert"]
-                if len(insert_changes) > 0:
-                    break
-
-            logger.info(
-                f"Waiting for upsert trigger (attempt {attempt + 1}/{max_retries})..."
-            )
+        # Upsert generates Insert operation
+        tracked_changes = testutils.wait_for_tracked_changes(self.webhost, product_id, "Insert")
 
         # Upsert generates Insert operation, verify it was recorded
         insert_changes = [c for c in tracked_changes if c["Operation"] == "Insert"]
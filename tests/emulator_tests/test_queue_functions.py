@@ -1,7 +1,7 @@
 # Copyright (c) Microsoft Corporation. All rights reserved.
 # Licensed under the MIT License.
 import logging
-import time
+import uuid
 
 from tests.utils import testutils
 
@@ -10,89 +10,100 @@ logger = logging.getLogger(__name__)
 
 class TestQueueFunctions(testutils.WebHostTestCase):
 
+    run_scoped_queues = ('testqueue', 'testqueue-message-return',
+                         'testqueue-return', 'testqueue-return-multiple',
+                         'testqueue-return-multiple-outparam',
+                         'testqueue-untyped-return')
+
     @classmethod
     def get_script_dir(cls):
         return testutils.EMULATOR_TESTS_FOLDER / 'queue_functions'
 
     def test_queue_basic(self):
+        data = f'test-message-{uuid.uuid4().hex}'
+
         # Send message to queue
         logger.info("Sending message to queue...")
         r = self.webhost.request('POST', 'put_queue',
-                                data='test-message',
+                                data=data,
                                 max_retries=3,
                                 expected_status=200)
         self.assertEqual(r.text, 'OK')
 
-        # Wait for queue_trigger to process the queue item
+        # Wait for queue_trigger to push the processed queue item
         logger.info("Waiting for queue trigger to process message...")
-        r = self.webhost.wait_and_request('GET', 'get_queue_blob',
-                                         wait_time=2,
-                                         max_retries=10,
-                                         expected_status=200)
-        
-        msg_info = r.json()
+        msg = self.result_sink.wait_for(
+            'queue_trigger',
+            match=lambda m: m['body'] == data,
+            timeout=20)
 
-        self.assertIn('queue', msg_info)
-        msg = msg_info['queue']
-
-        self.assertEqual(msg['body'], 'test-message')
+        self.assertEqual(msg['body'], data)
         for attr in {'id', 'expiration_time', 'insertion_time',
                      'time_next_visible', 'pop_receipt', 'dequeue_count'}:
             self.assertIsNotNone(msg.get(attr))
 
     def test_queue_return(self):
+        data = f'test-message-return-{uuid.uuid4().hex}'
+
         # Send message with return value test
         logger.info("Testing queue return value...")
-        r = self.webhost.request('POST', 'put_queue_return',
-                                data='test-message-return',
-                                max_retries=3,
-                                expected_status=200)
+        self.webhost.request('POST', 'put_queue_return',
+                             data=data,
+                             max_retries=3,
+                             expected_status=200)
 
         # Wait for queue_trigger to process the queue item
-        r = self.webhost.wait_and_request('GET', 'get_queue_blob_return',
-                                         wait_time=2,
-                                         max_retries=10,
-                                         expected_status=200)
-        self.assertEqual(r.text, 'test-message-return')
+        body = self.result_sink.wait_for(
+            'queue_trigger_return',
+            match=lambda b: b == data,
+            timeout=20)
+        self.assertEqual(body, data)
 
     def test_queue_message_object_return(self):
+        data = f'test-message-object-return-{uuid.uuid4().hex}'
+
         # Send message object return test
         logger.info("Testing queue message object return...")
-        r = self.webhost.request('POST', 'put_queue_message_return',
-                                data='test-message-object-return',
-                                max_retries=3,
-                                expected_status=200)
+        self.webhost.request('POST', 'put_queue_message_return',
+                             data=data,
+                             max_retries=3,
+                             expected_status=200)
 
         # Wait for queue_trigger to process the queue item
-        r = self.webhost.wait_and_request('GET', 'get_queue_blob_message_return',
-                                         wait_time=2,
-                                         max_retries=10,
-                                         expected_status=200)
-        self.assertEqual(r.text, 'test-message-object-return')
+        body = self.result_sink.wait_for(
+            'queue_trigger_message_return',
+            match=lambda b: b == data,
+            timeout=20)
+        self.assertEqual(body, data)
 
     def test_queue_untyped_return(self):
-        r = self.webhost.request('POST','put_queue_untyped_return',
-            data='test-untyped-return',
+        data = f'test-untyped-return-{uuid.uuid4().hex}'
+        self.webhost.request('POST','put_queue_untyped_return',
+            data=data,
             max_retries=10,
             expected_status=200
         )
 
-        r = self.webhost.wait_and_request('GET', 'get_queue_untyped_blob_return',
-                                         wait_time=2,
-                                         max_retries=10,
-                                         expected_status=200)
-        self.assertEqual(r.status_code, 200)
-        self.assertEqual(r.text, 'test-untyped-return')
+        body = self.result_sink.wait_for(
+            'queue_trigger_untyped',
+            match=lambda b: b == data,
+            timeout=20)
+        self.assertEqual(body, data)
 
     def test_queue_return_multiple(self):
+        data = uuid.uuid4().hex
         r = self.webhost.request('POST', 'put_queue_return_multiple',
-                                 data='foo')
+                                 data=data)
         self.assertTrue(200 <= r.status_code < 300,
                         f"Returned status code {r.status_code}, "
                         "not in the 200-300 range.")
 
-        # wait for queue_trigger to process the queue item
-        time.sleep(1)
+        # wait for queue_trigger to process both queue items
+        for expected in (f'{data}-one', f'{data}-two'):
+            self.result_sink.wait_for(
+                'queue_trigger_return_multiple',
+                match=lambda b, expected=expected: b == expected,
+                timeout=20)
 
     def test_queue_return_multiple_outparam(self):
         r = self.webhost.request('POST', 'put_queue_multiple_out',
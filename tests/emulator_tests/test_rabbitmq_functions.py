@@ -8,6 +8,7 @@ import time
 import pika
 
 from tests.utils import testutils
+from tests.utils.run_namespace import keep_run_resources, scoped_name
 
 logger = logging.getLogger(__name__)
 
@@ -73,9 +74,9 @@ class TestRabbitMQFunctions(testutils.WebHostTestCase):
     binding and verify round-trip delivery through a RabbitMQ trigger.
     """
 
-    # Queue names used by the E2E test functions
-    TRIGGER_QUEUE = 'e2e-test-queue'
-    OUTPUT_QUEUE = 'e2e-output-queue'
+    # Queue names used by the E2E test functions ("<name>-%RUN_ID%")
+    TRIGGER_QUEUE = scoped_name('e2e-test-queue')
+    OUTPUT_QUEUE = scoped_name('e2e-output-queue')
 
     @classmethod
     def get_script_dir(cls):
@@ -97,8 +98,13 @@ class TestRabbitMQFunctions(testutils.WebHostTestCase):
         super().setUpClass()
 
     @classmethod
-    def _ensure_rabbitmq_queues(cls):
-        """Declare RabbitMQ queues so the extension can bind to them."""
+    def tearDownClass(cls):
+        super().tearDownClass()
+        if not keep_run_resources():
+            cls._delete_rabbitmq_queues()
+
+    @classmethod
+    def _connect(cls):
         host = os.environ.get('RabbitMQHost', 'localhost')
         port = int(os.environ.get('RabbitMQPort', '5672'))
         credentials = pika.PlainCredentials('guest', 'guest')
@@ -109,7 +115,12 @@ class TestRabbitMQFunctions(testutils.WebHostTestCase):
             connection_attempts=5,
             retry_delay=3
         )
-        connection = pika.BlockingConnection(parameters)
+        return pika.BlockingConnection(parameters)
+
+    @classmethod
+    def _ensure_rabbitmq_queues(cls):
+        """Declare RabbitMQ queues so the extension can bind to them."""
+        connection = cls._connect()
         channel = connection.channel()
         channel.queue_declare(queue=cls.TRIGGER_QUEUE, durable=False)
         channel.queue_declare(queue=cls.OUTPUT_QUEUE, durable=False)
@@ -117,6 +128,18 @@ class TestRabbitMQFunctions(testutils.WebHostTestCase):
         logger.info("Pre-created RabbitMQ queues: %s, %s",
                     cls.TRIGGER_QUEUE, cls.OUTPUT_QUEUE)
 
+    @classmethod
+    def _delete_rabbitmq_queues(cls):
+        """Delete this run's queues once the host no longer uses them."""
+        try:
+            connection = cls._connect()
+            channel = connection.channel()
+            channel.queue_delete(queue=cls.TRIGGER_QUEUE)
+            channel.queue_delete(queue=cls.OUTPUT_QUEUE)
+            connection.close()
+        except Exception as e:
+            logger.warning("RabbitMQ queues not deleted: %s", e)
+
     @testutils.retryable_test(3, 5)
     def test_rabbitmq_trigger(self):
         """Test RabbitMQ trigger via pika → trigger → blob → HTTP.
@@ -131,14 +154,19 @@ class TestRabbitMQFunctions(testutils.WebHostTestCase):
 
         # Produce a RabbitMQ message directly via pika client
         logger.info("Producing RabbitMQ message...")
-        _produce_rabbitmq_message('e2e-test-queue', json.dumps(doc))
+        mark = self.webhost.logs.mark()
+        _produce_rabbitmq_message(self.TRIGGER_QUEUE, json.dumps(doc))
 
-        # Wait for rabbitmq_trigger to execute and store message into blob
+        # Wait for the host to report that rabbitmq_trigger ran, then
+        # read the message it stored into blob
         logger.info("Waiting for RabbitMQ trigger to execute...")
+        self.webhost.wait_for_invocation('rabbitmq_trigger',
+                                         since=mark, timeout=25)
         r = self.webhost.wait_and_request('GET', 'get_rabbitmq_triggered',
-                                          wait_time=15,
-                                          max_retries=10,
-                                          expected_status=200)
+                                          wait_time=0,
+                                          max_retries=5,
+                                          expected_status=200,
+                                          until=lambda r: r.json() == doc)
 
         response = r.json()
 
@@ -158,18 +186,23 @@ class TestRabbitMQFunctions(testutils.WebHostTestCase):
 
         # Invoke rabbitmq_output HttpTrigger to send message via output binding
         logger.info("Sending RabbitMQ message via output binding...")
+        mark = self.webhost.logs.mark()
         r = self.webhost.request('POST', 'rabbitmq_output',
                                  data=json.dumps(doc),
                                  max_retries=3,
                                  expected_status=200)
         self.assertEqual(r.text, 'OK')
 
-        # Wait for rabbitmq_output_trigger to execute and store message into blob
+        # Wait for the host to report that rabbitmq_output_trigger ran,
+        # then read the message it stored into blob
         logger.info("Waiting for RabbitMQ output trigger to execute...")
+        self.webhost.wait_for_invocation('rabbitmq_output_trigger',
+                                         since=mark, timeout=25)
         r = self.webhost.wait_and_request('GET', 'get_rabbitmq_output_triggered',
-                                          wait_time=15,
-                                          max_retries=10,
-                                          expected_status=200)
+                                          wait_time=0,
+                                          max_retries=5,
+                                          expected_status=200,
+                                          until=lambda r: r.json() == doc)
 
         response = r.json()
 
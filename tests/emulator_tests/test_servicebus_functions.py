@@ -2,7 +2,7 @@
 # Licensed under the MIT License.
 import json
 import logging
-import time
+import uuid
 
 from tests.utils import testutils
 
@@ -17,7 +17,7 @@ class TestServiceBusFunctions(testutils.WebHostTestCase):
 
     @testutils.retryable_test(3, 5)
     def test_servicebus_basic(self):
-        data = str(round(time.time()))
+        data = uuid.uuid4().hex
         
         # Send message to Service Bus queue
         logger.info("Sending message to Service Bus queue...")
@@ -27,14 +27,13 @@ class TestServiceBusFunctions(testutils.WebHostTestCase):
                                 expected_status=200)
         self.assertEqual(r.text, 'OK')
 
-        # Wait for Service Bus trigger to process the message with extended retry
+        # Wait for Service Bus trigger to process the message and push it
         logger.info("Waiting for Service Bus trigger to process message...")
-        r = self.webhost.wait_and_request('GET', 'get_servicebus_triggered',
-                                         wait_time=3,
-                                         max_retries=10,  # Service Bus may need more retries
-                                         expected_status=200)
-        
-        msg = r.json()
+        msg = self.result_sink.wait_for(
+            'servicebus_trigger',
+            match=lambda m: m['body'] == data,
+            timeout=15)  # Service Bus may need more time
+
         self.assertEqual(msg['body'], data)
         
         # Verify all expected Service Bus message attributes are present
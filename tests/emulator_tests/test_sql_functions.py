@@ -15,7 +15,6 @@ Inspired by: https://github.com/Azure/azure-functions-sql-extension/tree/main/te
 """
 import json
 import logging
-import time
 
 from pyodbc import Error
 from tests.utils import testutils
@@ -283,25 +282,7 @@ class TestSqlFunctions(testutils.WebHostTestCase):
         self.assertEqual(r.status_code, 201)
 
         # Wait for trigger to process (SQL triggers have some delay)
-        max_retries = 10
-        tracked_changes = []
-
-        for attempt in range(max_retries):
-            time.sleep(2)
-
-            r = self.webhost.request(
-                "GET",
-                "gettrackedchanges?productId=50",
-                max_retries=2,
-                expected_status=200,
-            )
-
-            if r.status_code == 200:
-                tracked_changes = r.json()
-                if len(tracked_changes) > 0:
-                    break
-
-            logger.info(f"Waiting for trigger (attempt {attempt + 1}/{max_retries})...")
+        tracked_changes = testutils.wait_for_tracked_changes(self.webhost, 50)
 
         # Verify trigger was invoked and recorded the Insert operation
         self.assertGreater(len(tracked_changes), 0, "No trigger changes recorded")
@@ -343,7 +324,7 @@ class TestSqlFunctions(testutils.WebHostTestCase):
         self.assertEqual(r.status_code, 201)
 
         # Wait for insert trigger to complete
-        time.sleep(5)
+        testutils.wait_for_tracked_changes(self.webhost, product_id, "Insert", timeout=5)
 
         # Clear tracked changes to isolate update
         self.webhost.request(
@@ -362,30 +343,7 @@ class TestSqlFunctions(testutils.WebHostTestCase):
         self.assertEqual(r.status_code, 201)
 
         # Wait for update trigger
-        max_retries = 10
-        tracked_changes = []
-
-        for attempt in range(max_retries):
-            time.sleep(2)
-
-            r = self.webhost.request(
-                "GET",
-                f"gettrackedchanges?productId={product_id}",
-                max_retries=2,
-                expected_status=200,
-            )
-
-            if r.status_code == 200:
-                tracked_changes = r.json()
-                update_changes = [
-                    c for c in tracked_changes if c["Operation"] == "Update"
-                ]
-                if len(update_changes) > 0:
-                    break
-
-            logger.info(
-                f"Waiting for update trigger (attempt {attempt + 1}/{max_retries})..."
-            )
+        tracked_changes = testutils.wait_for_tracked_changes(self.webhost, product_id, "Update")
 
         # Verify update trigger was invoked
         update_changes = [c for c in tracked_changes if c["Operation"] == "Update"]
@@ -412,7 +370,7 @@ class TestSqlFunctions(testutils.WebHostTestCase):
         self.product_dao.insert_product(product_id, "Product To Delete", 150)
 
         # Wait for insert trigger to complete
-        time.sleep(5)
+        testutils.wait_for_tracked_changes(self.webhost, product_id, "Insert", timeout=5)
 
         # Clear tracked changes to isolate delete
         self.webhost.request(
@@ -423,30 +381,7 @@ class TestSqlFunctions(testutils.WebHostTestCase):
         self.product_dao.delete_product(product_id)
 
         # Wait for delete trigger
-        max_retries = 10
-        tracked_changes = []
-
-        for attempt in range(max_retries):
-            time.sleep(2)
-
-            r = self.webhost.request(
-                "GET",
-                f"gettrackedchanges?productId={product_id}",
-                max_retries=2,
-                expected_status=200,
-            )
-
-            if r.status_code == 200:
-                tracked_changes = r.json()
-                delete_changes = [
-                    c for c in tracked_changes if c["Operation"] == "Delete"
-                ]
-                if len(delete_changes) > 0:
-                    break
-
-            logger.info(
-                f"Waiting for delete trigger (attempt {attempt + 1}/{max_retries})..."
-            )
+        tracked_changes = testutils.wait_for_tracked_changes(self.webhost, product_id, "Delete")
 
         # Verify delete trigger was invoked
         delete_changes = [c for c in tracked_changes if c["Operation"] == "Delete"]
@@ -0,0 +1,139 @@
+# Copyright (c) Microsoft Corporation. All rights reserved.
+# Licensed under the MIT License.
+"""Unit tests for the A/B bundle performance gate and its statistics."""
+
+import contextlib
+import csv
+import io
+import json
+import pathlib
+import tempfile
+import unittest
+from unittest import mock
+
+from tests.benchmarks import ab_gate
+from tests.benchmarks.ab_gate import (
+    compare,
+    parse_benchmark,
+    previous_version,
+    run_ab,
+    write_results,
+)
+from tests.benchmarks.stats import cliffs_delta, mann_whitney_u
+
+BASELINE = [10.0, 11.0, 10.5, 9.8, 10.2, 10.9]
+SLOWER = [12.1, 12.6, 11.9, 12.4, 13.0, 12.2]
+
+
+class TestMannWhitney(unittest.TestCase):
+
+    def test_exact(self):
+        # Complete separation of 5 and 5 values: 2 of the C(10, 5) orderings
+        self.assertEqual(mann_whitney_u([1, 2, 3, 4, 5], [6, 7, 8, 9, 10]), (0.0, 2 / 252))
+        u, p = mann_whitney_u([1.1, 2.4, 3.3, 4.2, 5.6, 7.1], [2.2, 3.9, 6.0, 6.5, 8.1, 9.3])
+        self.assertEqual(u, 10.0)
+        self.assertAlmostEqual(p, 0.2403, places=4)
+
+    def test_ties_use_normal_approximation(self):
+        u, p = mann_whitney_u([1, 2, 2, 3, 5, 5], [2, 4, 5, 6, 6, 7])
+        self.assertEqual(u, 7.0)
+        self.assertAlmostEqual(p, 0.0876, places=4)
+        self.assertEqual(mann_whitney_u([3, 3], [3, 3, 3]), (3.0, 1.0))
+        self.assertEqual(mann_whitney_u([], [1.0]), (0.0, 1.0))
+
+    def test_cliffs_delta(self):
+        self.assertEqual(cliffs_delta(SLOWER, BASELINE), 1.0)
+        self.assertEqual(cliffs_delta(BASELINE, SLOWER), -1.0)
+        self.assertEqual(cliffs_delta([1, 2], [2, 1]), 0.0)
+
+
+class TestAbGate(unittest.TestCase):
+
+    def _samples(self, baseline, candidate, throughput=(100.0, 100.0)):
+        samples = []
+        for run, (old, new) in enumerate(zip(baseline, candidate)):
+            for version, latency, rate in (('4.24.0', old, throughput[0]),
+                                           ('4.25.0', new, throughput[1])):
+                samples.append({'benchmark': 'http_functions', 'bundle_version': version,
+                                'run': run, 'metrics': {'ping.p50_ms': latency,
+                                                        'throughput_per_s': rate + run}})
+        return samples
+
+    def test_regression(self):
+        rows = {r['metric']: r for r in compare(self._samples(BASELINE, SLOWER),
+                                                 '4.24.0', '4.25.0')}
+        latency = rows['ping.p50_ms']
+        self.assertTrue(latency['regressed'])
+        self.assertAlmostEqual(latency['change'], 0.1884, places=4)
+        self.assertLess(latency['p'], 0.01)
+        self.assertEqual(latency['cliffs_delta'], 1.0)
+        self.assertFalse(rows['throughput_per_s']['regressed'])
+
+    def test_needs_threshold_and_significance(self):
+        # Consistently but only slightly slower: significant, under the threshold
+        steady = [10.0, 10.1, 10.2, 10.3, 10.4, 10.5]
+        row = compare(self._samples(steady, [v + 0.6 for v in steady]), '4.24.0', '4.25.0')[0]
+        self.assertLess(row['p'], 0.05)
+        self.assertFalse(row['regressed'])
+        # A large median shift in too few runs to tell from noise
+        row = compare(self._samples(BASELINE[:2], SLOWER[:2]), '4.24.0', '4.25.0')[0]
+        self.assertGreater(row['change'], 0.1)
+        self.assertFalse(row['regressed'])
+
+    def test_lower_throughput_regresses(self):
+        rows = {r['metric']: r for r in compare(
+            self._samples(BASELINE, BASELINE, throughput=(100.0, 70.0)), '4.24.0', '4.25.0')}
+        self.assertTrue(rows['throughput_per_s']['regressed'])
+        self.assertFalse(rows['ping.p50_ms']['regressed'])
+
+    def test_run_ab_alternates_order(self):
+        calls = []
+
+        def run(app_dir, settings, workload, log_profile, bundle_version=None):
+            calls.append(bundle_version)
+            return {'metrics': {'throughput_per_s': 50.0},
+                    'functions': {'ping': {'p50_ms': 2.0, 'p95_ms': 4.0}},
+                    'bundle_version': f'[{bundle_version}]'}
+
+        benchmark = parse_benchmark('tests/benchmarks/http_functions='
+                                    'tests.benchmarks.workloads:http_ping')
+        samples = run_ab([benchmark], '4.24.0', '4.25.0', repeat=2, run=run)
+        self.assertEqual(calls, ['4.24.0', '4.25.0', '4.25.0', '4.24.0'])
+        self.assertEqual(samples[0]['metrics'], {'throughput_per_s': 50.0,
+                                                 'ping.p50_ms': 2.0, 'ping.p95_ms': 4.0})
+
+        with tempfile.TemporaryDirectory() as tmp:
+            rows = compare(samples, '4.24.0', '4.25.0')
+            json_path, csv_path = write_results(samples, rows, pathlib.Path(tmp))
+            self.assertEqual(len(json.loads(json_path.read_text())['samples']), 4)
+            with open(csv_path, newline='') as f:
+                self.assertEqual(len(list(csv.DictReader(f))), 3)
+
+    def test_run_ab_fails_on_unpinned_bundle(self):
+        def run(app_dir, settings, workload, log_profile, bundle_version=None):
+            return {'metrics': {}, 'functions': {}, 'bundle_version': '[4.*, 5.0.0)'}
+
+        benchmark = parse_benchmark('tests/benchmarks/http_functions='
+                                    'tests.benchmarks.workloads:http_ping')
+        with self.assertRaisesRegex(RuntimeError, r'instead of the pinned \[4.24.0\]'):
+            run_ab([benchmark], '4.24.0', '4.25.0', repeat=1, run=run)
+
+    def test_parse_and_previous_version(self):
+        with self.assertRaises(ValueError):
+            parse_benchmark('tests/benchmarks/http_functions')
+        self.assertEqual(previous_version(['4.9.0', '4.10.0', '4.11.0'], '4.11.0'), '4.10.0')
+        self.assertIsNone(previous_version(['4.11.0'], '4.11.0'))
+
+    def test_print_baseline(self):
+        out = io.StringIO()
+        with mock.patch.object(ab_gate, 'available_bundle_versions',
+                               return_value=['4.9.0', '4.10.0', '4.11.0']), \
+                mock.patch.object(ab_gate, 'run_ab') as run, \
+                contextlib.redirect_stdout(out):
+            self.assertEqual(ab_gate.main(['--candidate', '4.11.0', '--print-baseline']), 0)
+        self.assertEqual(out.getvalue(), '4.10.0\n')
+        run.assert_not_called()
+
+
+if __name__ == '__main__':
+    unittest.main()
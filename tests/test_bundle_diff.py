@@ -0,0 +1,138 @@
+# Copyright (c) Microsoft Corporation. All rights reserved.
+# Licensed under the MIT License.
+"""Unit tests for the bundle-to-bundle diff."""
+
+import json
+import pathlib
+import tempfile
+import unittest
+import zipfile
+import zlib
+
+from tests.tools.bundle_diff import diff_bundles, group_by_owner, hash_members, main, summarize
+from tests.tools.bundle_footprint import BUNDLE_FILES, UNATTRIBUTED
+from tests.tools.bundle_manifest import BundleMetadata
+
+KAFKA_ID = 'Microsoft.Azure.WebJobs.Extensions.Kafka'
+BLOBS_ID = 'Microsoft.Azure.WebJobs.Extensions.Storage.Blobs'
+METADATA = BundleMetadata([{'id': KAFKA_ID, 'name': 'Kafka', 'bindings': ['kafka']},
+                           {'id': BLOBS_ID, 'name': 'AzureStorageBlobs', 'bindings': ['blob']}])
+
+
+def _with_crc(data, crc):
+    """Return ``data`` with its last four bytes changed so its CRC-32 is ``crc``.
+
+    CRC-32 is affine in the message bits, so the bit flips that reach
+    ``crc`` are found by Gaussian elimination over GF(2).
+    """
+    base = zlib.crc32(data)
+    rows = []
+    for bit in range(32):
+        flipped = bytearray(data)
+        flipped[len(data) - 4 + bit // 8] ^= 1 << (bit % 8)
+        rows.append([zlib.crc32(bytes(flipped)) ^ base, 1 << bit])
+    for pivot in range(32):
+        k = next(k for k in range(pivot, 32) if rows[k][0] >> pivot & 1)
+        rows[pivot], rows[k] = rows[k], rows[pivot]
+        for j in range(32):
+            if j != pivot and rows[j][0] >> pivot & 1:
+                rows[j] = [rows[j][0] ^ rows[pivot][0], rows[j][1] ^ rows[pivot][1]]
+    # rows[bit] now changes exactly that CRC bit
+    flips = 0
+    for bit in range(32):
+        if (crc ^ base) >> bit & 1:
+            flips ^= rows[bit][1]
+    result = bytearray(data)
+    for bit in range(32):
+        if flips >> bit & 1:
+            result[len(data) - 4 + bit // 8] ^= 1 << (bit % 8)
+    return bytes(result)
+
+
+def _write_zip(path, files):
+    with zipfile.ZipFile(path, 'w', zipfile.ZIP_DEFLATED) as zf:
+        for name, data in files.items():
+            zf.writestr(name, data)
+    return path
+
+
+class TestBundleDiff(unittest.TestCase):
+
+    def setUp(self):
+        tmp = tempfile.TemporaryDirectory()
+        self.addCleanup(tmp.cleanup)
+        self.dir = pathlib.Path(tmp.name)
+        self.blobs = b'blobs v1' * 64
+        self.collision = _with_crc(b'blobs v2' * 64, zlib.crc32(self.blobs))
+        self.old = _write_zip(self.dir / 'old.zip', {
+            f'bin/{KAFKA_ID}.dll': b'kafka v1' * 64,
+            f'bin/{BLOBS_ID}.dll': self.blobs,
+            'bin/Azure.Core.dll': b'core' * 64,
+            'bin/Old.Dependency.dll': b'old',
+            'bin/readme.txt': b'same text',
+            'bundle.json': b'{"version": "1"}',
+        })
+        self.new = _write_zip(self.dir / 'new.zip', {
+            f'bin/{KAFKA_ID}.dll': b'kafka v2' * 65,
+            f'bin/{BLOBS_ID}.dll': self.collision,
+            'bin/lib/Azure.Core.dll': b'core' * 64,
+            'bin/New.Dependency.dll': b'new',
+            'bin/readme.txt': b'same text',
+            'bundle.json': b'{"version": "2"}',
+        })
+
+    def test_crc_forgery(self):
+        self.assertEqual(zlib.crc32(self.collision), zlib.crc32(self.blobs))
+        self.assertNotEqual(self.collision, self.blobs)
+
+    def test_diff(self):
+        changes = {c.path: c for c in diff_bundles(self.old, self.new, METADATA,
+                                                   verify='assemblies')}
+        self.assertEqual(set(changes), {
+            f'bin/{KAFKA_ID}.dll', f'bin/{BLOBS_ID}.dll', 'bin/lib/Azure.Core.dll',
+            'bin/Old.Dependency.dll', 'bin/New.Dependency.dll', 'bundle.json'})
+        self.assertEqual(changes[f'bin/{KAFKA_ID}.dll'].detail, 'size')
+        self.assertEqual(changes[f'bin/{KAFKA_ID}.dll'].owner, KAFKA_ID)
+        self.assertEqual(changes['bundle.json'].detail, 'crc')
+        self.assertEqual(changes['bundle.json'].owner, BUNDLE_FILES)
+        # Same CRC-32 and size: only the content hash tells them apart
+        self.assertEqual(changes[f'bin/{BLOBS_ID}.dll'].detail, 'sha256')
+        self.assertEqual(changes['bin/lib/Azure.Core.dll'].change, 'moved')
+        self.assertEqual(changes['bin/lib/Azure.Core.dll'].detail, 'bin/Azure.Core.dll')
+        self.assertEqual(changes['bin/Old.Dependency.dll'].change, 'removed')
+        self.assertEqual(changes['bin/New.Dependency.dll'].change, 'added')
+        self.assertEqual(summarize(changes.values()),
+                         {'added': 1, 'removed': 1, 'changed': 3, 'moved': 1})
+
+    def test_default_trusts_crc(self):
+        paths = [c.path for c in diff_bundles(self.old, self.new, METADATA)]
+        self.assertNotIn(f'bin/{BLOBS_ID}.dll', paths)
+
+    def test_unknown_verify_mode(self):
+        with self.assertRaises(ValueError):
+            diff_bundles(self.old, self.new, METADATA, verify='some')
+
+    def test_hash_members(self):
+        digests = hash_members([(self.old, 'bin/readme.txt'), (self.new, 'bin/readme.txt'),
+                                (self.old, 'bundle.json')], workers=3)
+        self.assertEqual(digests[(self.old, 'bin/readme.txt')],
+                         digests[(self.new, 'bin/readme.txt')])
+        self.assertNotEqual(digests[(self.old, 'bin/readme.txt')],
+                            digests[(self.old, 'bundle.json')])
+
+    def test_group_by_owner(self):
+        groups = group_by_owner(diff_bundles(self.old, self.new, METADATA), METADATA)
+        by_owner = {g['owner']: g for g in groups}
+        self.assertEqual(groups[0]['owner'], UNATTRIBUTED)
+        self.assertEqual(by_owner[KAFKA_ID]['name'], 'Kafka')
+        self.assertEqual(by_owner[KAFKA_ID]['delta'], 8)
+        self.assertEqual(len(by_owner[UNATTRIBUTED]['moved']), 1)
+
+    def test_main(self):
+        output = self.dir / 'diff.json'
+        self.assertEqual(main([str(self.old), str(self.new), '--output', str(output)]), 0)
+        self.assertEqual(json.loads(output.read_text())['summary']['moved'], 1)
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,163 @@
+# Copyright (c) Microsoft Corporation. All rights reserved.
+# Licensed under the MIT License.
+"""Unit tests for the bundle zip footprint analyzer."""
+
+import csv
+import json
+import pathlib
+import tempfile
+import unittest
+import zipfile
+
+from tests.tools.bundle_footprint import (
+    BUNDLE_FILES,
+    SHARED,
+    UNATTRIBUTED,
+    analyze,
+    main,
+    parse_bundle_name,
+    runtime_platform,
+    write_report,
+)
+from tests.tools.bundle_manifest import BundleMetadata
+
+KAFKA_ID = 'Microsoft.Azure.WebJobs.Extensions.Kafka'
+BLOBS_ID = 'Microsoft.Azure.WebJobs.Extensions.Storage.Blobs'
+METADATA = BundleMetadata(
+    [{'id': KAFKA_ID, 'name': 'Kafka', 'bindings': ['kafka']},
+     {'id': BLOBS_ID, 'name': 'AzureStorageBlobs', 'bindings': ['blob']}],
+    {'bundleId': 'Microsoft.Azure.Functions.ExtensionBundle', 'bundleVersion': '4.99.0'})
+
+DEPS = {'targets': {'.NETCoreApp,Version=v6.0': {
+    'extensions/1.0.0': {'dependencies': {KAFKA_ID: '4.3.2', BLOBS_ID: '5.3.7'}},
+    f'{KAFKA_ID}/4.3.2': {
+        'dependencies': {'Confluent.Kafka': '2.4.0', 'Azure.Core': '1.40.0'},
+        'runtime': {f'lib/netstandard2.0/{KAFKA_ID}.dll': {}}},
+    'Confluent.Kafka/2.4.0': {
+        'runtime': {'lib/net6.0/Confluent.Kafka.dll': {}},
+        'runtimeTargets': {
+            'runtimes/linux-x64/native/librdkafka.so': {'rid': 'linux-x64'},
+            'runtimes/win-x64/native/librdkafka.dll': {'rid': 'win-x64'},
+            'runtimes/osx-arm64/native/librdkafka.dylib': {'rid': 'osx-arm64'}}},
+    f'{BLOBS_ID}/5.3.7': {
+        'dependencies': {'Azure.Core': '1.40.0'},
+        'runtime': {f'lib/netstandard2.0/{BLOBS_ID}.dll': {}}},
+    'Azure.Core/1.40.0': {'runtime': {'lib/net6.0/Azure.Core.dll': {}}},
+}}}
+
+
+def _bin(prefix, rids=('linux-x64', 'win-x64', 'osx-arm64')):
+    files = {
+        f'{prefix}/{KAFKA_ID}.dll': b'k' * 300,
+        f'{prefix}/Confluent.Kafka.dll': b'c' * 400,
+        f'{prefix}/{BLOBS_ID}.dll': b'b' * 200,
+        f'{prefix}/Azure.Core.dll': b'a' * 500,
+        f'{prefix}/Host.Shim.dll': b'h' * 50,
+        f'{prefix}/extensions.deps.json': json.dumps(DEPS).encode(),
+    }
+    native = {'linux-x64': 'librdkafka.so', 'win-x64': 'librdkafka.dll',
+              'osx-arm64': 'librdkafka.dylib'}
+    for rid in rids:
+        files[f'{prefix}/runtimes/{rid}/native/{native[rid]}'] = rid.encode() * 100
+    return files
+
+
+def _write_zip(path, files):
+    with zipfile.ZipFile(path, 'w', zipfile.ZIP_STORED) as zf:
+        for name, data in files.items():
+            zf.writestr(name, data)
+    return path
+
+
+class TestBundleFootprint(unittest.TestCase):
+
+    def setUp(self):
+        tmp = tempfile.TemporaryDirectory()
+        self.addCleanup(tmp.cleanup)
+        self.dir = pathlib.Path(tmp.name)
+        prefix = 'Microsoft.Azure.Functions.ExtensionBundle.4.99.0'
+        self.portable = _write_zip(self.dir / f'{prefix}_any-any.zip',
+                                   {**_bin('bin'), 'bundle.json': b'{}'})
+        self.windows = _write_zip(self.dir / f'{prefix}_win-any.zip', {
+            **_bin('bin', rids=('win-x64',)),
+            **_bin('bin_v3/win-x64', rids=('win-x64', 'linux-x64')),
+            'bundle.json': b'{}'})
+
+    def test_parse_bundle_name(self):
+        self.assertEqual(parse_bundle_name(self.windows), ('4.99.0', 'win-any'))
+        self.assertEqual(
+            parse_bundle_name('Microsoft.Azure.Functions.ExtensionBundle.4.99.0.zip'),
+            ('4.99.0', 'base'))
+        self.assertIsNone(parse_bundle_name('cdnProd_windows.zip'))
+
+    def test_runtime_platform(self):
+        self.assertEqual(runtime_platform('bin/runtimes/win-x64/native/a.dll'), 'windows')
+        self.assertEqual(runtime_platform('bin/runtimes/osx/lib/net6.0/a.dll'), 'other')
+        self.assertIsNone(runtime_platform('bin/runtimes.dll'))
+
+    def test_attribution(self):
+        bundle = analyze([self.portable], METADATA)['bundles'][0]
+        owners = {e['owner']: e for e in bundle['extensions']}
+        # Kafka: its assembly, Confluent.Kafka and three native libraries
+        self.assertEqual(owners[KAFKA_ID]['files'], 5)
+        self.assertEqual(owners[KAFKA_ID]['name'], 'Kafka')
+        self.assertEqual(owners[BLOBS_ID]['uncompressed'], 200)
+        self.assertEqual(owners[SHARED]['uncompressed'], 500)
+        self.assertEqual(owners[UNATTRIBUTED]['files'], 2)  # Host.Shim.dll, deps.json
+        self.assertEqual(owners[BUNDLE_FILES]['files'], 1)
+        self.assertEqual(sum(e['compressed'] for e in bundle['extensions']),
+                         bundle['compressed'])
+        self.assertTrue(bundle['depsJson'])
+
+    def test_attribution_without_deps_json(self):
+        files = {k: v for k, v in _bin('bin').items() if not k.endswith('.deps.json')}
+        path = _write_zip(self.dir / 'Microsoft.Azure.Functions.ExtensionBundle.4.99.0.zip',
+                          files)
+        bundle = analyze([path], METADATA)['bundles'][0]
+        owners = {e['owner']: e['files'] for e in bundle['extensions']}
+        self.assertEqual(owners, {KAFKA_ID: 1, BLOBS_ID: 1, UNATTRIBUTED: 6})
+        self.assertFalse(bundle['depsJson'])
+
+    def test_duplicates_and_split(self):
+        report = analyze([self.portable, self.windows], METADATA)
+        portable, windows = report['bundles']
+        self.assertEqual(portable['duplicates'], [])
+
+        duplicates = {d['name']: d for d in windows['duplicates']}
+        # Every assembly of bin/ is repeated in bin_v3/win-x64, with the same hash
+        self.assertEqual(set(duplicates), {
+            f'{KAFKA_ID}.dll', 'Confluent.Kafka.dll', f'{BLOBS_ID}.dll',
+            'Azure.Core.dll', 'Host.Shim.dll', 'librdkafka.dll'})
+        self.assertEqual(duplicates['Azure.Core.dll']['owners'], [SHARED])
+        self.assertEqual(duplicates['Azure.Core.dll']['savedUncompressed'], 500)
+        self.assertEqual(windows['dedupSavings']['uncompressed'], 300 + 400 + 200 + 500 + 50
+                         + len('win-x64') * 100)
+
+        self.assertEqual(set(portable['foreignRuntimes']), {'windows', 'linux'})
+        self.assertEqual(portable['foreignRuntimes']['windows']['files'], 2)
+        self.assertEqual(windows['foreignRuntimes'],
+                         {'windows': {'files': 1, 'compressed': 900, 'uncompressed': 900}})
+
+        [split] = report['split']
+        self.assertEqual(split['flavor'], 'win-any')
+        self.assertEqual(split['savedCompressed'],
+                         portable['compressed'] - windows['compressed'])
+
+    def test_write_report(self):
+        report = analyze([self.portable], METADATA)
+        json_path, csv_path = write_report(report, self.dir / 'out')
+        self.assertEqual(json.loads(json_path.read_text())['bundles'][0]['flavor'], 'any-any')
+        with open(csv_path, newline='') as f:
+            rows = list(csv.DictReader(f))
+        self.assertEqual(len(rows), len(report['bundles'][0]['extensions']))
+        self.assertEqual(rows[0]['version'], '4.99.0')
+
+    def test_main(self):
+        output = self.dir / 'report'
+        self.assertEqual(main(['--artifacts', str(self.dir), '--output', str(output)]), 0)
+        report = json.loads((output / 'footprint.json').read_text())
+        self.assertEqual(len(report['bundles']), 2)
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,98 @@
+# Copyright (c) Microsoft Corporation. All rights reserved.
+# Licensed under the MIT License.
+"""Unit tests for the bundle metadata index in bundle_manifest.py."""
+
+import json
+import os
+import pathlib
+import shutil
+import tempfile
+import unittest
+
+from tests.tools.bundle_manifest import (
+    BUNDLE_SOURCE_DIR,
+    PROJECT_ROOT,
+    BundleMetadata,
+    get_bundle_metadata,
+)
+
+FABRIC_ID = 'Microsoft.Azure.WebJobs.Extensions.Fabric'
+EXTENSIONS = [
+    {'id': 'Microsoft.Azure.WebJobs.Extensions.Storage.Blobs', 'name': 'AzureStorageBlobs',
+     'version': '5.3.7', 'bindings': ['blobTrigger', 'blob']},
+    {'id': 'Microsoft.Azure.WebJobs.Extensions.Storage.Queues', 'name': 'AzureStorageQueues',
+     'majorVersion': '5', 'bindings': ['queueTrigger', 'queue']},
+    {'id': FABRIC_ID, 'name': 'Startup', 'version': '1.0.0', 'bindings': ['FabricItem']},
+    {'id': 'Microsoft.Azure.WebJobs.Extensions.Startup', 'name': 'Startup',
+     'version': '2.0.0', 'bindings': []},
+]
+CONFIG = {'bundleId': 'Microsoft.Azure.Functions.ExtensionBundle',
+          'bundleVersion': '4.99.0', 'isPreviewBundle': False}
+
+
+class TestBundleMetadata(unittest.TestCase):
+
+    def setUp(self):
+        self.bundle = BundleMetadata(EXTENSIONS, CONFIG, windows_exclusions={FABRIC_ID})
+
+    def test_indexes(self):
+        self.assertEqual(self.bundle.extension(FABRIC_ID)['name'], 'Startup')
+        self.assertIsNone(self.bundle.extension('Missing'))
+        self.assertEqual(len(self.bundle.extensions_named('Startup')), 2)
+        self.assertEqual(self.bundle.bundle_version, '4.99.0')
+        self.assertFalse(self.bundle.is_preview)
+
+    def test_version_of(self):
+        self.assertEqual(self.bundle.version_of(FABRIC_ID), '1.0.0')
+        self.assertEqual(
+            self.bundle.version_of('Microsoft.Azure.WebJobs.Extensions.Storage.Queues'), '5')
+        self.assertIsNone(self.bundle.version_of('Missing'))
+
+    def test_providers(self):
+        self.assertEqual([e['name'] for e in self.bundle.providers('BLOBTRIGGER')],
+                         ['AzureStorageBlobs'])
+        self.assertEqual(len(self.bundle.providers('fabricitem', 'linux')), 1)
+        self.assertEqual(self.bundle.providers('fabricitem', 'windows'), ())
+        self.assertNotIn('fabricitem', self.bundle.bindings('windows'))
+        self.assertIn('fabricitem', self.bundle.bindings())
+
+    def test_repository_bundle(self):
+        bundle = get_bundle_metadata()
+        self.assertEqual(bundle.bundle_id, 'Microsoft.Azure.Functions.ExtensionBundle')
+        self.assertTrue(bundle.providers('blobtrigger'))
+
+
+class TestMetadataCache(unittest.TestCase):
+
+    def setUp(self):
+        self.tmp = tempfile.TemporaryDirectory()
+        self.addCleanup(self.tmp.cleanup)
+        self.directory = pathlib.Path(self.tmp.name)
+        for name in ('extensions.json', 'bundleConfig.json', 'windowsExclusions.json'):
+            shutil.copy(PROJECT_ROOT / BUNDLE_SOURCE_DIR / name, self.directory / name)
+
+    def test_reused_until_a_file_changes(self):
+        first = get_bundle_metadata(self.directory)
+        self.assertIs(get_bundle_metadata(self.directory), first)
+
+        config = self.directory / 'bundleConfig.json'
+        config.write_text(json.dumps(dict(CONFIG, bundleVersion='4.100.0')))
+        stat = config.stat()
+        # Move the mtime forward in case the filesystem's resolution hides the write
+        os.utime(config, ns=(stat.st_atime_ns, stat.st_mtime_ns + 10**9))
+
+        second = get_bundle_metadata(self.directory)
+        self.assertIsNot(second, first)
+        self.assertEqual(second.bundle_version, '4.100.0')
+        self.assertIs(get_bundle_metadata(self.directory), second)
+
+    def test_missing_files(self):
+        (self.directory / 'windowsExclusions.json').unlink()
+        self.assertFalse(get_bundle_metadata(self.directory).windows_exclusions)
+        (self.directory / 'extensions.json').unlink()
+        with self.assertRaises(FileNotFoundError):
+            get_bundle_metadata(self.directory)
+
+
+if __name__ == '__main__':
+    unittest.main()
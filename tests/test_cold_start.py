@@ -0,0 +1,91 @@
+# Copyright (c) Microsoft Corporation. All rights reserved.
+# Licensed under the MIT License.
+"""Unit tests for the cold-start benchmark runner."""
+
+import csv
+import json
+import os
+import pathlib
+import tempfile
+import unittest
+from unittest import mock
+
+from tests.benchmarks.cold_start import (
+    available_host_versions,
+    run_matrix,
+    summarize,
+    write_host_json,
+    write_results,
+)
+from tests.utils import testutils
+
+
+class TestColdStart(unittest.TestCase):
+
+    def setUp(self):
+        tmp = tempfile.TemporaryDirectory()
+        self.addCleanup(tmp.cleanup)
+        self.dir = pathlib.Path(tmp.name)
+        self.app = self.dir / 'app'
+        self.app.mkdir()
+        (self.app / 'function_app.py').write_text('')
+        patcher = mock.patch.dict(os.environ, {
+            testutils.FUNC_APP_SCRATCH_DIR: str(self.dir / 'apps')})
+        patcher.start()
+        self.addCleanup(patcher.stop)
+
+    def test_write_host_json(self):
+        write_host_json(self.app, '4.25.0', self.dir / 'bundles')
+        bundle = json.loads((self.app / 'host.json').read_text())['extensionBundle']
+        self.assertEqual(bundle['version'], '[4.25.0]')
+        self.assertEqual(bundle['downloadPath'], str(self.dir / 'bundles'))
+
+    def test_available_host_versions(self):
+        for name in ('webhost-4.1046.100', 'webhost-4.1047.100', 'other'):
+            (self.dir / name).mkdir()
+        self.assertEqual(available_host_versions(self.dir), ['4.1046.100', '4.1047.100'])
+
+    def test_run_matrix(self):
+        calls = []
+        app_dirs = set()
+
+        def measure(app_dir, timeout):
+            # The host runs on a copy, never on the source directory
+            self.assertNotEqual(app_dir, self.app)
+            self.assertTrue((app_dir / 'function_app.py').exists())
+            app_dirs.add(app_dir)
+            host_json = json.loads((app_dir / 'host.json').read_text())
+            calls.append((os.environ['HOST_VERSION'],
+                          host_json['extensionBundle']['version'],
+                          pathlib.Path(host_json['extensionBundle']['downloadPath']).name))
+            if calls[-1][2].startswith('cold-4.1-4.25.0-'):
+                raise TimeoutError('No successful invocation within 1 seconds')
+            return 1.5
+
+        samples = run_matrix(['4.1'], ['4.24.0', '4.25.0'], repeat=3, app_dir=self.app,
+                             timeout=1, seed=1, measure=measure)
+        self.assertEqual(len(samples), 2 * 2 * 3)
+        # Warm caches are primed once per host and bundle, outside the samples
+        self.assertEqual(len(calls), len(samples) + 2)
+        cold = {name for _, _, name in calls if name.startswith('cold')}
+        self.assertEqual(len(cold), 2 * 3)
+        self.assertFalse((self.app / 'host.json').exists())
+        self.assertEqual(len(app_dirs), 1)
+        self.assertFalse(app_dirs.pop().exists())
+
+        summary = {(r['bundle_version'], r['cache']): r for r in summarize(samples)}
+        self.assertEqual(summary[('4.24.0', 'warm')]['n'], 3)
+        self.assertEqual(summary[('4.24.0', 'warm')]['p50'], 1.5)
+        self.assertEqual(summary[('4.25.0', 'cold')]['errors'], 3)
+        self.assertEqual(summary[('4.25.0', 'cold')]['n'], 0)
+
+        json_path, csv_path = write_results(samples, summarize(samples), self.dir / 'out')
+        self.assertEqual(len(json.loads(json_path.read_text())['samples']), 12)
+        with open(csv_path, newline='') as f:
+            rows = list(csv.DictReader(f))
+        self.assertEqual(len(rows), 4)
+        self.assertEqual(rows[0]['median_ci_low'], '1.5')
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,60 @@
+# Copyright (c) Microsoft Corporation. All rights reserved.
+# Licensed under the MIT License.
+"""Unit tests for batching in the eventhub_batch_functions app.
+
+The producer and its batches are faked, so no Event Hubs emulator is
+needed; the app module still needs azure-functions and azure-eventhub.
+"""
+
+import unittest
+
+try:
+    from tests.emulator_tests.eventhub_batch_functions import function_app
+except ImportError:
+    function_app = None
+
+
+class _FakeBatch:
+    """EventDataBatch stand-in that holds ``max_size_in_bytes`` of events."""
+
+    def __init__(self, max_size_in_bytes):
+        self.max_size_in_bytes = max_size_in_bytes
+        self.events = []
+
+    def __len__(self):
+        return len(self.events)
+
+    def add(self, event):
+        if sum(map(len, self.events)) + len(event) > self.max_size_in_bytes:
+            raise ValueError('EventDataBatch has reached its size limit')
+        self.events.append(event)
+
+
+class _FakeProducer:
+
+    def __init__(self, max_size_in_bytes=10):
+        self.max_size_in_bytes = max_size_in_bytes
+
+    def create_batch(self):
+        return _FakeBatch(self.max_size_in_bytes)
+
+
+@unittest.skipIf(function_app is None, 'azure-functions or azure-eventhub is not installed')
+class TestSplitIntoBatches(unittest.TestCase):
+
+    def test_events_are_split_over_full_batches(self):
+        batches = function_app._split_into_batches(
+            _FakeProducer(), ['aaaa', 'bbbb', 'cccc', 'dddddddddd', 'e'])
+        self.assertEqual([batch.events for batch in batches],
+                         [['aaaa', 'bbbb'], ['cccc'], ['dddddddddd'], ['e']])
+        self.assertEqual(function_app._split_into_batches(_FakeProducer(), []), [])
+
+    def test_event_larger_than_a_batch(self):
+        for events in (['x' * 11], ['aaaa', 'x' * 11]):
+            with self.subTest(events=events), \
+                    self.assertRaisesRegex(function_app.EventTooLargeError, '10 bytes'):
+                function_app._split_into_batches(_FakeProducer(), events)
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,121 @@
+# Copyright (c) Microsoft Corporation. All rights reserved.
+# Licensed under the MIT License.
+"""Unit tests for extension load-time attribution and its report."""
+
+import json
+import pathlib
+import tempfile
+import unittest
+
+from tests.tools.bundle_manifest import BundleMetadata
+from tests.tools.extension_load_report import aggregate, main
+from tests.utils.extension_load import extension_load_times
+from tests.utils.host_logs import LogLine
+from tests.utils.startup_profile import build_startup_profile, write_startup_profile
+
+LAUNCHED = 100.0
+BUNDLE = BundleMetadata([
+    {'id': 'Microsoft.Azure.WebJobs.Extensions.Storage.Blobs', 'name': 'AzureStorageBlobs',
+     'bindings': ['blob']},
+    {'id': 'Microsoft.Azure.WebJobs.Extensions.Kafka', 'name': 'Kafka', 'bindings': ['kafka']},
+])
+
+# (seconds after launch, host output)
+STARTUP_LOG = [
+    (5.0, "Loading extension bundle from /tmp/bundles/4.20.0/bin"),
+    (5.5, "Loading startup extension 'AzureStorageBlobs'"),
+    (5.7, "Loaded extension 'AzureStorageBlobs' (5.3.7.0)"),
+    (6.0, "Loading startup extension 'kafka'"),
+    (6.9, "Loaded extension 'kafka' (4.3.2.0)"),
+    (7.5, "Loaded extension 'Unlisted' (1.0.0.0)"),
+    (8.0, "Starting JobHost"),
+    (9.0, "Loading startup extension 'Late'"),
+]
+
+
+def _lines(log=STARTUP_LOG):
+    return [LogLine(seq=i, text=text, received=LAUNCHED + offset)
+            for i, (offset, text) in enumerate(log)]
+
+
+def _profile(host, bundle, kafka_total):
+    return {'metadata': {'host_version': host, 'bundle_version': bundle},
+            'extensions': [
+                {'name': 'Kafka', 'package_ids': ['K'], 'load_s': kafka_total / 2,
+                 'init_s': kafka_total / 2, 'total_s': kafka_total},
+                {'name': 'AzureStorageBlobs', 'package_ids': [], 'load_s': 0.1,
+                 'init_s': 0.1, 'total_s': 0.2}]}
+
+
+class TestExtensionLoad(unittest.TestCase):
+
+    def test_load_and_init_times(self):
+        loads = extension_load_times(_lines(), LAUNCHED, ready=LAUNCHED + 8.5, bundle=BUNDLE)
+        self.assertEqual([e.name for e in loads], ['AzureStorageBlobs', 'kafka', 'Unlisted'])
+        blobs, kafka, unlisted = loads
+        self.assertAlmostEqual(blobs.load, 0.2)
+        self.assertAlmostEqual(blobs.init, 0.3)
+        self.assertEqual(blobs.version, '5.3.7.0')
+        self.assertEqual(blobs.package_ids,
+                         ('Microsoft.Azure.WebJobs.Extensions.Storage.Blobs',))
+        # Names are matched to extensions.json in any case
+        self.assertEqual(kafka.package_ids, ('Microsoft.Azure.WebJobs.Extensions.Kafka',))
+        self.assertAlmostEqual(kafka.load, 0.9)
+        self.assertAlmostEqual(kafka.init, 0.6)
+        # No "Loading" line: only the time until the host moved on is known
+        self.assertEqual(unlisted.package_ids, ())
+        self.assertAlmostEqual(unlisted.load, 0.0)
+        self.assertAlmostEqual(unlisted.total, 0.5)
+
+    def test_unfinished_extension_ends_at_ready(self):
+        loads = extension_load_times(_lines(STARTUP_LOG[:4]), LAUNCHED, ready=LAUNCHED + 6.5)
+        self.assertAlmostEqual(loads[-1].load, 0.5)
+        self.assertAlmostEqual(loads[-1].init, 0.0)
+
+    def test_startup_profile_includes_extensions(self):
+        profile = build_startup_profile(_lines(), LAUNCHED, 0.0, ready=LAUNCHED + 8.5,
+                                        metadata={'host_version': '4.0.1'}, bundle=BUNDLE)
+        self.assertEqual(len(profile.extensions), 3)
+        trace = profile.to_chrome_trace()
+        self.assertIn('kafka', [e['name'] for e in trace['traceEvents']
+                                if e.get('cat') == 'extension'])
+        self.assertEqual(profile.to_dict()['extensions'][1]['total_s'], 1.5)
+
+
+class TestExtensionLoadReport(unittest.TestCase):
+
+    def test_aggregate(self):
+        rows = aggregate([_profile('4.0.1', '4.9.0', 1.0), _profile('4.0.1', '4.9.0', 3.0),
+                          _profile('4.0.1', '4.10.0', 2.5), _profile('4.0.2', '4.10.0', 1.0)])
+        keys = [(r['host_version'], r['bundle_version'], r['name']) for r in rows]
+        self.assertEqual(keys[:3], [('4.0.1', '4.9.0', 'Kafka'),
+                                    ('4.0.1', '4.9.0', 'AzureStorageBlobs'),
+                                    ('4.0.1', '4.10.0', 'Kafka')])
+        first, _, bumped = rows[:3]
+        self.assertEqual(first['runs'], 2)
+        self.assertEqual(first['median_total_s'], 2.0)
+        self.assertEqual(first['max_total_s'], 3.0)
+        self.assertIsNone(first['delta_total_s'])
+        # 4.10.0 sorts after 4.9.0
+        self.assertEqual(bumped['previous_bundle_version'], '4.9.0')
+        self.assertEqual(bumped['delta_total_s'], 0.5)
+        # Versions are only compared on the same host
+        self.assertIsNone(rows[-1]['previous_bundle_version'])
+
+    def test_main(self):
+        with tempfile.TemporaryDirectory() as tmp:
+            tmp = pathlib.Path(tmp)
+            profile = build_startup_profile(_lines(), LAUNCHED, 0.0, ready=LAUNCHED + 8.5,
+                                            metadata={'host_version': '4.0.1',
+                                                      'bundle_version': '4.9.0'})
+            write_startup_profile(profile, tmp / 'job-1', 'test_kafka')
+            (tmp / 'job-2').mkdir()
+            (tmp / 'job-2' / 'broken_startup.json').write_text('{')
+
+            self.assertEqual(main([str(tmp), '--output', str(tmp / 'report')]), 0)
+            rows = json.loads((tmp / 'report' / 'extension-load-times.json').read_text())
+        self.assertEqual([r['name'] for r in rows], ['kafka', 'AzureStorageBlobs', 'Unlisted'])
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,82 @@
+# Copyright (c) Microsoft Corporation. All rights reserved.
+# Licensed under the MIT License.
+"""Unit tests for per-worker function app copies in testutils.py."""
+
+import json
+import os
+import pathlib
+import tempfile
+import unittest
+from unittest import mock
+
+from tests.utils import testutils
+
+
+class TestFuncAppIsolation(unittest.TestCase):
+    """Tests for materializing and removing function app copies."""
+
+    def setUp(self):
+        self._tmp = tempfile.TemporaryDirectory()
+        self.addCleanup(self._tmp.cleanup)
+        self.tmp = pathlib.Path(self._tmp.name)
+
+        self.app = self.tmp / 'queue_functions'
+        (self.app / '__pycache__').mkdir(parents=True)
+        (self.app / 'function_app.py').write_text('app = None\n')
+        (self.app / 'host.json').write_text('{}')
+        (self.app / 'webhost_config.txt').write_text('stale')
+        (self.app / '__pycache__' / 'function_app.cpython.pyc').write_bytes(b'')
+
+        env = {testutils.FUNC_APP_SCRATCH_DIR: str(self.tmp / 'apps'),
+               'PYTEST_XDIST_WORKER': 'gw3'}
+        patcher = mock.patch.dict(os.environ, env)
+        patcher.start()
+        self.addCleanup(patcher.stop)
+
+    def test_copy_is_hardlinked_and_skips_generated_files(self):
+        copy = testutils._materialize_func_app(self.app)
+
+        self.assertEqual(copy.parent, self.tmp / 'apps' / 'gw3')
+        self.assertTrue(copy.name.startswith('queue_functions-'))
+        self.assertEqual(os.stat(copy / 'function_app.py').st_ino,
+                         os.stat(self.app / 'function_app.py').st_ino)
+        self.assertEqual(sorted(p.name for p in copy.iterdir()),
+                         ['function_app.py'])
+
+    def test_copies_are_independent(self):
+        first = testutils._materialize_func_app(self.app)
+        second = testutils._materialize_func_app(self.app)
+        self.assertNotEqual(first, second)
+
+        testutils._setup_func_app(first, 'ci')
+        self.assertTrue((first / 'host.json').exists())
+        self.assertFalse((second / 'host.json').exists())
+
+    def test_only_copies_are_removed_at_teardown(self):
+        copy = testutils._materialize_func_app(self.app)
+        self.assertTrue(testutils._is_func_app_copy(copy))
+        self.assertFalse(testutils._is_func_app_copy(self.app))
+
+    def test_isolation_is_on_unless_disabled(self):
+        name = testutils.ISOLATE_FUNC_APPS
+        with mock.patch.dict(os.environ):
+            os.environ.pop(name, None)
+            self.assertTrue(testutils.is_envvar_true(name, default=True))
+            self.assertFalse(testutils.is_envvar_true(name))
+            for value, expected in (('false', False), ('0', False), (' Yes ', True)):
+                os.environ[name] = value
+                self.assertEqual(testutils.is_envvar_true(name, default=True), expected)
+
+    def test_func_app_copy_always_writes_host_json(self):
+        # The stale host.json in the source must not hide the settings
+        with testutils._func_app_copy(self.app, 'ci', {'queues': {'batchSize': 8}},
+                                      bundle_version='4.24.0') as copy:
+            host_json = json.loads((copy / 'host.json').read_text())
+            self.assertEqual(host_json['extensions'], {'queues': {'batchSize': 8}})
+            self.assertEqual(host_json['extensionBundle']['version'], '[4.24.0]')
+        self.assertFalse(copy.exists())
+        self.assertEqual((self.app / 'host.json').read_text(), '{}')
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,101 @@
+# Copyright (c) Microsoft Corporation. All rights reserved.
+# Licensed under the MIT License.
+"""Unit tests for the host.json builder and the settings sweep runner."""
+
+import csv
+import json
+import tempfile
+import unittest
+
+from tests.benchmarks.sweep import (
+    expand_grid,
+    flatten_settings,
+    summarize_run,
+    write_sweep_results,
+)
+from tests.utils import testutils
+from tests.utils.host_logs import Invocation
+
+
+class TestBuildHostJson(unittest.TestCase):
+    """Tests for merging extension settings into host.json."""
+
+    def test_without_extension_settings(self):
+        host_json = testutils.build_host_json('debug')
+        self.assertNotIn('extensions', host_json)
+        self.assertEqual(host_json['logging']['logLevel'], {'default': 'Trace'})
+        self.assertEqual(host_json['extensionBundle']['id'],
+                         testutils._get_bundle_id())
+
+    def test_extension_settings_are_merged(self):
+        settings = {'queues': {'batchSize': 32},
+                    'eventHubs': {'maxEventBatchSize': 100, 'prefetchCount': 300}}
+        host_json = json.loads(testutils.get_host_json_template('ci', settings))
+        self.assertEqual(host_json['extensions'], settings)
+
+    def test_merge_settings_recurses(self):
+        merged = testutils.merge_settings(
+            {'serviceBus': {'maxConcurrentCalls': 16, 'prefetchCount': 0}},
+            {'serviceBus': {'maxConcurrentCalls': 32}, 'queues': {'batchSize': 8}})
+        self.assertEqual(merged, {
+            'serviceBus': {'maxConcurrentCalls': 32, 'prefetchCount': 0},
+            'queues': {'batchSize': 8}})
+
+
+class TestSweep(unittest.TestCase):
+    """Tests for grid expansion and sweep result handling."""
+
+    def test_expand_grid(self):
+        combinations = list(expand_grid({
+            'queues.batchSize': [8, 16],
+            'queues.newBatchThreshold': [4],
+            'serviceBus.maxConcurrentCalls': [1, 2]}))
+        self.assertEqual(len(combinations), 4)
+        self.assertEqual(combinations[0], {
+            'queues': {'batchSize': 8, 'newBatchThreshold': 4},
+            'serviceBus': {'maxConcurrentCalls': 1}})
+        self.assertEqual(flatten_settings(combinations[-1]), {
+            'queues.batchSize': 16, 'queues.newBatchThreshold': 4,
+            'serviceBus.maxConcurrentCalls': 2})
+
+    def test_summarize_run(self):
+        invocations = [
+            Invocation('ping', '1', status='Succeeded', duration_ms=10),
+            Invocation('ping', '2', status='Failed', duration_ms=30),
+            Invocation('ping', '3'),  # still running
+        ]
+        metrics = summarize_run(invocations, elapsed=2.0)
+        self.assertEqual(metrics['invocations'], 2)
+        self.assertEqual(metrics['failed'], 1)
+        self.assertEqual(metrics['throughput_per_s'], 1.0)
+        self.assertEqual(metrics['duration_p50_ms'], 20)
+
+    def test_write_results(self):
+        results = [{'settings': {'queues': {'batchSize': size}}, 'run': 0,
+                    'metrics': summarize_run([], 1.0), 'functions': {},
+                    'workload': {}} for size in (8, 16)]
+        with tempfile.TemporaryDirectory() as tmp:
+            _, csv_path = write_sweep_results(results, tmp)
+            with open(csv_path, newline='') as f:
+                rows = list(csv.DictReader(f))
+        self.assertEqual([row['queues.batchSize'] for row in rows], ['8', '16'])
+        self.assertEqual(rows[0]['invocations'], '0')
+
+    def test_write_results_with_workload_columns(self):
+        results = [{'settings': {}, 'run': run, 'metrics': summarize_run([], 1.0),
+                    'functions': {}, 'workload': workload}
+                   for run, workload in enumerate([{'drain_per_s': 50.0, 'latency': [1, 2]},
+                                                   {'errors': 1}])]
+        with tempfile.TemporaryDirectory() as tmp:
+            _, csv_path = write_sweep_results(results, tmp)
+            with open(csv_path, newline='') as f:
+                rows = list(csv.DictReader(f))
+        # Only scalar workload results become columns
+        self.assertNotIn('workload.latency', rows[0])
+        self.assertEqual(rows[0]['workload.drain_per_s'], '50.0')
+        self.assertEqual(rows[1]['workload.drain_per_s'], '')
+        self.assertEqual(rows[1]['workload.errors'], '1')
+
+
+if __name__ == "__main__":
+    unittest.main()
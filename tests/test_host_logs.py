@@ -0,0 +1,202 @@
+# Copyright (c) Microsoft Corporation. All rights reserved.
+# Licensed under the MIT License.
+"""Unit tests for the host log stream parser in host_logs.py."""
+
+import gzip
+import io
+import os
+import tempfile
+import threading
+import time
+import unittest
+
+from tests.utils.host_logs import (
+    HostLogCapture,
+    HostLogIndex,
+    HostLogReader,
+    parse_timestamp,
+)
+
+INVOCATION_ID = '2b7c8a3e-4f1d-4c55-9a0e-6f2d1b3c4d5e'
+FAILED_ID = '9a1b2c3d-0000-4c55-9a0e-6f2d1b3c4d5e'
+
+SAMPLE_LOG = [
+    "[2025-01-07T10:00:00.1234567Z] Host lock lease acquired by instance ID '000000000000000000000000ABCDEF'.",
+    "[2025-01-07T10:00:01.000Z] Worker process started and initialized.",
+    "[2025-01-07T10:00:02.000Z] Executing 'Functions.queue_trigger' "
+    f"(Reason='New queue message detected on 'testqueue'.', Id={INVOCATION_ID})",
+    "[2025-01-07T10:00:02.250Z] Executed 'Functions.queue_trigger' "
+    f"(Succeeded, Id={INVOCATION_ID}, Duration=250ms)",
+    "[2025-01-07T10:00:03.000Z] Executing 'Functions.blob_trigger' "
+    f"(Reason='New blob detected(LogsAndContainerScan): bundle-tests/test-blob-trigger.txt', Id={FAILED_ID})",
+    "[2025-01-07T10:00:03.010Z] Executed 'Functions.blob_trigger' "
+    f"(Failed, Id={FAILED_ID}, Duration=10ms)",
+]
+
+
+class TestHostLogIndex(unittest.TestCase):
+    """Tests for indexing host log lines."""
+
+    def setUp(self):
+        self.index = HostLogIndex()
+        for line in SAMPLE_LOG:
+            self.index.feed(line + '\n')
+
+    def test_parse_timestamp_truncates_dotnet_precision(self):
+        ts = parse_timestamp('2025-01-07T10:00:00.1234567Z')
+        self.assertEqual(ts.microsecond, 123456)
+        self.assertIsNotNone(ts.tzinfo)
+
+    def test_invocations_are_reconstructed(self):
+        inv, = self.index.invocations('queue_trigger')
+        self.assertEqual(inv.invocation_id, INVOCATION_ID)
+        self.assertEqual(inv.status, 'Succeeded')
+        self.assertEqual(inv.duration_ms, 250)
+        self.assertEqual(inv.reason, "New queue message detected on 'testqueue'.")
+        self.assertTrue(inv.succeeded)
+
+    def test_lines_are_indexed(self):
+        self.assertEqual(len(self.index.by_function('queue_trigger')), 2)
+        self.assertEqual(len(self.index.by_invocation(FAILED_ID)), 2)
+        self.assertEqual(len(self.index.by_category('invocation')), 4)
+        self.assertEqual(len(self.index.by_category('worker')), 1)
+
+    def test_wait_for_invocation_with_status(self):
+        inv = self.index.wait_for_invocation('blob_trigger', status='Failed',
+                                             timeout=0.1)
+        self.assertEqual(inv.invocation_id, FAILED_ID)
+        with self.assertRaises(TimeoutError):
+            self.index.wait_for_invocation('blob_trigger', timeout=0.1)
+
+    def test_wait_for_invocation_ignores_lines_before_mark(self):
+        mark = self.index.mark()
+        with self.assertRaises(TimeoutError):
+            self.index.wait_for_invocation('queue_trigger', since=mark,
+                                           timeout=0.1)
+
+    def test_wait_for_invocation_blocks_until_logged(self):
+        mark = self.index.mark()
+        new_id = '11111111-2222-3333-4444-555555555555'
+
+        def log_later():
+            time.sleep(0.2)
+            self.index.feed("Executing 'Functions.queue_trigger' "
+                            f"(Reason='New queue message', Id={new_id})")
+            self.index.feed("Executed 'Functions.queue_trigger' "
+                            f"(Succeeded, Id={new_id}, Duration=5ms)")
+
+        threading.Thread(target=log_later, daemon=True).start()
+        inv = self.index.wait_for_invocation('queue_trigger', since=mark,
+                                             timeout=5)
+        self.assertEqual(inv.invocation_id, new_id)
+
+    def test_index_is_bounded(self):
+        index = HostLogIndex(max_lines=3)
+        for i in range(10):
+            index.feed(f"Worker process line {i}")
+        self.assertEqual([line.seq for line in index.lines], [7, 8, 9])
+        self.assertEqual(len(index.by_category('worker')), 3)
+        self.assertEqual(index.mark(), 10)
+
+    def test_invocations_are_bounded(self):
+        index = HostLogIndex(max_lines=2, max_invocations=3)
+        for i in range(5):
+            invocation_id = f'00000000-0000-0000-0000-00000000000{i}'
+            index.feed(f"Executing 'Functions.ping' (Reason='x', Id={invocation_id})")
+            index.feed(f"Executed 'Functions.ping' (Succeeded, Id={invocation_id}, "
+                       "Duration=1ms)")
+        self.assertEqual([inv.invocation_id[-1] for inv in index.invocations()],
+                         ['2', '3', '4'])
+        # An invocation keeps its own lines after they left the line index
+        self.assertEqual(len(index.by_invocation('00000000-0000-0000-0000-000000000002')), 2)
+        self.assertEqual(index.by_invocation('00000000-0000-0000-0000-000000000000'), [])
+
+
+class TestHostLogReader(unittest.TestCase):
+    """Tests for reading host output from a pipe."""
+
+    def test_reader_tees_and_indexes(self):
+        read_fd, write_fd = os.pipe()
+        sink = io.StringIO()
+        with os.fdopen(read_fd, 'rb') as pipe:
+            reader = HostLogReader(pipe, sink=sink).start()
+            with os.fdopen(write_fd, 'wb') as writer:
+                writer.write(('\n'.join(SAMPLE_LOG) + '\n').encode('utf-8'))
+            reader.join(5)
+
+        self.assertEqual(sink.getvalue(), '\n'.join(SAMPLE_LOG) + '\n')
+        self.assertEqual(len(reader.index.lines), len(SAMPLE_LOG))
+        self.assertEqual(len(reader.index.invocations()), 2)
+
+
+class TestHostLogCapture(unittest.TestCase):
+    """Tests for the bounded host output sink."""
+
+    def test_tail_and_passthrough(self):
+        passthrough = io.StringIO()
+        capture = HostLogCapture(passthrough=passthrough, tail_lines=2)
+        for i in range(5):
+            capture.write(f"line {i}\n")
+        self.assertEqual(capture.tail(), "line 3\nline 4\n")
+        self.assertEqual(passthrough.getvalue().count("\n"), 5)
+        capture.close()
+        with self.assertRaises(ValueError):
+            capture.write("late\n")
+
+    def test_archive_is_capped_and_keeps_the_end(self):
+        with tempfile.TemporaryDirectory() as tmp:
+            archive = os.path.join(tmp, 'logs', 'host.log.gz')
+            capture = HostLogCapture(archive=archive, max_archive_bytes=20,
+                                     tail_lines=3)
+            for i in range(10):
+                capture.write(f"line {i}\n")  # 7 bytes each
+            capture.close()
+            with gzip.open(archive, 'rt') as f:
+                content = f.read()
+
+        self.assertEqual(capture.dropped_lines, 8)
+        self.assertTrue(content.startswith("line 0\nline 1\n"))
+        self.assertIn("5 line(s) omitted, last 3 line(s) follow", content)
+        self.assertTrue(content.endswith("line 7\nline 8\nline 9\n"))
+        self.assertNotIn("line 4", content)
+
+    def test_lines_after_the_cap_are_all_dropped(self):
+        with tempfile.TemporaryDirectory() as tmp:
+            archive = os.path.join(tmp, 'host.log.gz')
+            capture = HostLogCapture(archive=archive, max_archive_bytes=20)
+            for text in ('a' * 9 + '\n', 'b' * 20 + '\n', 'c\n', 'd\n'):
+                capture.write(text)
+            capture.close()
+            with gzip.open(archive, 'rt') as f:
+                content = f.read()
+
+        # Shorter lines after the long one would fit, but are not archived
+        # out of order; the end of the output is replayed from the tail
+        self.assertEqual(capture.dropped_lines, 3)
+        self.assertTrue(content.startswith('a' * 9 + '\n\n...'))
+        self.assertIn('0 line(s) omitted, last 3 line(s) follow', content)
+        self.assertTrue(content.endswith('b' * 20 + '\nc\nd\n'))
+        self.assertEqual(content.count('d\n'), 1)
+
+    def test_archive_cap_counts_utf8_bytes(self):
+        with tempfile.TemporaryDirectory() as tmp:
+            archive = os.path.join(tmp, 'host.log.gz')
+            capture = HostLogCapture(archive=archive, max_archive_bytes=10)
+            capture.write("\u00e9\u00e9\u00e9\u00e9\n")  # 5 characters, 9 bytes
+            capture.write("\u00e9\n")
+            capture.close()
+        self.assertEqual(capture.archived_bytes, 9)
+        self.assertEqual(capture.dropped_lines, 1)
+
+    def test_archive_without_truncation(self):
+        with tempfile.TemporaryDirectory() as tmp:
+            archive = os.path.join(tmp, 'host.log.gz')
+            capture = HostLogCapture(archive=archive)
+            capture.write("only line\n")
+            capture.close()
+            with gzip.open(archive, 'rt') as f:
+                self.assertEqual(f.read(), "only line\n")
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,174 @@
+# Copyright (c) Microsoft Corporation. All rights reserved.
+# Licensed under the MIT License.
+"""Unit tests for the binding index and change-impact test selection."""
+
+import os
+import pathlib
+import subprocess
+import tempfile
+import textwrap
+import unittest
+from unittest import mock
+
+from tests.tools.binding_index import index_app, index_apps, index_test_modules
+from tests.tools import impact
+from tests.tools.impact import (
+    DEFAULT_SMOKE_MODULES,
+    changed_files,
+    diff_extensions,
+    filter_test_groups,
+    merge_base,
+    select,
+)
+
+APP = textwrap.dedent('''
+    import azure.functions as func
+
+    app = func.FunctionApp()
+
+    @app.function_name(name="put_message")
+    @app.route(route="put_message")
+    @app.queue_output(arg_name="msg", queue_name="q", connection="S")
+    def put(req, msg):
+        pass
+
+    @app.generic_trigger(arg_name="m", type="rabbitMQTrigger", queueName="q")
+    @app.blob_output(arg_name="$return", path="c/x.txt", connection="S")
+    def consume(m):
+        pass
+
+    @app.assistant_skill(name="x")
+    def unknown(req):
+        pass
+''')
+
+KAFKA = {'id': 'Microsoft.Azure.WebJobs.Extensions.Kafka', 'version': '4.3.2',
+         'name': 'Kafka', 'bindings': ['kafkatrigger', 'kafka']}
+STORAGE = {'id': 'Microsoft.Azure.WebJobs.Extensions.Storage.Blobs',
+           'version': '5.3.7', 'name': 'AzureStorageBlobs',
+           'bindings': ['blobtrigger', 'blob']}
+DEPENDENCY = {'id': 'System.Private.Uri', 'version': '4.3.2',
+              'name': 'SystemPrivateUri', 'bindings': []}
+
+GROUPS = [
+    {'name': 'BasicTests', 'group': 'basic', 'emulators': 'none',
+     'files': 'test_blob_functions.py test_connectivity.py test_queue_functions.py'},
+    {'name': 'Kafka', 'group': 'kafka', 'emulators': 'kafka',
+     'files': 'test_kafka_functions.py'},
+    {'name': 'SQL', 'group': 'sql', 'emulators': 'sql',
+     'files': 'test_sql_functions.py'},
+]
+
+
+class TestBindingIndex(unittest.TestCase):
+
+    def test_index_app(self):
+        with tempfile.TemporaryDirectory() as tmp:
+            path = pathlib.Path(tmp) / 'my_functions' / 'function_app.py'
+            path.parent.mkdir()
+            path.write_text(APP)
+            app = index_app(path)
+
+        self.assertEqual(app.name, 'my_functions')
+        self.assertEqual(app.binding_types,
+                         {'httptrigger', 'queue', 'rabbitmqtrigger', 'blob'})
+        self.assertEqual([f for f, _ in app.bindings['queue']], ['put_message'])
+        self.assertEqual([f for f, _ in app.bindings['blob']], ['consume'])
+        self.assertEqual([name for name, _ in app.unknown], ['assistant_skill'])
+
+    def test_emulator_apps_are_indexed(self):
+        apps = index_apps()
+        self.assertIn('kafkatrigger', apps['kafka_functions'].binding_types)
+        self.assertIn('signalrtrigger', apps['signalr_functions'].binding_types)
+        modules = index_test_modules(app_names=set(apps))
+        self.assertEqual(modules['test_kafka_functions.py'], ['kafka_functions'])
+        self.assertEqual(len(modules['test_webpubsub_functions.py']), 3)
+
+
+class TestImpact(unittest.TestCase):
+
+    def test_diff_extensions(self):
+        bumped = dict(KAFKA, version='4.3.3')
+        changes = diff_extensions([KAFKA, STORAGE], [bumped, DEPENDENCY])
+        self.assertEqual([(c.name, c.change) for c in changes], [
+            ('Kafka', 'changed'),
+            ('AzureStorageBlobs', 'removed'),
+            ('SystemPrivateUri', 'added'),
+        ])
+        self.assertEqual(changes[0].bindings, {'kafka', 'kafkatrigger'})
+
+    def test_extension_bump_selects_its_users(self):
+        changes = diff_extensions([KAFKA], [dict(KAFKA, version='4.3.3')])
+        selection = select(['src/Microsoft.Azure.Functions.ExtensionBundle/extensions.json'],
+                           changes)
+        self.assertFalse(selection.run_all)
+        self.assertEqual(selection.modules, {'test_kafka_functions.py'})
+
+        groups = filter_test_groups(GROUPS, selection)
+        self.assertEqual([g['name'] for g in groups], ['BasicTests', 'Kafka'])
+        self.assertEqual(groups[0]['files'].split(),
+                         [m for m in GROUPS[0]['files'].split()
+                          if m in DEFAULT_SMOKE_MODULES])
+
+    def test_storage_bump_selects_apps_storing_blobs(self):
+        changes = diff_extensions([STORAGE], [dict(STORAGE, version='5.3.8')])
+        selection = select([], changes)
+        self.assertIn('test_kafka_functions.py', selection.modules)
+        self.assertNotIn('test_sql_functions.py', selection.modules)
+
+    def test_changes_that_select_everything(self):
+        self.assertTrue(select([], diff_extensions([], [DEPENDENCY])).run_all)
+        self.assertTrue(select([], config_changes=['isPreviewBundle']).run_all)
+        self.assertTrue(select(['tests/utils/testutils.py']).run_all)
+        self.assertEqual(len(filter_test_groups(
+            GROUPS, select(['eng/ci/templates/jobs/emulator-tests.yml']))), 3)
+
+    def test_changes_that_select_nothing_extra(self):
+        selection = select(['README.md',
+                            'src/Microsoft.Azure.Functions.ExtensionBundle/windowsExclusions.json'],
+                           config_changes=['bundleVersion'])
+        self.assertFalse(selection.run_all)
+        self.assertEqual(selection.modules, set())
+
+    def test_changed_app_and_test_module(self):
+        selection = select(['tests/emulator_tests/sql_functions/function_app.py',
+                            'tests/emulator_tests/test_queue_functions.py'])
+        self.assertEqual(selection.modules,
+                         {'test_sql_functions.py', 'test_queue_functions.py'})
+
+
+
+class TestChangedFiles(unittest.TestCase):
+
+    def _git(self, *args):
+        env = {**os.environ, 'GIT_AUTHOR_NAME': 'test', 'GIT_AUTHOR_EMAIL': 'test@example.com',
+               'GIT_COMMITTER_NAME': 'test', 'GIT_COMMITTER_EMAIL': 'test@example.com'}
+        return subprocess.run(['git', *args], cwd=self.repo, env=env, check=True,
+                              capture_output=True, text=True).stdout.strip()
+
+    def _commit(self, name):
+        (self.repo / name).write_text(name)
+        self._git('add', name)
+        self._git('commit', '-q', '-m', name)
+
+    def test_changes_since_the_merge_base(self):
+        with tempfile.TemporaryDirectory() as tmp:
+            self.repo = pathlib.Path(tmp)
+            self._git('init', '-q', '-b', 'main')
+            self._commit('README.md')
+            self._git('checkout', '-q', '-b', 'feature')
+            self._commit('feature.txt')
+            self._git('checkout', '-q', 'main')
+            self._commit('landed-later.txt')
+
+            with mock.patch.object(impact, 'PROJECT_ROOT', self.repo):
+                fork = merge_base('main', 'feature')
+                self.assertEqual(fork, self._git('rev-parse', 'main~1'))
+                # A two-dot diff would also report what landed on main since
+                self.assertEqual(changed_files('main', 'feature'),
+                                 ['feature.txt', 'landed-later.txt'])
+                self.assertEqual(changed_files(fork, 'feature'), ['feature.txt'])
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,66 @@
+# Copyright (c) Microsoft Corporation. All rights reserved.
+# Licensed under the MIT License.
+"""Unit tests for the invocation latency report in invocation_metrics.py."""
+
+import csv
+import json
+import tempfile
+import unittest
+
+from tests.utils.host_logs import Invocation
+from tests.utils.invocation_metrics import (
+    percentile,
+    summarize_invocations,
+    write_invocation_report,
+)
+
+
+def _invocation(name, duration, status='Succeeded'):
+    return Invocation(function_name=name, invocation_id=f'{name}-{duration}',
+                      status=status, duration_ms=duration)
+
+
+class TestInvocationMetrics(unittest.TestCase):
+    """Tests for summarizing and writing invocation statistics."""
+
+    def test_percentile_interpolates(self):
+        values = [10, 20, 30, 40]
+        self.assertEqual(percentile(values, 50), 25)
+        self.assertEqual(percentile(values, 100), 40)
+        self.assertEqual(percentile([7], 95), 7)
+        self.assertIsNone(percentile([], 50))
+
+    def test_summarize_groups_by_function(self):
+        summary = summarize_invocations([
+            _invocation('queue_trigger', 10),
+            _invocation('queue_trigger', 30),
+            _invocation('queue_trigger', 20, status='Failed'),
+            _invocation('blob_trigger', 5),
+            Invocation(function_name='blob_trigger', invocation_id='running'),
+        ])
+        self.assertEqual(list(summary), ['blob_trigger', 'queue_trigger'])
+        stats = summary['queue_trigger']
+        self.assertEqual(stats['count'], 3)
+        self.assertEqual(stats['failed'], 1)
+        self.assertEqual(stats['p50_ms'], 20)
+        self.assertEqual(stats['max_ms'], 30)
+        self.assertEqual(summary['blob_trigger']['count'], 1)
+
+    def test_write_report(self):
+        summary = summarize_invocations([_invocation('http_trigger', 12)])
+        with tempfile.TemporaryDirectory() as tmp:
+            json_path, csv_path = write_invocation_report(
+                summary, tmp, 'test_http', metadata={'host_version': '4.0'})
+            with open(json_path) as f:
+                report = json.load(f)
+            with open(csv_path, newline='') as f:
+                rows = list(csv.DictReader(f))
+
+        self.assertEqual(report['metadata'], {'host_version': '4.0'})
+        self.assertEqual(report['functions']['http_trigger']['count'], 1)
+        self.assertEqual(rows[0]['function'], 'http_trigger')
+        self.assertEqual(rows[0]['p95_ms'], '12.0')
+
+
+if __name__ == "__main__":
+    unittest.main()
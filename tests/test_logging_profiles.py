@@ -0,0 +1,61 @@
+# Copyright (c) Microsoft Corporation. All rights reserved.
+# Licensed under the MIT License.
+"""Unit tests for the host logging profiles in logging_profiles.py."""
+
+import json
+import os
+import unittest
+from unittest import mock
+
+from tests.benchmarks.logging_overhead import compare_to_baseline
+from tests.utils import testutils
+from tests.utils.logging_profiles import (
+    LOGGING_PROFILES,
+    WEBHOST_LOG_PROFILE,
+    get_logging_profile,
+)
+
+
+class TestLoggingProfiles(unittest.TestCase):
+    """Tests for selecting profiles and rendering them into host.json."""
+
+    def test_default_profile_keeps_trace_logging(self):
+        with mock.patch.dict(os.environ, {WEBHOST_LOG_PROFILE: ''}):
+            profile = get_logging_profile()
+        self.assertEqual(profile.name, 'debug')
+        self.assertEqual(profile.log_levels, {'default': 'Trace'})
+        self.assertTrue(profile.verbose)
+
+    def test_profile_from_environment(self):
+        with mock.patch.dict(os.environ, {WEBHOST_LOG_PROFILE: 'Benchmark'}):
+            self.assertEqual(get_logging_profile().name, 'benchmark')
+
+    def test_unknown_profile(self):
+        with self.assertRaises(ValueError):
+            get_logging_profile('quiet')
+
+    def test_invocation_logs_are_kept_in_every_profile(self):
+        levels = ('Trace', 'Debug', 'Information')
+        for profile in LOGGING_PROFILES.values():
+            level = profile.log_levels.get('Function',
+                                           profile.log_levels['default'])
+            self.assertIn(level, levels, profile.name)
+
+    def test_host_json_uses_profile(self):
+        host_json = json.loads(testutils.get_host_json_template('ci'))
+        self.assertEqual(host_json['logging']['logLevel'],
+                         LOGGING_PROFILES['ci'].log_levels)
+        self.assertIn('extensionBundle', host_json)
+
+    def test_compare_to_baseline(self):
+        results = compare_to_baseline({
+            'debug': {'latency_mean_ms': 5.0, 'latency_p50_ms': 4.0},
+            'benchmark': {'latency_mean_ms': 3.5, 'latency_p50_ms': 3.0},
+        })
+        self.assertEqual(results['debug']['overhead_mean_ms'], 1.5)
+        self.assertEqual(results['debug']['overhead_p50_ms'], 1.0)
+        self.assertEqual(results['benchmark']['overhead_mean_ms'], 0)
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,160 @@
+# Copyright (c) Microsoft Corporation. All rights reserved.
+# Licensed under the MIT License.
+"""Unit tests for cross-process port leases in port_reservation.py."""
+
+import json
+import multiprocessing
+import os
+import subprocess
+import sys
+import tempfile
+import time
+import unittest
+from unittest import mock
+
+from tests.utils import testutils
+from tests.utils.host_logs import HostLogReader
+from tests.utils.port_reservation import PortLeaseTable
+
+
+def _reserve_many(directory, count, queue):
+    table = PortLeaseTable(directory)
+    queue.put([table.reserve().port for _ in range(count)])
+
+
+class TestPortLeaseTable(unittest.TestCase):
+    """Tests for reserving and releasing ports."""
+
+    def setUp(self):
+        self._tmp = tempfile.TemporaryDirectory()
+        self.addCleanup(self._tmp.cleanup)
+        self.table = PortLeaseTable(self._tmp.name)
+
+    def test_reserve_and_release(self):
+        lease = self.table.reserve()
+        self.assertIn(lease.port, self.table.leases())
+        lease.release()
+        self.assertNotIn(lease.port, self.table.leases())
+
+    def test_ports_are_unique_across_processes(self):
+        queue = multiprocessing.Queue()
+        workers = [multiprocessing.Process(target=_reserve_many,
+                                           args=(self._tmp.name, 10, queue))
+                   for _ in range(4)]
+        for worker in workers:
+            worker.start()
+        ports = [port for _ in workers for port in queue.get(timeout=30)]
+        for worker in workers:
+            worker.join(10)
+        self.assertEqual(len(ports), len(set(ports)))
+
+    def test_stale_leases_are_reclaimed(self):
+        dead = subprocess.Popen([sys.executable, '-c', 'pass'])
+        dead.wait()
+        with open(self.table._leases_path, 'w') as f:
+            json.dump({'40001': {'pid': dead.pid, 'leased_at': time.time()},
+                       '40002': {'pid': 1, 'leased_at': 0}}, f)
+        self.assertEqual(self.table.leases(), {})
+
+    def test_leased_port_is_skipped(self):
+        lease = self.table.reserve()
+        with open(self.table._leases_path) as f:
+            leases = json.load(f)
+        # Another live process holds every port the OS might hand out next
+        leases[str(lease.port)]['pid'] = 1
+        with open(self.table._leases_path, 'w') as f:
+            json.dump(leases, f)
+        other = self.table.reserve()
+        self.assertNotEqual(other.port, lease.port)
+        lease.release()  # Not ours any more: kept
+        self.assertIn(lease.port, self.table.leases())
+
+
+class TestStartupPortConflict(unittest.TestCase):
+    """Tests for detecting a host that could not bind its port."""
+
+    def test_port_conflict_is_reported(self):
+        proc = subprocess.Popen(
+            [sys.executable, '-c',
+             "print('Port 7071 is unavailable. Close the process using that port.', flush=True);"
+             "import time; time.sleep(5)"],
+            stdout=subprocess.PIPE)
+        reader = HostLogReader(proc.stdout).start()
+        proxy = testutils._WebHostProxy(proc, 'http://127.0.0.1:9', reader)
+        try:
+            testutils.wait_until(lambda: reader.index.lines, timeout=5)
+            with self.assertRaises(testutils._PortConflict):
+                proxy.check_startup()
+        finally:
+            proxy.close()
+
+    def test_port_conflict_is_reported_after_exit(self):
+        proc = subprocess.Popen(
+            [sys.executable, '-c',
+             "print('Port 7071 is unavailable. Close the process using that port.');"
+             "raise SystemExit(1)"],
+            stdout=subprocess.PIPE)
+        proc.wait()
+        # Checked before the reader has necessarily seen the line
+        proxy = testutils._WebHostProxy(proc, 'http://127.0.0.1:9',
+                                        HostLogReader(proc.stdout).start())
+        try:
+            with self.assertRaises(testutils._PortConflict):
+                proxy.check_startup()
+        finally:
+            proxy.close()
+
+    def test_exited_host_is_reported(self):
+        proc = subprocess.Popen([sys.executable, '-c', 'raise SystemExit(3)'],
+                                stdout=subprocess.PIPE)
+        proc.wait()
+        proxy = testutils._WebHostProxy(proc, 'http://127.0.0.1:9',
+                                        HostLogReader(proc.stdout).start())
+        try:
+            with self.assertRaisesRegex(testutils._HostExited, 'code 3'):
+                proxy.check_startup()
+        finally:
+            proxy.close()
+
+
+class TestStartWebhostCleanup(unittest.TestCase):
+    """Tests for releasing the host and its port when startup goes wrong."""
+
+    def setUp(self):
+        self._tmp = tempfile.TemporaryDirectory()
+        self.addCleanup(self._tmp.cleanup)
+        patcher = mock.patch.dict(os.environ, {'PORT_LEASE_DIR': self._tmp.name})
+        patcher.start()
+        self.addCleanup(patcher.stop)
+        self.procs = []
+
+    def _popen(self, **kwargs):
+        proc = subprocess.Popen([sys.executable, '-c', 'import time; time.sleep(30)'],
+                                stdout=subprocess.PIPE)
+        self.procs.append(proc)
+        return proc
+
+    def test_unexpected_error_closes_the_host(self):
+        with mock.patch.object(testutils, 'popen_webhost', self._popen), \
+                mock.patch.object(testutils, 'wait_until', side_effect=ValueError('boom')):
+            with self.assertRaisesRegex(ValueError, 'boom'):
+                testutils.start_webhost(script_dir='app')
+        self.assertIsNotNone(self.procs[0].poll())
+        self.assertEqual(PortLeaseTable(self._tmp.name).leases(), {})
+
+    def test_startup_profile_failure_is_not_fatal(self):
+        with mock.patch.object(testutils, 'popen_webhost', self._popen), \
+                mock.patch.object(testutils, 'wait_until'), \
+                mock.patch.object(testutils, 'build_startup_profile',
+                                  side_effect=ValueError('bad access log')), \
+                self.assertLogs(level='WARNING') as logs:
+            proxy = testutils.start_webhost(script_dir='app')
+        try:
+            self.assertIsNone(proxy.startup)
+            self.assertIn('bad access log', logs.output[-1])
+        finally:
+            proxy.close()
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,77 @@
+# Copyright (c) Microsoft Corporation. All rights reserved.
+# Licensed under the MIT License.
+"""Unit tests for the pre-flight binding check in preflight.py."""
+
+import pathlib
+import unittest
+
+from tests.tools.binding_index import AppBindings, index_apps
+from tests.tools.bundle_manifest import BundleMetadata, get_bundle_metadata
+from tests.tools.preflight import check_app, check_app_dir, main
+
+FABRIC_ID = 'Microsoft.Azure.WebJobs.Extensions.Fabric'
+EXTENSIONS = [
+    {'id': 'Microsoft.Azure.WebJobs.Extensions.Storage.Blobs', 'name': 'AzureStorageBlobs',
+     'bindings': ['blobtrigger', 'blob']},
+    {'id': 'Microsoft.Azure.WebJobs.Extensions.MySql', 'name': 'MySqlBinding',
+     'bindings': ['MySql', 'MySqlTrigger']},
+    {'id': FABRIC_ID, 'name': 'Startup', 'bindings': ['FabricItem']},
+]
+BUNDLE = BundleMetadata(EXTENSIONS, windows_exclusions={FABRIC_ID})
+
+
+def _app(**bindings):
+    return AppBindings(name='my_functions', path=pathlib.Path('function_app.py'),
+                       bindings={b: [(f, 10)] for b, f in bindings.items()})
+
+
+class TestPreflight(unittest.TestCase):
+
+    def test_bindings_are_matched_case_insensitively(self):
+        app = _app(blob='get_blob', mysqltrigger='on_row', httptrigger='get_blob')
+        self.assertEqual(check_app(app, BUNDLE), [])
+
+    def test_missing_binding(self):
+        problems = check_app(_app(sqltrigger='on_row'), BUNDLE)
+        self.assertEqual(len(problems), 1)
+        self.assertEqual(problems[0].function, 'on_row')
+        self.assertEqual(problems[0].severity, 'error')
+        self.assertIn("'sqltrigger' is not provided", problems[0].message)
+
+    def test_windows_exclusions(self):
+        app = _app(fabricitem='add_connection')
+        self.assertEqual(check_app(app, BUNDLE), [])
+        problems = check_app(app, BUNDLE, platform='windows')
+        self.assertIn('excluded', problems[0].message)
+
+    def test_unknown_decorators_are_warnings(self):
+        app = _app(blob='get_blob')
+        app.unknown.append(('assistant_skill', 3))
+        problems = check_app(app, BUNDLE)
+        self.assertEqual([p.severity for p in problems], ['warning'])
+
+    def test_emulator_apps_pass_on_linux(self):
+        bundle = get_bundle_metadata()
+        for name, app in index_apps().items():
+            with self.subTest(app=name):
+                errors = [str(p) for p in check_app(app, bundle)
+                          if p.severity == 'error']
+                self.assertEqual(errors, [])
+
+    def test_fabric_is_not_in_windows_bundles(self):
+        bundle = get_bundle_metadata()
+        self.assertTrue(bundle.is_excluded(FABRIC_ID, 'windows'))
+        fabric = index_apps()['fabric_functions']
+        self.assertTrue(check_app(fabric, bundle, 'windows'))
+
+    def test_unknown_platform(self):
+        with self.assertRaises(ValueError):
+            check_app_dir(pathlib.Path('.'), 'macos')
+
+    def test_main(self):
+        self.assertEqual(main(['blob_functions', 'kafka_functions']), 0)
+        self.assertEqual(main(['fabric_functions', '--platform', 'windows']), 1)
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,88 @@
+# Copyright (c) Microsoft Corporation. All rights reserved.
+# Licensed under the MIT License.
+"""Unit tests for the host resource sampler in resource_sampler.py."""
+
+import json
+import subprocess
+import sys
+import tempfile
+import time
+import unittest
+
+from tests.utils import resource_sampler
+from tests.utils.resource_sampler import (
+    ResourceSample,
+    ResourceSampler,
+    summarize_samples,
+    write_resource_report,
+)
+
+
+def _sample(elapsed, rss, cpu, threads=10, handles=20):
+    return ResourceSample(elapsed_s=elapsed, processes=2, worker_processes=1,
+                          rss_mb=rss, cpu_percent=cpu, threads=threads,
+                          handles=handles)
+
+
+class TestSummarizeSamples(unittest.TestCase):
+    """Tests for the peak/average summary and report files."""
+
+    def test_summary(self):
+        summary = summarize_samples([_sample(0, 100, 0), _sample(1, 300, 50),
+                                     _sample(2, 200, 30, threads=14)])
+        self.assertEqual(summary['samples'], 3)
+        self.assertEqual(summary['duration_s'], 2)
+        self.assertEqual(summary['rss_mb'], {'peak': 300, 'avg': 200})
+        # The first CPU reading is always 0 and is not averaged
+        self.assertEqual(summary['cpu_percent'], {'peak': 50, 'avg': 40})
+        self.assertEqual(summary['threads']['peak'], 14)
+        self.assertEqual(summarize_samples([]), {})
+
+    def test_write_report(self):
+        with tempfile.TemporaryDirectory() as tmp:
+            json_path, csv_path = write_resource_report(
+                [_sample(0, 100, 0), _sample(1, 120, 10)], tmp, 'test_queue')
+            with open(json_path) as f:
+                report = json.load(f)
+            with open(csv_path) as f:
+                rows = f.read().splitlines()
+
+        self.assertEqual(report['summary']['rss_mb']['peak'], 120)
+        self.assertEqual(len(report['samples']), 2)
+        self.assertEqual(rows[0].split(','), resource_sampler.CSV_FIELDS)
+        self.assertEqual(len(rows), 3)
+
+
+@unittest.skipIf(resource_sampler.psutil is None, 'psutil is not installed')
+class TestResourceSampler(unittest.TestCase):
+    """Tests for sampling a live process tree."""
+
+    def test_samples_process_and_children(self):
+        parent = subprocess.Popen(
+            [sys.executable, '-c',
+             'import subprocess, sys; '
+             'subprocess.run([sys.executable, "-c", "import time; time.sleep(5)"])'])
+        try:
+            sampler = ResourceSampler(parent.pid, interval=0.05).start()
+            time.sleep(0.5)
+            samples = sampler.stop()
+        finally:
+            parent.kill()
+            parent.wait()
+
+        self.assertTrue(samples)
+        last = samples[-1]
+        self.assertEqual(last.processes, 2)
+        self.assertEqual(last.worker_processes, 2)
+        self.assertGreater(last.rss_mb, 0)
+        self.assertGreater(last.threads, 0)
+
+    def test_stops_when_process_exits(self):
+        proc = subprocess.Popen([sys.executable, '-c', 'pass'])
+        proc.wait()
+        sampler = ResourceSampler(proc.pid, interval=0.05).start()
+        self.assertEqual(sampler.stop(), [])
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,79 @@
+# Copyright (c) Microsoft Corporation. All rights reserved.
+# Licensed under the MIT License.
+"""Unit tests for the trigger ResultSink in result_sink.py."""
+
+import json
+import threading
+import time
+import unittest
+import urllib.request
+
+from tests.utils.result_sink import ResultSink
+
+
+def _post(url, payload):
+    req = urllib.request.Request(
+        url, data=json.dumps(payload).encode('utf-8'),
+        headers={'Content-Type': 'application/json'}, method='POST')
+    with urllib.request.urlopen(req, timeout=5) as resp:
+        return resp.status
+
+
+class TestResultSink(unittest.TestCase):
+    """Tests for posting to and waiting on the ResultSink."""
+
+    def setUp(self):
+        self.sink = ResultSink().start()
+
+    def tearDown(self):
+        self.sink.close()
+
+    def test_posted_result_is_returned(self):
+        """A POSTed JSON payload is returned by wait_for."""
+        status = _post(f'{self.sink.url}/queue_trigger', {'body': 'x'})
+        self.assertEqual(status, 204)
+        self.assertEqual(self.sink.wait_for('queue_trigger', timeout=1),
+                         {'body': 'x'})
+
+    def test_wait_for_blocks_until_result_arrives(self):
+        """wait_for wakes up as soon as a matching result is pushed."""
+        def push_later():
+            time.sleep(0.2)
+            _post(f'{self.sink.url}/blob_trigger', {'content': 'new'})
+
+        threading.Thread(target=push_later, daemon=True).start()
+        start = time.monotonic()
+        result = self.sink.wait_for('blob_trigger', timeout=5)
+        self.assertEqual(result, {'content': 'new'})
+        self.assertLess(time.monotonic() - start, 2)
+
+    def test_non_matching_results_are_skipped(self):
+        """Stale results that do not satisfy match are ignored."""
+        self.sink.record('kafka_trigger', 'stale')
+        self.sink.record('kafka_trigger', 'fresh')
+        self.assertEqual(
+            self.sink.wait_for('kafka_trigger',
+                               match=lambda v: v == 'fresh', timeout=1),
+            'fresh')
+
+    def test_timeout_raises(self):
+        """No matching result -> TimeoutError after the timeout."""
+        self.sink.record('servicebus_trigger', {'body': 'other'})
+        with self.assertRaises(TimeoutError):
+            self.sink.wait_for('servicebus_trigger',
+                               match=lambda m: m['body'] == 'mine',
+                               timeout=0.2)
+
+    def test_clear(self):
+        """clear() forgets previously received results."""
+        self.sink.record('a', 1)
+        self.sink.record('b', 2)
+        self.sink.clear('a')
+        self.assertEqual(self.sink.results('a'), [])
+        self.assertEqual(self.sink.results('b'), [2])
+        self.sink.clear()
+        self.assertEqual(self.sink.results('b'), [])
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,82 @@
+# Copyright (c) Microsoft Corporation. All rights reserved.
+# Licensed under the MIT License.
+"""Unit tests for the per-run resource names in run_namespace.py."""
+
+import ast
+import os
+import re
+import unittest
+from unittest import mock
+
+from tests.utils import run_namespace, testutils
+from tests.utils.run_namespace import (
+    RUN_ID,
+    get_run_id,
+    scoped_blob_path,
+    scoped_name,
+)
+
+# Lowercase letters, digits and single dashes: valid for storage queues,
+# blob prefixes, Kafka topics and RabbitMQ queues alike
+NAME_PATTERN = re.compile(r'^[a-z0-9]+(-[a-z0-9]+)*$')
+
+
+class TestRunNamespace(unittest.TestCase):
+
+    def setUp(self):
+        patcher = mock.patch.object(run_namespace, '_run_id', None)
+        patcher.start()
+        self.addCleanup(patcher.stop)
+
+    def _run_id(self, env):
+        run_namespace._run_id = None
+        with mock.patch.dict(os.environ, {'PYTEST_XDIST_WORKER': '', **env}):
+            return get_run_id()
+
+    def test_random_id_is_stable_for_the_process(self):
+        first = self._run_id({RUN_ID: ''})
+        self.assertEqual(get_run_id(), first)
+        self.assertRegex(first, NAME_PATTERN)
+
+    def test_explicit_id_is_sanitized(self):
+        run_id = self._run_id({RUN_ID: 'Build_1234.5'})
+        self.assertEqual(run_id, 'build-1234-5')
+
+    def test_xdist_workers_get_distinct_ids(self):
+        gw0 = self._run_id({RUN_ID: 'ci', 'PYTEST_XDIST_WORKER': 'gw0'})
+        gw1 = self._run_id({RUN_ID: 'ci', 'PYTEST_XDIST_WORKER': 'gw1'})
+        self.assertEqual(gw0, 'ci-gw0')
+        self.assertEqual(gw1, 'ci-gw1')
+
+    def test_scoped_names_match_binding_expressions(self):
+        self._run_id({RUN_ID: 'abc'})
+        self.assertEqual(scoped_name('testqueue'), 'testqueue-abc')
+        self.assertEqual(scoped_blob_path('test-str.txt'),
+                         'bundle-tests/abc/test-str.txt')
+        self.assertRegex(scoped_name('testqueue-return-multiple'),
+                         NAME_PATTERN)
+
+    def test_app_bindings_are_run_scoped(self):
+        # Every app binding that names a blob container, queue or topic
+        # must resolve inside the run's namespace. Service Bus queues are
+        # declared in the emulator's config.json and stay fixed.
+        apps = testutils.TESTS_ROOT / 'emulator_tests'
+        scoped = {'bundle-tests', 'testqueue', 'e2e-'}
+        for app in sorted(apps.glob('*/function_app.py')):
+            fields = {'path', 'queue_name', 'topic', 'queueName'}
+            if app.parent.name == 'servicebus_functions':
+                fields.discard('queue_name')
+            tree = ast.parse(app.read_text(encoding='utf-8'))
+            for node in ast.walk(tree):
+                if not isinstance(node, ast.keyword) or node.arg not in fields:
+                    continue
+                if not isinstance(node.value, ast.Constant):
+                    continue
+                value = node.value.value
+                if any(value.startswith(prefix) for prefix in scoped):
+                    self.assertIn('%RUN_ID%', value,
+                                  f"{app.parent.name}: {node.arg}={value!r}")
+
+
+if __name__ == '__main__':
+    unittest.main()
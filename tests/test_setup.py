@@ -32,6 +32,9 @@ from invoke import task
 ROOT_DIR = pathlib.Path(__file__).parent
 ARTIFACTS_DIR = ROOT_DIR / "artifacts"
 BUILD_DIR = ROOT_DIR / "build"
+# When set, the mock site appends one JSON line per request to this file so
+# host startup profiles can show bundle downloads (see utils/startup_profile.py)
+MOCK_SITE_ACCESS_LOG = "MOCK_SITE_ACCESS_LOG"
 
 
 def extract_core_tools(src_zip, dest_folder):
@@ -303,6 +306,42 @@ class ExtensionBundleHTTPHandler(SimpleHTTPRequestHandler):
         """Log an arbitrary message."""
         print(f"[MockServer] {self.address_string()} - {format % args}")
 
+    def log_request(self, code='-', size='-'):
+        """Remember the response status for the access log."""
+        self._status = code
+        super().log_request(code, size)
+
+    def do_GET(self):
+        """Serve a file and record how long it took."""
+        started = time.time()
+        self._status = None
+        try:
+            super().do_GET()
+        finally:
+            self._write_access_log(started, time.time() - started)
+
+    def _served_size(self):
+        path = self.translate_path(self.path)
+        return os.path.getsize(path) if os.path.isfile(path) else None
+
+    def _write_access_log(self, started, duration):
+        access_log = os.environ.get(MOCK_SITE_ACCESS_LOG)
+        if not access_log:
+            return
+        entry = {
+            "time": started,
+            "duration": round(duration, 6),
+            "path": self.path,
+            "status": int(self._status) if str(self._status).isdigit() else None,
+            "size": self._served_size(),
+        }
+        try:
+            os.makedirs(os.path.dirname(os.path.abspath(access_log)), exist_ok=True)
+            with open(access_log, "a") as f:
+                f.write(json.dumps(entry) + "\n")
+        except OSError as e:
+            print(f"[MockServer] Failed to write access log: {e}", file=sys.stderr)
+
 
 def _start_mock_server(temp_dir, port=3000, _retries=0):
     """Start a mock HTTP server to serve ExtensionBundle files."""
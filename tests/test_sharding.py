@@ -0,0 +1,151 @@
+# Copyright (c) Microsoft Corporation. All rights reserved.
+# Licensed under the MIT License.
+"""Unit tests for the duration store and test group sharding."""
+
+import json
+import pathlib
+import tempfile
+import unittest
+
+from tests.tools.durations import DurationStore, module_of
+from tests.tools.sharding import (
+    build_test_groups,
+    critical_path,
+    load_test_groups,
+    main,
+    pack_lpt,
+)
+
+JUNIT = """<?xml version="1.0" encoding="utf-8"?>
+<testsuites><testsuite name="pytest" tests="4">
+<testcase classname="tests.emulator_tests.test_blob_functions.TestBlobFunctions"
+          name="test_blob_io_str" time="{blob}"/>
+<testcase classname="tests.emulator_tests.test_blob_functions.TestBlobFunctions"
+          name="test_blob_io_bytes" time="1.0"/>
+<testcase classname="tests.emulator_tests.test_kafka_functions.TestKafkaFunctions"
+          name="test_kafka_trigger" time="30.0"><failure message="x"/></testcase>
+<testcase classname="tests.emulator_tests.test_sql_functions.TestSqlFunctions"
+          name="test_sql_output" time="0.0"><skipped message="no odbc"/></testcase>
+</testsuite></testsuites>
+"""
+
+GROUPS = [
+    {'name': 'BasicTests', 'group': 'basic', 'emulators': 'none',
+     'display': 'Basic Tests', 'stopEventHub': 'false', 'perfGate': 'true',
+     'files': 'test_a.py test_b.py test_c.py test_d.py test_e.py'},
+    {'name': 'Kafka', 'group': 'kafka', 'emulators': 'kafka',
+     'display': 'Kafka Tests', 'stopEventHub': 'false',
+     'files': 'test_kafka_functions.py'},
+]
+
+
+class TestDurationStore(unittest.TestCase):
+
+    def setUp(self):
+        self.tmp = tempfile.TemporaryDirectory()
+        self.addCleanup(self.tmp.cleanup)
+        self.dir = pathlib.Path(self.tmp.name)
+
+    def _report(self, name, blob):
+        path = self.dir / name
+        path.write_text(JUNIT.format(blob=blob))
+        return path
+
+    def test_module_of(self):
+        self.assertEqual(
+            module_of('tests.emulator_tests.test_queue_functions.TestQueueFunctions'),
+            'test_queue_functions.py')
+        self.assertEqual(module_of('x.Y', 'tests/emulator_tests/test_x.py'),
+                         'test_x.py')
+        self.assertIsNone(module_of('conftest'))
+
+    def test_ingest_is_idempotent_and_takes_median(self):
+        with DurationStore(self.dir / 'durations.db') as store:
+            self.assertEqual(store.ingest(self._report('a.xml', 9.0)), 4)
+            self.assertEqual(store.ingest(self._report('a.xml', 9.0)), 0)
+            store.ingest(self._report('b.xml', 19.0))
+            store.ingest(self._report('c.xml', 29.0))
+            durations = store.module_durations()
+
+        self.assertEqual(durations['test_blob_functions.py'], 20.0)
+        # Failed tests still took the time; fully skipped modules did not run
+        self.assertEqual(durations['test_kafka_functions.py'], 30.0)
+        self.assertNotIn('test_sql_functions.py', durations)
+
+    def test_history_limits_reports(self):
+        with DurationStore(self.dir / 'durations.db') as store:
+            for index, blob in enumerate((99.0, 8.0, 10.0)):
+                store.ingest(self._report(f'{index}.xml', blob))
+            self.assertEqual(
+                store.module_durations(history=2)['test_blob_functions.py'], 10.0)
+
+
+class TestSharding(unittest.TestCase):
+
+    def test_pack_lpt(self):
+        packed = pack_lpt({'a': 7, 'b': 5, 'c': 4, 'd': 3, 'e': 1}, 2)
+        self.assertEqual(packed, [(10, ['a', 'd']), (10, ['b', 'c', 'e'])])
+
+    def test_pack_lpt_drops_empty_bins(self):
+        self.assertEqual(pack_lpt({'a': 1}, 3), [(1, ['a'])])
+
+    def test_split_only_within_emulator_requirements(self):
+        durations = {'test_a.py': 300, 'test_b.py': 300, 'test_c.py': 200,
+                     'test_d.py': 100, 'test_e.py': 100,
+                     'test_kafka_functions.py': 250}
+        groups = build_test_groups(GROUPS, durations, max_shards=10)
+
+        basic = [g for g in groups if g['emulators'] == 'none']
+        kafka = [g for g in groups if g['emulators'] == 'kafka']
+        self.assertEqual(len(kafka), 1)
+        self.assertEqual(kafka[0]['name'], 'Kafka')
+        self.assertEqual(sorted(m for g in basic for m in g['files'].split()),
+                         ['test_a.py', 'test_b.py', 'test_c.py',
+                          'test_d.py', 'test_e.py'])
+        # Splitting stops once the longest module is alone in its job
+        self.assertEqual(critical_path(groups), 300)
+        # CI conditions and artifact names refer to the group, so it is kept
+        self.assertEqual({g['group'] for g in basic}, {'basic'})
+        self.assertEqual([g['shard'] for g in basic], list(range(1, len(basic) + 1)))
+        self.assertEqual(basic[0]['display'], f'Basic Tests (1/{len(basic)})')
+        self.assertEqual([g.get('perfGate') for g in basic],
+                         ['true'] + [None] * (len(basic) - 1))
+        self.assertNotIn('shard', kafka[0])
+
+    def test_budget_and_overhead_limit_splitting(self):
+        durations = dict.fromkeys(GROUPS[0]['files'].split(), 100)
+        durations['test_kafka_functions.py'] = 100
+
+        self.assertEqual(len(build_test_groups(GROUPS, durations, max_shards=3)), 3)
+        unsplit = build_test_groups(GROUPS, durations, max_shards=10,
+                                    shard_overhead=500)
+        self.assertEqual([g['name'] for g in unsplit], ['BasicTests', 'Kafka'])
+
+    def test_resharding_keeps_base_names(self):
+        durations = dict.fromkeys(GROUPS[0]['files'].split(), 100)
+        split = build_test_groups(GROUPS, durations, max_shards=4)
+        again = build_test_groups(split, durations, max_shards=4)
+        self.assertEqual([g['name'] for g in again],
+                         ['BasicTests1', 'BasicTests2', 'BasicTests3', 'Kafka'])
+        merged = build_test_groups(split, durations, max_shards=2)
+        self.assertEqual(merged[0]['name'], 'BasicTests')
+        self.assertNotIn('shard', merged[0])
+        self.assertEqual(merged[0]['perfGate'], 'true')
+
+    def test_checked_in_config_round_trips(self):
+        groups = load_test_groups()
+        with tempfile.TemporaryDirectory() as tmp:
+            output = pathlib.Path(tmp) / 'test-groups.json'
+            self.assertEqual(main(['--db', str(pathlib.Path(tmp) / 'd.db'),
+                                   'shard', '--output', str(output)]), 0)
+            balanced = json.loads(output.read_text())['testGroups']
+
+        modules = sorted(m for g in groups for m in g['files'].split())
+        self.assertEqual(sorted(m for g in balanced for m in g['files'].split()),
+                         modules)
+        self.assertEqual({(g['emulators'], g['stopEventHub']) for g in balanced},
+                         {(g['emulators'], g['stopEventHub']) for g in groups})
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,97 @@
+# Copyright (c) Microsoft Corporation. All rights reserved.
+# Licensed under the MIT License.
+"""Unit tests for the host startup phase profiler in startup_profile.py."""
+
+import json
+import os
+import tempfile
+import unittest
+
+from tests.utils.host_logs import LogLine
+from tests.utils.startup_profile import build_startup_profile, write_startup_profile
+
+LAUNCHED = 100.0
+LAUNCHED_WALL = 1_700_000_000.0
+
+# (seconds after launch, host output)
+STARTUP_LOG = [
+    (0.5, "Azure Functions Core Tools"),
+    (1.0, "Looking for extension bundle Microsoft.Azure.Functions.ExtensionBundle at /tmp/bundles"),
+    (1.2, "Downloading extension bundle from http://localhost:8000/ExtensionBundles/x.zip to /tmp/x.zip"),
+    (4.2, "Extracting extension bundle at /tmp/bundles/4.20.0"),
+    (5.0, "Zip extraction complete"),
+    (5.1, "Loading extension bundle from /tmp/bundles/4.20.0/bin"),
+    (5.5, "Loading startup extension 'Storage'"),
+    (7.0, "Starting JobHost"),
+    (7.2, "Fetching metadata for workerRuntime: python"),
+    (7.3, "Reading functions metadata (Worker)"),
+    (9.0, "Worker process started and initialized."),
+    (9.5, "3 functions found (Worker)"),
+    (12.0, "Host lock lease acquired by instance ID 'abc'."),
+]
+
+
+def _lines(log=STARTUP_LOG):
+    return [LogLine(seq=i, text=text, received=LAUNCHED + offset)
+            for i, (offset, text) in enumerate(log)]
+
+
+class TestStartupProfile(unittest.TestCase):
+    """Tests for splitting host startup into phases."""
+
+    def test_phases_are_extracted(self):
+        profile = build_startup_profile(_lines(), LAUNCHED, LAUNCHED_WALL,
+                                        ready=LAUNCHED + 10)
+        phases = {p.name: p for p in profile.phases}
+
+        self.assertAlmostEqual(profile.total, 10)
+        self.assertAlmostEqual(profile.first_output, 0.5)
+        self.assertAlmostEqual(phases['bundle_resolution'].duration, 0.2)
+        self.assertAlmostEqual(phases['bundle_download'].duration, 3.0)
+        self.assertAlmostEqual(phases['bundle_extraction'].duration, 0.8)
+        self.assertAlmostEqual(phases['extension_loading'].duration, 1.9)
+        self.assertAlmostEqual(phases['worker_start'].duration, 1.8)
+        self.assertAlmostEqual(phases['function_indexing'].duration, 2.2)
+        self.assertEqual([p.start for p in profile.phases],
+                         sorted(p.start for p in profile.phases))
+
+    def test_unfinished_phase_ends_at_ready(self):
+        profile = build_startup_profile(_lines(STARTUP_LOG[:8]), LAUNCHED,
+                                        LAUNCHED_WALL, ready=LAUNCHED + 8)
+        self.assertNotIn('worker_start', [p.name for p in profile.phases])
+        profile = build_startup_profile(_lines(STARTUP_LOG[:9]), LAUNCHED,
+                                        LAUNCHED_WALL, ready=LAUNCHED + 8)
+        worker, = [p for p in profile.phases if p.name == 'worker_start']
+        self.assertAlmostEqual(worker.end, 8)
+        self.assertIsNone(worker.end_line)
+
+    def test_mock_site_requests_and_trace(self):
+        with tempfile.TemporaryDirectory() as tmp:
+            access_log = os.path.join(tmp, 'access.jsonl')
+            with open(access_log, 'w') as f:
+                for offset, path in [(-5, '/old.zip'), (1.1, '/index.json'),
+                                     (1.3, '/x.zip')]:
+                    f.write(json.dumps({'time': LAUNCHED_WALL + offset,
+                                        'duration': 0.5, 'path': path,
+                                        'status': 200}) + '\n')
+                f.write('{"time": 1')  # partially written line
+
+            profile = build_startup_profile(
+                _lines(), LAUNCHED, LAUNCHED_WALL, ready=LAUNCHED + 10,
+                access_log=access_log, metadata={'name': 'queue_functions'})
+            paths = write_startup_profile(profile, tmp, 'test_queue',
+                                          chrome_trace=True)
+            with open(paths[1]) as f:
+                trace = json.load(f)
+
+        self.assertEqual([r.path for r in profile.requests],
+                         ['/index.json', '/x.zip'])
+        events = [e for e in trace['traceEvents'] if e['ph'] == 'X']
+        self.assertIn('bundle_download', [e['name'] for e in events])
+        download, = [e for e in events if e['name'] == '/x.zip']
+        self.assertEqual(download['ts'], 1_300_000)
+        self.assertEqual(download['dur'], 500_000)
+
+
+if __name__ == "__main__":
+    unittest.main()
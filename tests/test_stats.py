@@ -0,0 +1,32 @@
+# Copyright (c) Microsoft Corporation. All rights reserved.
+# Licensed under the MIT License.
+"""Unit tests for the summary statistics of the benchmark runners."""
+
+import unittest
+
+from tests.benchmarks.stats import bootstrap_ci, describe
+
+
+class TestStats(unittest.TestCase):
+
+    def test_describe(self):
+        stats = describe([1.0, 2.0, 3.0, 4.0, 5.0, 6.0, 7.0, 8.0, 9.0, 100.0])
+        self.assertEqual(stats['n'], 10)
+        self.assertEqual(stats['p50'], 5.5)
+        self.assertEqual(stats['max'], 100.0)
+        low, high = stats['median_ci']
+        self.assertLessEqual(low, 5.5)
+        self.assertGreaterEqual(high, 5.5)
+        # The outlier drags the mean's interval much further than the median's
+        self.assertLess(high, 100.0)
+        self.assertGreater(stats['mean_ci'][1], high)
+        self.assertEqual(describe([]), {'n': 0})
+
+    def test_bootstrap_is_deterministic(self):
+        values = [5.1, 4.8, 5.6, 6.0, 5.2, 4.9, 5.5]
+        self.assertEqual(bootstrap_ci(values), bootstrap_ci(values))
+        self.assertEqual(bootstrap_ci([1.0]), (None, None))
+
+
+if __name__ == '__main__':
+    unittest.main()
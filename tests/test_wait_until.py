@@ -0,0 +1,169 @@
+# Copyright (c) Microsoft Corporation. All rights reserved.
+# Licensed under the MIT License.
+"""Unit tests for wait_until and Backoff in testutils.py.
+
+Tests the condition-based polling that replaces fixed sleeps before
+trigger verification in the emulator tests.
+"""
+
+import importlib.util
+import time
+import unittest
+
+from tests.utils import testutils
+from tests.utils.testutils import Backoff, wait_for_tracked_changes, wait_until
+
+
+class TestBackoff(unittest.TestCase):
+    """Tests for the Backoff delay schedule."""
+
+    def test_delays_grow_and_cap(self):
+        """Delays double until they reach the maximum."""
+        delays = Backoff(initial=0.1, factor=2, maximum=0.5, jitter=0).delays()
+        self.assertEqual([next(delays) for _ in range(5)],
+                         [0.1, 0.2, 0.4, 0.5, 0.5])
+
+    def test_jitter_stays_within_bounds(self):
+        """Jittered delays stay within +/- jitter of the nominal delay."""
+        delays = Backoff(initial=1, factor=1, maximum=1, jitter=0.25).delays()
+        for _ in range(100):
+            self.assertTrue(0.75 <= next(delays) <= 1.25)
+
+
+class TestWaitUntil(unittest.TestCase):
+    """Tests for the wait_until function."""
+
+    def test_returns_immediately_when_condition_holds(self):
+        """Condition already true -> no sleeping at all."""
+        start = time.monotonic()
+        result = wait_until(lambda: 'done', timeout=5)
+        self.assertEqual(result, 'done')
+        self.assertLess(time.monotonic() - start, 0.1)
+
+    def test_returns_early_once_condition_holds(self):
+        """Condition becomes true after a few polls -> returns that value."""
+        calls = []
+
+        def predicate():
+            calls.append(1)
+            return len(calls) if len(calls) >= 3 else None
+
+        start = time.monotonic()
+        result = wait_until(predicate, timeout=5,
+                            backoff=Backoff(initial=0.01, jitter=0))
+        self.assertEqual(result, 3)
+        self.assertLess(time.monotonic() - start, 1)
+
+    def test_timeout_raises(self):
+        """Condition never holds -> TimeoutError after the timeout."""
+        start = time.monotonic()
+        with self.assertRaises(TimeoutError):
+            wait_until(lambda: False, timeout=0.3,
+                       backoff=Backoff(initial=0.05))
+        self.assertGreaterEqual(time.monotonic() - start, 0.3)
+
+    def test_ignored_exceptions_are_retried_and_chained(self):
+        """Ignored exceptions count as 'not yet' and are chained on timeout."""
+        def predicate():
+            raise ValueError('not ready')
+
+        with self.assertRaises(TimeoutError) as ctx:
+            wait_until(predicate, timeout=0.2,
+                       backoff=Backoff(initial=0.05),
+                       ignored_exceptions=(ValueError,))
+        self.assertIsInstance(ctx.exception.__cause__, ValueError)
+
+    def test_unexpected_exceptions_propagate(self):
+        """Exceptions not listed as ignored abort the wait immediately."""
+        def predicate():
+            raise KeyError('boom')
+
+        with self.assertRaises(KeyError):
+            wait_until(predicate, timeout=5)
+
+
+
+class _TrackedChangesHost:
+    """Fake webhost whose gettrackedchanges replies come from a list."""
+
+    def __init__(self, replies):
+        self.replies = list(replies)
+
+    def request(self, meth, funcname, **kwargs):
+        reply = self.replies.pop(0) if len(self.replies) > 1 else self.replies[0]
+        if isinstance(reply, Exception):
+            raise reply
+        return _JsonResponse(reply)
+
+
+class _JsonResponse:
+
+    def __init__(self, body):
+        self.body = body
+
+    def json(self):
+        if isinstance(self.body, Exception):
+            raise self.body
+        return self.body
+
+
+@unittest.skipIf(importlib.util.find_spec('requests') is None,
+                 'requests is not installed')
+class TestWaitForTrackedChanges(unittest.TestCase):
+    """Tests for polling the SQL and MySQL trigger change records."""
+
+    def test_transient_errors_are_retried(self):
+        import requests
+        host = _TrackedChangesHost([
+            requests.exceptions.ConnectionError('not listening'),
+            ValueError('Expecting value'),
+            [{'ProductId': 1, 'Operation': 'Insert'},
+             {'ProductId': 1, 'Operation': 'Update'}],
+        ])
+        changes = wait_for_tracked_changes(host, 1, 'Update', timeout=5)
+        self.assertEqual(changes, [{'ProductId': 1, 'Operation': 'Update'}])
+        self.assertEqual(wait_for_tracked_changes(host, 1, 'Delete', timeout=0.2), [])
+
+    def test_unexpected_errors_propagate(self):
+        host = _TrackedChangesHost([[{'ProductId': 1}]])
+        with self.assertRaises(KeyError):
+            wait_for_tracked_changes(host, 1, 'Insert', timeout=5)
+
+
+
+@unittest.skipIf(importlib.util.find_spec('requests') is None,
+                 'requests is not installed')
+class TestWaitAndRequest(unittest.TestCase):
+    """Tests for polling a function until it returns the expected response."""
+
+    def setUp(self):
+        self.proxy = testutils._WebHostProxy(None, 'http://127.0.0.1:9')
+        self.replies = []
+
+        def request(meth, funcname, *args, **kwargs):
+            reply = self.replies.pop(0) if len(self.replies) > 1 else self.replies[0]
+            if isinstance(reply, Exception):
+                raise reply
+            reply.status_code = 200
+            return reply
+
+        self.proxy.request = request
+
+    def test_transient_errors_are_retried(self):
+        import requests
+        self.replies = [requests.exceptions.ConnectionError('not listening'),
+                        _JsonResponse(ValueError('Expecting value')),
+                        _JsonResponse({'done': True})]
+        response = self.proxy.wait_and_request('GET', 'get_result', wait_time=5,
+                                               until=lambda r: r.json()['done'])
+        self.assertEqual(response.body, {'done': True})
+
+    def test_errors_in_until_propagate(self):
+        self.replies = [_JsonResponse({'status': 'done'})]
+        with self.assertRaises(KeyError):
+            self.proxy.wait_and_request('GET', 'get_result', wait_time=5,
+                                        until=lambda r: r.json()['done'])
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,88 @@
+# Copyright (c) Microsoft Corporation. All rights reserved.
+# Licensed under the MIT License.
+"""Unit tests for cached dependency installation in wheelhouse.py."""
+
+import os
+import pathlib
+import subprocess
+import tempfile
+import unittest
+from unittest import mock
+
+from tests.utils import wheelhouse
+
+
+class _FakePip:
+    """Records pip calls; ``install`` fails until ``download`` has run."""
+
+    def __init__(self):
+        self.calls = []
+        self.downloaded = False
+
+    def __call__(self, command, *args):
+        self.calls.append(command)
+        if command == 'download':
+            self.downloaded = True
+            return
+        if not self.downloaded:
+            raise subprocess.CalledProcessError(1, 'pip install')
+        target = pathlib.Path(args[args.index('--target') + 1])
+        (target / 'pika').mkdir(parents=True)
+        (target / 'pika' / '__init__.py').write_text('VERSION = 1\n')
+
+
+class TestWheelhouse(unittest.TestCase):
+    """Tests for keying, caching and materializing requirement sets."""
+
+    def setUp(self):
+        self._tmp = tempfile.TemporaryDirectory()
+        self.tmp = pathlib.Path(self._tmp.name)
+        self.pip = _FakePip()
+        patcher = mock.patch.object(wheelhouse, '_pip', self.pip)
+        patcher.start()
+        self.addCleanup(patcher.stop)
+        self.addCleanup(self._tmp.cleanup)
+
+    def test_requirements_key(self):
+        key = wheelhouse.requirements_key(['pika', 'azure-eventhub'])
+        self.assertEqual(key, wheelhouse.requirements_key(
+            ['Azure_EventHub', 'pika', 'pika']))
+        self.assertNotEqual(key, wheelhouse.requirements_key(['pika']))
+        self.assertNotEqual(key, wheelhouse.requirements_key(
+            ['pika', 'azure-eventhub'], python_version='3.9'))
+
+    def test_install_downloads_once_and_links(self):
+        app_one, app_two = self.tmp / 'app_one', self.tmp / 'app_two'
+        for app in (app_one, app_two):
+            wheelhouse.install_libraries(app, ['pika'],
+                                         wheelhouse=self.tmp / 'wheels',
+                                         offline=False)
+
+        self.assertEqual(self.pip.calls, ['install', 'download', 'install'])
+        first = app_one / wheelhouse.SITE_PACKAGES / 'pika' / '__init__.py'
+        second = app_two / wheelhouse.SITE_PACKAGES / 'pika' / '__init__.py'
+        self.assertEqual(os.stat(first).st_ino, os.stat(second).st_ino)
+        self.assertFalse(
+            (app_one / wheelhouse.SITE_PACKAGES / '.wheelhouse-complete.json').exists())
+
+    def test_offline_install_requires_wheels(self):
+        with self.assertRaises(RuntimeError):
+            wheelhouse.install_libraries(self.tmp / 'app', ['pika'],
+                                         wheelhouse=self.tmp / 'wheels',
+                                         offline=True)
+        self.assertEqual(self.pip.calls, ['install'])
+        self.assertEqual(list((self.tmp / 'wheels' / 'installed').iterdir()), [])
+
+    def test_materialize_copies_when_links_fail(self):
+        source = self.tmp / 'source'
+        (source / 'pkg').mkdir(parents=True)
+        (source / 'pkg' / 'mod.py').write_text('x = 1\n')
+        with mock.patch.object(wheelhouse.os, 'link', side_effect=OSError):
+            linked, copied = wheelhouse.materialize(source, self.tmp / 'target')
+        self.assertEqual((linked, copied), (0, 1))
+        self.assertEqual((self.tmp / 'target' / 'pkg' / 'mod.py').read_text(),
+                         'x = 1\n')
+
+
+if __name__ == "__main__":
+    unittest.main()
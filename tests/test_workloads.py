@@ -0,0 +1,58 @@
+# Copyright (c) Microsoft Corporation. All rights reserved.
+# Licensed under the MIT License.
+"""Unit tests for the benchmark workloads in tests/benchmarks/workloads.py."""
+
+import unittest
+
+from tests.benchmarks.workloads import summarize_eventhub_drain, summarize_queue_drain
+
+
+class TestQueueDrain(unittest.TestCase):
+    """Tests for the queue_drain workload's summary."""
+
+    def test_summarize(self):
+        reports = [{'seq': seq, 'sent': 100.0 + seq * 0.01, 'dequeue_count': 1,
+                    'triggered': 100.5 + seq * 0.1} for seq in range(10)]
+        # A redelivery of message 3 after its visibility timeout
+        reports.append({'seq': 3, 'sent': 100.03, 'triggered': 140.0, 'dequeue_count': 2})
+        summary = summarize_queue_drain(reports, messages=12, enqueue_elapsed=0.1)
+        self.assertEqual(summary['drained'], 10)
+        self.assertEqual(summary['redelivered'], 1)
+        self.assertEqual(summary['enqueue_per_s'], 120.0)
+        # From the first send until the last first delivery
+        self.assertEqual(summary['drain_s'], 1.4)
+        self.assertEqual(summary['latency_max_ms'], 1310.0)
+        self.assertLess(summary['latency_p50_ms'], summary['latency_p95_ms'])
+
+    def test_summarize_nothing_drained(self):
+        summary = summarize_queue_drain([], messages=5, enqueue_elapsed=0.5)
+        self.assertEqual(summary['drained'], 0)
+        self.assertIsNone(summary['drain_per_s'])
+        self.assertIsNone(summary['latency_p50_ms'])
+
+
+class TestEventHubDrain(unittest.TestCase):
+    """Tests for the eventhub_drain workload's summary."""
+
+    def test_summarize(self):
+        reports = [
+            {'triggered': 101.0, 'size': 3, 'events': [[0, 100.0], [1, 100.0], [2, 100.0]]},
+            # A batch that also held two events of an earlier run
+            {'triggered': 101.5, 'size': 4, 'events': [[3, 100.2], [4, 100.2]]},
+            {'triggered': 102.0, 'size': 3, 'events': [[5, 100.4], [1, 100.0]]},
+        ]
+        summary = summarize_eventhub_drain(reports, events=6, send_elapsed=0.4)
+        self.assertEqual(summary['drained'], 6)
+        self.assertEqual(summary['redelivered'], 1)
+        self.assertEqual(summary['send_per_s'], 15.0)
+        self.assertEqual(summary['drain_s'], 2.0)
+        self.assertEqual(summary['drain_per_s'], 3.0)
+        self.assertEqual(summary['batches'], 3)
+        self.assertEqual(summary['batch_size_histogram'], {3: 2, 4: 1})
+        self.assertEqual(summary['batch_size_max'], 4)
+        self.assertEqual(summary['latency_max_ms'], 1600.0)
+        self.assertEqual(summary['latency_p50_ms'], 1150.0)
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,165 @@
+# Copyright (c) Microsoft Corporation. All rights reserved.
+# Licensed under the MIT License.
+"""Static index of the bindings each emulator test function app uses.
+
+Every ``tests/emulator_tests/<app>/function_app.py`` is parsed with
+``ast`` (never imported, so the app's dependencies need not be installed)
+and each ``@app.<decorator>(...)`` is mapped to the binding type it
+declares, in the lowercase form used by the ``bindings`` lists of
+``extensions.json``. ``generic_*`` decorators declare their type in the
+``type=`` argument.
+
+Test modules are linked to the apps they start through the app folder
+names they mention (``EMULATOR_TESTS_FOLDER / 'blob_functions'``).
+"""
+
+import ast
+import dataclasses
+import pathlib
+from typing import Dict, List, Tuple
+
+EMULATOR_TESTS_ROOT = pathlib.Path(__file__).parent.parent / 'emulator_tests'
+
+# Decorator name -> binding type
+DECORATOR_BINDINGS = {
+    'route': 'httptrigger',
+    'timer_trigger': 'timertrigger',
+    'schedule': 'timertrigger',
+    'warm_up_trigger': 'warmuptrigger',
+    'blob_trigger': 'blobtrigger',
+    'blob_input': 'blob',
+    'blob_output': 'blob',
+    'queue_trigger': 'queuetrigger',
+    'queue_output': 'queue',
+    'table_input': 'table',
+    'table_output': 'table',
+    'service_bus_queue_trigger': 'servicebustrigger',
+    'service_bus_topic_trigger': 'servicebustrigger',
+    'service_bus_queue_output': 'servicebus',
+    'service_bus_topic_output': 'servicebus',
+    'event_hub_message_trigger': 'eventhubtrigger',
+    'event_hub_output': 'eventhub',
+    'event_grid_trigger': 'eventgridtrigger',
+    'event_grid_output': 'eventgrid',
+    'cosmos_db_trigger': 'cosmosdbtrigger',
+    'cosmos_db_input': 'cosmosdb',
+    'cosmos_db_output': 'cosmosdb',
+    'kafka_trigger': 'kafkatrigger',
+    'kafka_output': 'kafka',
+    'sql_trigger': 'sqltrigger',
+    'sql_input': 'sql',
+    'sql_output': 'sql',
+    'mysql_trigger': 'mysqltrigger',
+    'mysql_input': 'mysql',
+    'mysql_output': 'mysql',
+    'orchestration_trigger': 'orchestrationtrigger',
+    'activity_trigger': 'activitytrigger',
+    'entity_trigger': 'entitytrigger',
+    'durable_client_input': 'durableclient',
+    'mcp_tool_trigger': 'mcptooltrigger',
+    # Fabric user data functions (fabric.functions.UserDataFunctions)
+    'function': 'httptrigger',
+    'connection': 'fabricitem',
+    'context': 'userdatafunctioncontext',
+}
+# Decorators that configure a function without adding a binding
+NON_BINDING_DECORATORS = {'function_name', 'http_type', 'retry', 'app_script_file'}
+# Implemented by the host itself rather than a bundle extension
+BUILTIN_BINDINGS = {'http', 'httptrigger', 'timertrigger', 'warmuptrigger'}
+
+
+@dataclasses.dataclass
+class AppBindings:
+    """Bindings declared by one function app."""
+    name: str
+    path: pathlib.Path
+    # Binding type -> (function name, line) of each use
+    bindings: Dict[str, List[Tuple[str, int]]] = dataclasses.field(default_factory=dict)
+    # Decorators the index does not recognize, as (decorator, line)
+    unknown: List[Tuple[str, int]] = dataclasses.field(default_factory=list)
+
+    @property
+    def binding_types(self):
+        return set(self.bindings)
+
+
+def _generic_type(call):
+    for keyword in call.keywords:
+        if keyword.arg == 'type' and isinstance(keyword.value, ast.Constant):
+            return str(keyword.value.value).lower()
+    return None
+
+
+def _function_name(node):
+    for decorator in node.decorator_list:
+        if (isinstance(decorator, ast.Call)
+                and isinstance(decorator.func, ast.Attribute)
+                and decorator.func.attr == 'function_name'):
+            for arg in [*decorator.args, *(k.value for k in decorator.keywords
+                                           if k.arg == 'name')]:
+                if isinstance(arg, ast.Constant):
+                    return arg.value
+    return node.name
+
+
+def binding_of(decorator):
+    """Return ``(decorator name, binding type)`` for an ``@x.<name>`` node.
+
+    The binding type is None for decorators that are not bindings and for
+    unrecognized ones; the decorator name is None for anything that is
+    not an attribute decorator.
+    """
+    call = decorator if isinstance(decorator, ast.Call) else None
+    target = call.func if call else decorator
+    if not isinstance(target, ast.Attribute):
+        return None, None
+    name = target.attr
+    if name.startswith('generic_'):
+        return name, _generic_type(call) if call else None
+    return name, DECORATOR_BINDINGS.get(name)
+
+
+def index_app(path):
+    """Parse one ``function_app.py`` and return its AppBindings."""
+    path = pathlib.Path(path)
+    app = AppBindings(name=path.parent.name, path=path)
+    tree = ast.parse(path.read_text(encoding='utf-8'), filename=str(path))
+    for node in ast.walk(tree):
+        if not isinstance(node, (ast.FunctionDef, ast.AsyncFunctionDef)):
+            continue
+        function = None
+        for decorator in node.decorator_list:
+            name, binding = binding_of(decorator)
+            if name is None or name in NON_BINDING_DECORATORS:
+                continue
+            if binding is None:
+                app.unknown.append((name, decorator.lineno))
+                continue
+            function = function or _function_name(node)
+            app.bindings.setdefault(binding, []).append((function, decorator.lineno))
+    return app
+
+
+def index_apps(root=None):
+    """Return ``{app name: AppBindings}`` for every app under ``root``."""
+    root = pathlib.Path(root or EMULATOR_TESTS_ROOT)
+    return {path.parent.name: index_app(path)
+            for path in sorted(root.glob('*/function_app.py'))}
+
+
+def index_test_modules(root=None, app_names=None):
+    """Return ``{test module file: [app names]}`` for the test modules.
+
+    A module uses an app if it contains a string constant equal to the
+    app's folder name.
+    """
+    root = pathlib.Path(root or EMULATOR_TESTS_ROOT)
+    if app_names is None:
+        app_names = set(index_apps(root))
+    modules = {}
+    for path in sorted(root.glob('test_*.py')):
+        tree = ast.parse(path.read_text(encoding='utf-8'), filename=str(path))
+        used = {node.value for node in ast.walk(tree)
+                if isinstance(node, ast.Constant) and node.value in app_names}
+        modules[path.name] = sorted(used)
+    return modules
@@ -0,0 +1,248 @@
+# Copyright (c) Microsoft Corporation. All rights reserved.
+# Licensed under the MIT License.
+"""Diff two extension bundle zips without extracting them.
+
+Entries are matched by path and compared by the CRC-32 and size recorded
+in the zip central directory, which settles almost every entry for free:
+
+* a different size or CRC-32 means the file changed;
+* the same size and CRC-32 is very likely the same file, but a CRC-32 is
+  not a content hash. Those entries are reported as unchanged unless
+  ``--verify`` is given: the entries it selects (``assemblies`` or
+  ``all``) are streamed through SHA-256 on a thread pool, both archives
+  at once.
+
+A file that disappears from one folder and appears with the same name,
+CRC-32 and size in another is reported as moved. The result is grouped by
+the extension each file belongs to (see bundle_footprint.py)::
+
+    python -m tests.tools.bundle_diff old.zip new.zip --verify assemblies \\
+        --output diff.json
+"""
+
+import argparse
+import collections
+import concurrent.futures
+import dataclasses
+import hashlib
+import json
+import logging
+import os
+import pathlib
+import sys
+import threading
+import zipfile
+from typing import Dict, List
+
+from tests.tools.bundle_footprint import (
+    BUNDLE_FILES,
+    attribute,
+    bin_root,
+    read_central_directory,
+    read_deps,
+)
+from tests.tools.bundle_manifest import get_bundle_metadata
+
+VERIFY_CHOICES = ('none', 'assemblies', 'all')
+CHUNK_SIZE = 1 << 20
+
+
+@dataclasses.dataclass
+class FileChange:
+    path: str
+    change: str  # 'added', 'removed', 'changed' or 'moved'
+    owner: str
+    old_size: int = 0
+    new_size: int = 0
+    # Old path of a moved file; how a change was detected ('size', 'crc', 'sha256')
+    detail: str = ''
+
+    def to_dict(self):
+        return {'path': self.path, 'change': self.change, 'oldSize': self.old_size,
+                'newSize': self.new_size, 'delta': self.new_size - self.old_size,
+                **({'detail': self.detail} if self.detail else {})}
+
+
+class _MemberHasher:
+    """SHA-256 of zip members, with one open ZipFile per thread and archive.
+
+    ZipFile objects must not be read from several threads at once.
+    """
+
+    def __init__(self):
+        self._local = threading.local()
+        self._lock = threading.Lock()
+        self._opened: List[zipfile.ZipFile] = []
+
+    def _zip(self, path):
+        archives = self._local.__dict__.setdefault('archives', {})
+        if path not in archives:
+            archives[path] = zipfile.ZipFile(path)
+            with self._lock:
+                self._opened.append(archives[path])
+        return archives[path]
+
+    def __call__(self, path, member):
+        digest = hashlib.sha256()
+        with self._zip(path).open(member) as f:
+            for chunk in iter(lambda: f.read(CHUNK_SIZE), b''):
+                digest.update(chunk)
+        return digest.hexdigest()
+
+    def close(self):
+        with self._lock:
+            for archive in self._opened:
+                archive.close()
+            self._opened.clear()
+
+
+def hash_members(pairs, workers=None):
+    """Hash ``(zip path, member)`` pairs concurrently.
+
+    Returns:
+        ``{(zip path, member): sha256 hex digest}``.
+    """
+    pairs = list(pairs)
+    if not pairs:
+        return {}
+    hasher = _MemberHasher()
+    try:
+        with concurrent.futures.ThreadPoolExecutor(workers or min(8, os.cpu_count() or 1)) as pool:
+            return dict(zip(pairs, pool.map(lambda pair: hasher(*pair), pairs)))
+    finally:
+        hasher.close()
+
+
+def _needs_verify(path, verify):
+    return verify == 'all' or (verify == 'assemblies' and path.lower().endswith('.dll'))
+
+
+def _owners(zip_path, entries, metadata):
+    roots = sorted({root for root in (bin_root(e.path) for e in entries) if root})
+    return attribute(entries, metadata, read_deps(zip_path, roots))
+
+
+def diff_bundles(old_zip, new_zip, metadata=None, verify='none', workers=None):
+    """Return the FileChanges between two bundle zips, sorted by path.
+
+    Args:
+        old_zip: Path of the old bundle.
+        new_zip: Path of the new bundle.
+        metadata: BundleMetadata used to attribute files to extensions
+            (default: the working tree's).
+        verify: Which entries with equal CRC-32 and size to confirm by
+            SHA-256: 'none' (the default), 'assemblies' or 'all'.
+        workers: Hashing threads (default: up to 8).
+    """
+    if verify not in VERIFY_CHOICES:
+        raise ValueError(f"Unknown verify mode '{verify}'. "
+                         f"Valid modes: {', '.join(VERIFY_CHOICES)}")
+    metadata = metadata or get_bundle_metadata()
+    old_entries = {e.path: e for e in read_central_directory(old_zip)}
+    new_entries = {e.path: e for e in read_central_directory(new_zip)}
+    old_owners = _owners(old_zip, list(old_entries.values()), metadata)
+    new_owners = _owners(new_zip, list(new_entries.values()), metadata)
+
+    changes = []
+    ambiguous = []
+    for path in old_entries.keys() & new_entries.keys():
+        old, new = old_entries[path], new_entries[path]
+        if old.uncompressed != new.uncompressed or old.crc != new.crc:
+            changes.append(FileChange(path, 'changed', new_owners[path], old.uncompressed,
+                                      new.uncompressed,
+                                      'size' if old.uncompressed != new.uncompressed else 'crc'))
+        elif _needs_verify(path, verify):
+            ambiguous.append(path)
+
+    digests = hash_members([(old_zip, p) for p in ambiguous] + [(new_zip, p) for p in ambiguous],
+                           workers)
+    for path in ambiguous:
+        if digests[(old_zip, path)] != digests[(new_zip, path)]:
+            size = new_entries[path].uncompressed
+            changes.append(FileChange(path, 'changed', new_owners[path], size, size, 'sha256'))
+
+    # Pair removed and added files that only changed folder
+    removed = {}
+    for path in old_entries.keys() - new_entries.keys():
+        entry = old_entries[path]
+        removed.setdefault((entry.name, entry.crc, entry.uncompressed), []).append(path)
+    for path in new_entries.keys() - old_entries.keys():
+        entry = new_entries[path]
+        candidates = removed.get((entry.name, entry.crc, entry.uncompressed))
+        if candidates:
+            changes.append(FileChange(path, 'moved', new_owners[path], entry.uncompressed,
+                                      entry.uncompressed, candidates.pop()))
+        else:
+            changes.append(FileChange(path, 'added', new_owners[path],
+                                      new_size=entry.uncompressed))
+    for paths in removed.values():
+        changes.extend(FileChange(path, 'removed', old_owners[path],
+                                  old_size=old_entries[path].uncompressed)
+                       for path in paths)
+    return sorted(changes, key=lambda c: c.path)
+
+
+def group_by_owner(changes, metadata=None):
+    """Return the changes grouped by owner, owners with the most changes first.
+
+    Returns:
+        ``[{'owner', 'name', 'added': [...], 'removed': [...], ...,
+        'delta'}]`` where the lists hold FileChange.to_dict() results.
+    """
+    groups: Dict[str, dict] = collections.OrderedDict()
+    for change in changes:
+        group = groups.setdefault(change.owner, {
+            'owner': change.owner, 'name': change.owner, 'added': [], 'removed': [],
+            'changed': [], 'moved': [], 'delta': 0})
+        extension = metadata.extension(change.owner) if metadata else None
+        if extension:
+            group['name'] = extension['name']
+        group[change.change].append(change.to_dict())
+        group['delta'] += change.new_size - change.old_size
+
+    def size(group):
+        return sum(len(group[kind]) for kind in ('added', 'removed', 'changed', 'moved'))
+    return sorted(groups.values(), key=lambda g: (-size(g), g['owner'] == BUNDLE_FILES,
+                                                   g['owner']))
+
+
+def summarize(changes):
+    counts = collections.Counter(change.change for change in changes)
+    return {kind: counts.get(kind, 0) for kind in ('added', 'removed', 'changed', 'moved')}
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument('old', help='Old bundle zip')
+    parser.add_argument('new', help='New bundle zip')
+    parser.add_argument('--verify', choices=VERIFY_CHOICES, default='none',
+                        help='Entries with equal CRC-32 and size to confirm by SHA-256 '
+                             '(default: none)')
+    parser.add_argument('--workers', type=int, default=None, help='Hashing threads')
+    parser.add_argument('--output', help='Write the JSON report here instead of stdout')
+    args = parser.parse_args(argv)
+    logging.basicConfig(level=logging.INFO, format='%(message)s')
+
+    metadata = get_bundle_metadata()
+    changes = diff_bundles(args.old, args.new, metadata, args.verify, args.workers)
+    groups = group_by_owner(changes, metadata)
+    for group in groups:
+        logging.info(f"{group['name']} ({group['delta']:+,} bytes)")
+        for kind in ('added', 'removed', 'changed', 'moved'):
+            for change in group[kind]:
+                logging.info(f"  {kind:<8} {change['path']}")
+    summary = summarize(changes)
+    logging.info(', '.join(f"{count} {kind}" for kind, count in summary.items()))
+
+    output = json.dumps({'old': pathlib.PurePath(args.old).name,
+                         'new': pathlib.PurePath(args.new).name,
+                         'summary': summary, 'extensions': groups}, indent=2)
+    if args.output:
+        pathlib.Path(args.output).write_text(output)
+    else:
+        print(output)
+    return 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
@@ -0,0 +1,408 @@
+# Copyright (c) Microsoft Corporation. All rights reserved.
+# Licensed under the MIT License.
+"""Break down the size of built extension bundle zips.
+
+Every file of a bundle is extracted on a cold-starting app, so bundle
+size and assembly count are startup cost. For each
+``Microsoft.Azure.Functions.ExtensionBundle.*.zip`` in the artifacts
+directory the analyzer reports:
+
+* the compressed and uncompressed bytes of every extension in
+  ``extensions.json``, plus assemblies several extensions depend on
+  (``(shared)``), assemblies no extension pulls in (``(unattributed)``)
+  and the files outside the ``bin`` folders (``(bundle files)``);
+* duplicate assemblies: the same file name with the same CRC-32 and size
+  stored more than once (typically in ``bin`` and each ``bin_v3/<rid>``),
+  and what storing each once would save;
+* the bytes of ``runtimes/<rid>`` assets for other platforms, i.e. what
+  the Windows/Linux split saves over the portable (any-any) bundle.
+
+Sizes and checksums come from the zip central directory; the only member
+read is ``extensions.deps.json``, which maps the assemblies to the
+packages that need them. Without it, only an extension's own assembly is
+attributed to it. Run after building the bundles::
+
+    python -m tests.tools.bundle_footprint --output footprint
+
+and keep ``footprint.json``/``footprint.csv`` to track growth between
+releases.
+"""
+
+import argparse
+import collections
+import csv
+import dataclasses
+import json
+import logging
+import os
+import pathlib
+import posixpath
+import re
+import sys
+import zipfile
+from typing import Dict, Optional
+
+from tests.tools.bundle_manifest import PROJECT_ROOT, BundleMetadata, get_bundle_metadata
+
+DEFAULT_ARTIFACTS_DIR = PROJECT_ROOT / 'artifacts'
+DEFAULT_BUNDLE_ID = 'Microsoft.Azure.Functions.ExtensionBundle'
+DEPS_JSON = 'extensions.deps.json'
+
+SHARED = '(shared)'
+UNATTRIBUTED = '(unattributed)'
+BUNDLE_FILES = '(bundle files)'
+
+# Bundle flavor (zip name suffix) -> platform whose hosts load it; None: any
+FLAVOR_PLATFORMS = {'base': None, 'any-any': None, 'win-any': 'windows', 'linux-x64': 'linux'}
+PLATFORMS = ('windows', 'linux')
+
+CSV_FIELDS = ['bundle', 'version', 'flavor', 'owner', 'name', 'files',
+              'compressed', 'uncompressed']
+
+
+@dataclasses.dataclass(frozen=True)
+class ZipEntry:
+    path: str
+    crc: int
+    compressed: int
+    uncompressed: int
+
+    @property
+    def name(self):
+        return posixpath.basename(self.path)
+
+    @property
+    def is_assembly(self):
+        return self.path.lower().endswith('.dll')
+
+
+def read_central_directory(zip_path):
+    """Return the ZipEntry of every file in ``zip_path``.
+
+    zipfile only parses the central directory when it opens an archive;
+    no member is decompressed.
+    """
+    with zipfile.ZipFile(zip_path) as zf:
+        return [ZipEntry(info.filename, info.CRC, info.compress_size, info.file_size)
+                for info in zf.infolist() if not info.is_dir()]
+
+
+def bin_root(path):
+    """Return the binaries folder ``path`` is in (``bin``, ``bin_v3/win-x64``), or None."""
+    parts = path.split('/')
+    if parts[0] == 'bin' and len(parts) > 1:
+        return 'bin'
+    if parts[0] == 'bin_v3' and len(parts) > 2:
+        return f'bin_v3/{parts[1]}'
+    return None
+
+
+def runtime_platform(path):
+    """Return the platform of a ``runtimes/<rid>/`` asset, or None for other files.
+
+    Returns:
+        'windows', 'linux' or 'other' (macOS, mobile, ...).
+    """
+    parts = path.lower().split('/')
+    if 'runtimes' not in parts[:-2]:
+        return None
+    rid = parts[parts.index('runtimes') + 1]
+    if rid.startswith('win'):
+        return 'windows'
+    if rid.startswith(('linux', 'unix', 'alpine')):
+        return 'linux'
+    return 'other'
+
+
+def _published_paths(library):
+    """Return where ``dotnet publish`` puts a deps.json library's assets."""
+    for group in ('runtime', 'native'):
+        for asset in library.get(group, {}):
+            yield posixpath.basename(asset)
+    for asset in library.get('runtimeTargets', {}):
+        yield asset
+    for asset, info in library.get('resources', {}).items():
+        yield f"{info.get('locale', '')}/{posixpath.basename(asset)}".lstrip('/')
+
+
+def deps_owners(deps, package_ids):
+    """Map the files a deps.json publishes to the extension packages needing them.
+
+    Args:
+        deps: Parsed ``extensions.deps.json``.
+        package_ids: Package ids of the bundle's extensions.
+
+    Returns:
+        ``{lowercase path relative to the bin folder: {package id, ...}}``.
+    """
+    dependencies = collections.defaultdict(set)
+    assets = collections.defaultdict(set)
+    for target in deps.get('targets', {}).values():
+        for key, library in target.items():
+            name = key.partition('/')[0].lower()
+            dependencies[name].update(d.lower() for d in library.get('dependencies', {}))
+            assets[name].update(p.lower() for p in _published_paths(library))
+
+    owners = collections.defaultdict(set)
+    for package_id in package_ids:
+        seen, stack = set(), [package_id.lower()]
+        while stack:
+            name = stack.pop()
+            if name in seen:
+                continue
+            seen.add(name)
+            stack.extend(dependencies.get(name, ()))
+            for path in assets.get(name, ()):
+                owners[path].add(package_id)
+    return owners
+
+
+def read_deps(zip_path, roots):
+    """Return ``{bin root: parsed extensions.deps.json}`` for the roots that have one."""
+    deps = {}
+    with zipfile.ZipFile(zip_path) as zf:
+        names = set(zf.namelist())
+        for root in roots:
+            if f'{root}/{DEPS_JSON}' in names:
+                deps[root] = json.loads(zf.read(f'{root}/{DEPS_JSON}').decode('utf-8-sig'))
+    return deps
+
+
+def attribute(entries, metadata, deps_by_root=None):
+    """Return the owner of every entry: a package id or a pseudo-owner.
+
+    Args:
+        entries: ZipEntry list of one bundle.
+        metadata: BundleMetadata the bundle was built from.
+        deps_by_root: ``{bin root: parsed extensions.deps.json}``.
+    """
+    package_ids = [e['id'] for e in metadata.extensions]
+    by_stem = {package_id.lower(): package_id for package_id in package_ids}
+    owners_by_root = {root: deps_owners(deps, package_ids)
+                      for root, deps in (deps_by_root or {}).items()}
+
+    result = {}
+    for entry in entries:
+        root = bin_root(entry.path)
+        if root is None:
+            result[entry.path] = BUNDLE_FILES
+            continue
+        relative = entry.path[len(root) + 1:].lower()
+        owners = owners_by_root.get(root, {}).get(relative, set())
+        if len(owners) > 1:
+            result[entry.path] = SHARED
+        elif owners:
+            result[entry.path] = next(iter(owners))
+        elif entry.is_assembly and relative[:-4] in by_stem:
+            result[entry.path] = by_stem[relative[:-4]]
+        else:
+            result[entry.path] = UNATTRIBUTED
+    return result
+
+
+def find_duplicates(entries, owners=None):
+    """Return the assemblies stored more than once, largest savings first.
+
+    Copies match when the file name (any case), CRC-32 and size agree.
+    """
+    groups = collections.defaultdict(list)
+    for entry in entries:
+        if entry.is_assembly:
+            groups[(entry.name.lower(), entry.crc, entry.uncompressed)].append(entry)
+    duplicates = []
+    for (_, crc, size), copies in groups.items():
+        if len(copies) < 2:
+            continue
+        copies.sort(key=lambda e: e.compressed)
+        duplicates.append({
+            'name': copies[0].name,
+            'crc': f'{crc:08x}',
+            'size': size,
+            'copies': len(copies),
+            'paths': sorted(e.path for e in copies),
+            'owners': sorted({(owners or {}).get(e.path, UNATTRIBUTED) for e in copies}),
+            # Keep the smallest copy
+            'savedCompressed': sum(e.compressed for e in copies[1:]),
+            'savedUncompressed': size * (len(copies) - 1),
+        })
+    duplicates.sort(key=lambda d: (-d['savedCompressed'], d['name']))
+    return duplicates
+
+
+def foreign_runtime_bytes(entries):
+    """Return, per platform, the bytes of ``runtimes/<rid>`` assets it never loads."""
+    foreign = {platform: {'files': 0, 'compressed': 0, 'uncompressed': 0}
+               for platform in PLATFORMS}
+    for entry in entries:
+        asset_platform = runtime_platform(entry.path)
+        if asset_platform is None:
+            continue
+        for platform in PLATFORMS:
+            if asset_platform != platform:
+                foreign[platform]['files'] += 1
+                foreign[platform]['compressed'] += entry.compressed
+                foreign[platform]['uncompressed'] += entry.uncompressed
+    return foreign
+
+
+def parse_bundle_name(zip_path, bundle_id=DEFAULT_BUNDLE_ID):
+    """Split ``<bundle id>.<version>[_<flavor>].zip`` into (version, flavor).
+
+    Returns:
+        ``(version, flavor)`` with flavor 'base' for the unsuffixed zip, or
+        None if the file is not a bundle zip.
+    """
+    match = re.fullmatch(rf'{re.escape(bundle_id)}\.(\d[^_]*)(?:_(.+))?\.zip',
+                         pathlib.PurePath(zip_path).name)
+    if match is None:
+        return None
+    return match.group(1), match.group(2) or 'base'
+
+
+def analyze_bundle(zip_path, metadata, bundle_id=DEFAULT_BUNDLE_ID):
+    """Return the footprint report of one bundle zip."""
+    version, flavor = parse_bundle_name(zip_path, bundle_id) or (None, None)
+    entries = read_central_directory(zip_path)
+    paths = {entry.path for entry in entries}
+    roots = sorted({root for root in map(bin_root, paths) if root})
+    owners = attribute(entries, metadata, read_deps(zip_path, roots))
+
+    by_owner: Dict[str, Dict[str, int]] = collections.defaultdict(
+        lambda: {'files': 0, 'compressed': 0, 'uncompressed': 0})
+    for entry in entries:
+        totals = by_owner[owners[entry.path]]
+        totals['files'] += 1
+        totals['compressed'] += entry.compressed
+        totals['uncompressed'] += entry.uncompressed
+
+    duplicates = find_duplicates(entries, owners)
+    platform = FLAVOR_PLATFORMS.get(flavor)
+    foreign = foreign_runtime_bytes(entries)
+    extensions = []
+    for owner, totals in sorted(by_owner.items(), key=lambda o: (-o[1]['compressed'], o[0])):
+        extension = metadata.extension(owner)
+        extensions.append({'owner': owner,
+                           'name': extension['name'] if extension else owner,
+                           **totals})
+    return {
+        'file': pathlib.PurePath(zip_path).name,
+        'version': version,
+        'flavor': flavor,
+        'platform': platform,
+        'files': len(entries),
+        'assemblies': sum(e.is_assembly for e in entries),
+        'compressed': sum(e.compressed for e in entries),
+        'uncompressed': sum(e.uncompressed for e in entries),
+        'depsJson': bool(roots) and all(f'{root}/{DEPS_JSON}' in paths for root in roots),
+        'extensions': extensions,
+        'duplicates': duplicates,
+        'dedupSavings': {
+            'compressed': sum(d['savedCompressed'] for d in duplicates),
+            'uncompressed': sum(d['savedUncompressed'] for d in duplicates),
+        },
+        # Portable bundles: what a platform-specific bundle would leave out.
+        # Platform bundles: assets for other platforms still shipped.
+        'foreignRuntimes': foreign if platform is None else {platform: foreign[platform]},
+    }
+
+
+def split_savings(bundles):
+    """Compare each platform bundle with the portable one of the same version.
+
+    Returns:
+        ``[{'version', 'flavor', 'compressed', 'savedCompressed',
+        'savedUncompressed'}]``; savings are relative to any-any and
+        negative when the platform bundle is larger.
+    """
+    portable = {b['version']: b for b in bundles if b['flavor'] == 'any-any'}
+    result = []
+    for bundle in bundles:
+        base = portable.get(bundle['version'])
+        if base is None or bundle is base or bundle['platform'] is None:
+            continue
+        result.append({
+            'version': bundle['version'],
+            'flavor': bundle['flavor'],
+            'compressed': bundle['compressed'],
+            'savedCompressed': base['compressed'] - bundle['compressed'],
+            'savedUncompressed': base['uncompressed'] - bundle['uncompressed'],
+        })
+    return result
+
+
+def find_bundles(directory=DEFAULT_ARTIFACTS_DIR, bundle_id=DEFAULT_BUNDLE_ID):
+    return sorted(path for path in pathlib.Path(directory).glob(f'{bundle_id}.*.zip')
+                  if parse_bundle_name(path, bundle_id))
+
+
+def analyze(zip_paths, metadata: Optional[BundleMetadata] = None):
+    """Return the footprint report of ``zip_paths``."""
+    metadata = metadata or get_bundle_metadata()
+    bundle_id = metadata.bundle_id or DEFAULT_BUNDLE_ID
+    bundles = [analyze_bundle(path, metadata, bundle_id) for path in zip_paths]
+    return {'bundleId': bundle_id, 'bundles': bundles, 'split': split_savings(bundles)}
+
+
+def write_report(report, directory, name='footprint'):
+    """Write ``<name>.json`` and a per-owner ``<name>.csv`` into ``directory``.
+
+    Returns:
+        The paths of the JSON and CSV files.
+    """
+    directory = pathlib.Path(directory)
+    os.makedirs(directory, exist_ok=True)
+
+    json_path = directory / f'{name}.json'
+    with open(json_path, 'w') as f:
+        json.dump(report, f, indent=2)
+
+    csv_path = directory / f'{name}.csv'
+    with open(csv_path, 'w', newline='') as f:
+        writer = csv.DictWriter(f, fieldnames=CSV_FIELDS)
+        writer.writeheader()
+        for bundle in report['bundles']:
+            for extension in bundle['extensions']:
+                writer.writerow({'bundle': bundle['file'], 'version': bundle['version'],
+                                 'flavor': bundle['flavor'], **extension})
+    return json_path, csv_path
+
+
+def _summarize(report):
+    for bundle in report['bundles']:
+        logging.info(f"{bundle['file']}: {bundle['files']} files, "
+                     f"{bundle['assemblies']} assemblies, "
+                     f"{bundle['compressed'] / 2**20:.1f} MiB "
+                     f"({bundle['uncompressed'] / 2**20:.1f} MiB uncompressed)")
+        for extension in bundle['extensions'][:5]:
+            logging.info(f"  {extension['compressed'] / 2**20:>8.1f} MiB  {extension['name']}")
+        logging.info(f"  duplicates: {len(bundle['duplicates'])}, saving "
+                     f"{bundle['dedupSavings']['compressed'] / 2**20:.1f} MiB")
+    for split in report['split']:
+        logging.info(f"{split['flavor']} {split['version']} saves "
+                     f"{split['savedCompressed'] / 2**20:.1f} MiB over any-any")
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument('zips', nargs='*',
+                        help='Bundle zips (default: every bundle zip in --artifacts)')
+    parser.add_argument('--artifacts', default=str(DEFAULT_ARTIFACTS_DIR),
+                        help='Build artifacts directory')
+    parser.add_argument('--output', default='footprint',
+                        help='Directory for footprint.json and footprint.csv')
+    args = parser.parse_args(argv)
+    logging.basicConfig(level=logging.INFO, format='%(message)s')
+
+    metadata = get_bundle_metadata()
+    zips = args.zips or find_bundles(args.artifacts, metadata.bundle_id or DEFAULT_BUNDLE_ID)
+    if not zips:
+        parser.error(f"No bundle zips found in {args.artifacts}")
+    report = analyze(zips, metadata)
+    _summarize(report)
+    paths = write_report(report, args.output)
+    print(f"Footprint report written to {paths[0]} and {paths[1]}")
+    return 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
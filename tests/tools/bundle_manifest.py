@@ -0,0 +1,178 @@
+# Copyright (c) Microsoft Corporation. All rights reserved.
+# Licensed under the MIT License.
+"""Readers for the extension bundle definition files.
+
+``src/Microsoft.Azure.Functions.ExtensionBundle`` holds the source of
+truth for what a bundle contains:
+
+* ``extensions.json``: the extension packages, each with the binding
+  types it provides (empty for pinned dependency packages).
+* ``bundleConfig.json``: bundle id, version and preview flag.
+* ``windowsExclusions.json``: package ids left out of the Windows
+  platform bundles.
+
+Each reader takes a path or, for content read from another git revision,
+the file's text. Code that only needs the working tree should use
+get_bundle_metadata(): it parses the files once, indexes them and parses
+them again only when one of them changes on disk.
+"""
+
+import json
+import os
+import pathlib
+import subprocess
+import threading
+from typing import Dict, FrozenSet, List, Optional, Tuple
+
+PROJECT_ROOT = pathlib.Path(__file__).parent.parent.parent
+BUNDLE_SOURCE_DIR = pathlib.Path('src') / 'Microsoft.Azure.Functions.ExtensionBundle'
+EXTENSIONS_JSON = BUNDLE_SOURCE_DIR / 'extensions.json'
+BUNDLE_CONFIG_JSON = BUNDLE_SOURCE_DIR / 'bundleConfig.json'
+WINDOWS_EXCLUSIONS_JSON = BUNDLE_SOURCE_DIR / 'windowsExclusions.json'
+
+
+def _load(path, text=None):
+    if text is not None:
+        return json.loads(text)
+    # utf-8-sig: the files may be saved with a byte order mark
+    with open(PROJECT_ROOT / path, encoding='utf-8-sig') as f:
+        return json.load(f)
+
+
+def load_extensions(path=EXTENSIONS_JSON, text=None):
+    """Return the entries of extensions.json."""
+    return _load(path, text)
+
+
+def load_bundle_config(path=BUNDLE_CONFIG_JSON, text=None):
+    return _load(path, text)
+
+
+def load_windows_exclusions(path=WINDOWS_EXCLUSIONS_JSON, text=None):
+    """Return the set of package ids excluded from Windows bundles."""
+    return set(_load(path, text))
+
+
+def extension_bindings(extension):
+    """Return the lowercase binding types an extensions.json entry provides."""
+    return {binding.lower() for binding in extension.get('bindings', [])}
+
+
+class BundleMetadata:
+    """Indexed view of one bundle definition.
+
+    Lookups by binding type, package id and name are dict lookups; the
+    indexes are built once when the object is created.
+    """
+
+    def __init__(self, extensions, bundle_config=None, windows_exclusions=()):
+        self.extensions: List[dict] = list(extensions)
+        self.bundle_config: dict = dict(bundle_config or {})
+        self.windows_exclusions: FrozenSet[str] = frozenset(windows_exclusions)
+
+        self._by_id: Dict[str, dict] = {}
+        self._by_name: Dict[str, Tuple[dict, ...]] = {}
+        self._by_binding: Dict[str, Tuple[dict, ...]] = {}
+        for extension in self.extensions:
+            self._by_id[extension['id']] = extension
+            self._by_name[extension['name']] = (
+                self._by_name.get(extension['name'], ()) + (extension,))
+            for binding in extension_bindings(extension):
+                self._by_binding[binding] = (
+                    self._by_binding.get(binding, ()) + (extension,))
+
+    @property
+    def bundle_id(self):
+        return self.bundle_config.get('bundleId')
+
+    @property
+    def bundle_version(self):
+        return self.bundle_config.get('bundleVersion')
+
+    @property
+    def is_preview(self):
+        return bool(self.bundle_config.get('isPreviewBundle', False))
+
+    def extension(self, package_id) -> Optional[dict]:
+        """Return the extensions.json entry of ``package_id``, or None."""
+        return self._by_id.get(package_id)
+
+    def extensions_named(self, name):
+        """Return the entries called ``name`` (a name can cover several packages)."""
+        return self._by_name.get(name, ())
+
+    def version_of(self, package_id):
+        """Return the ``version`` (or ``majorVersion``) pinned for ``package_id``."""
+        extension = self._by_id.get(package_id)
+        if extension is None:
+            return None
+        return extension.get('version') or extension.get('majorVersion')
+
+    def is_excluded(self, package_id, platform):
+        """Whether ``package_id`` is left out of the ``platform`` bundle."""
+        return platform == 'windows' and package_id in self.windows_exclusions
+
+    def providers(self, binding, platform=None):
+        """Return the entries providing ``binding`` (any case).
+
+        Args:
+            binding: Binding type, e.g. ``blobTrigger``.
+            platform: 'windows' or 'linux' to leave out the packages that
+                platform's bundle excludes; None for all.
+        """
+        providers = self._by_binding.get(binding.lower(), ())
+        if platform is None:
+            return providers
+        return tuple(e for e in providers if not self.is_excluded(e['id'], platform))
+
+    def bindings(self, platform=None):
+        """Return every binding type the bundle provides on ``platform``."""
+        return {binding for binding in self._by_binding
+                if self.providers(binding, platform)}
+
+
+_cache_lock = threading.Lock()
+_cache: Dict[pathlib.Path, Tuple[tuple, BundleMetadata]] = {}
+
+
+def _stamp(path):
+    try:
+        stat = os.stat(path)
+    except FileNotFoundError:
+        return None
+    return stat.st_mtime_ns, stat.st_size
+
+
+def get_bundle_metadata(directory=None):
+    """Return the BundleMetadata of the bundle source in ``directory``.
+
+    The result is cached per directory and rebuilt only when the
+    modification time or size of one of the three files changes.
+
+    Raises:
+        FileNotFoundError: If extensions.json or bundleConfig.json is missing.
+    """
+    directory = pathlib.Path(directory or PROJECT_ROOT / BUNDLE_SOURCE_DIR)
+    paths = [directory / EXTENSIONS_JSON.name, directory / BUNDLE_CONFIG_JSON.name,
+             directory / WINDOWS_EXCLUSIONS_JSON.name]
+    stamp = tuple(_stamp(path) for path in paths)
+    with _cache_lock:
+        cached = _cache.get(directory)
+        if cached is not None and cached[0] == stamp:
+            return cached[1]
+        extensions, config, exclusions = paths
+        metadata = BundleMetadata(
+            load_extensions(extensions), load_bundle_config(config),
+            load_windows_exclusions(exclusions) if stamp[2] is not None else ())
+        _cache[directory] = (stamp, metadata)
+        return metadata
+
+
+def read_at_revision(path, revision):
+    """Return the text of ``path`` at git ``revision``, or None if absent."""
+    result = subprocess.run(
+        ['git', 'show', f'{revision}:{pathlib.PurePath(path).as_posix()}'],
+        cwd=PROJECT_ROOT, capture_output=True, text=True, encoding='utf-8')
+    if result.returncode != 0:
+        return None
+    return result.stdout.lstrip('\ufeff')
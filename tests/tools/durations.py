@@ -0,0 +1,144 @@
+# Copyright (c) Microsoft Corporation. All rights reserved.
+# Licensed under the MIT License.
+"""Historical test durations, collected from pytest JUnit XML reports.
+
+Every emulator test job writes ``test-results-<host>-<group>[-<shard>].xml``. Those
+reports are ingested into a SQLite database (default
+``tests/build/test-durations.db``), one row per test case. A report is
+identified by a hash of its contents, so ingesting the same artifact again
+is a no-op.
+
+pytest reports setup and teardown as part of a test case's time, so the
+host startup done in ``setUpClass`` is counted against the first test of
+each class and therefore against its module.
+"""
+
+import hashlib
+import pathlib
+import sqlite3
+import statistics
+import time
+import xml.etree.ElementTree as ET
+
+DEFAULT_DB = pathlib.Path(__file__).parent.parent / 'build' / 'test-durations.db'
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS reports (
+    id INTEGER PRIMARY KEY,
+    digest TEXT NOT NULL UNIQUE,
+    source TEXT NOT NULL,
+    ingested_at REAL NOT NULL
+);
+CREATE TABLE IF NOT EXISTS test_cases (
+    report_id INTEGER NOT NULL REFERENCES reports(id),
+    module TEXT NOT NULL,
+    classname TEXT NOT NULL,
+    name TEXT NOT NULL,
+    seconds REAL NOT NULL,
+    outcome TEXT NOT NULL
+);
+CREATE INDEX IF NOT EXISTS test_cases_module
+    ON test_cases (module, report_id);
+"""
+
+
+def module_of(classname, file=None):
+    """Return the test file a JUnit test case belongs to.
+
+    Args:
+        classname: JUnit ``classname``, e.g.
+            ``tests.emulator_tests.test_blob_functions.TestBlobFunctions``.
+        file: JUnit ``file`` attribute, when the report has one.
+
+    Returns:
+        The file name (``test_blob_functions.py``), or None if the case is
+        not from a ``test_*`` module.
+    """
+    if file:
+        return pathlib.PurePath(file).name
+    for part in reversed(classname.split('.')):
+        if part.startswith('test_'):
+            return f'{part}.py'
+    return None
+
+
+def _outcome(testcase):
+    for child in testcase:
+        if child.tag in ('failure', 'error'):
+            return 'failed'
+        if child.tag == 'skipped':
+            return 'skipped'
+    return 'passed'
+
+
+def parse_junit(path):
+    """Yield ``(module, classname, name, seconds, outcome)`` per test case."""
+    root = ET.parse(path).getroot()
+    for testcase in root.iter('testcase'):
+        classname = testcase.get('classname', '')
+        module = module_of(classname, testcase.get('file'))
+        if module is None:
+            continue
+        yield (module, classname, testcase.get('name', ''),
+               float(testcase.get('time') or 0), _outcome(testcase))
+
+
+class DurationStore:
+    """SQLite store of per-test durations from past runs."""
+
+    def __init__(self, path=None):
+        self.path = pathlib.Path(path or DEFAULT_DB)
+        self.path.parent.mkdir(parents=True, exist_ok=True)
+        self._conn = sqlite3.connect(str(self.path))
+        self._conn.executescript(SCHEMA)
+
+    def close(self):
+        self._conn.close()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc_info):
+        self.close()
+
+    def ingest(self, path):
+        """Add the test cases of the JUnit report at ``path``.
+
+        Returns:
+            The number of test cases added; 0 if the report was already in
+            the store.
+        """
+        data = pathlib.Path(path).read_bytes()
+        digest = hashlib.sha256(data).hexdigest()
+        with self._conn:
+            cursor = self._conn.execute(
+                'INSERT OR IGNORE INTO reports (digest, source, ingested_at) '
+                'VALUES (?, ?, ?)', (digest, str(path), time.time()))
+            if not cursor.rowcount:
+                return 0
+            rows = [(cursor.lastrowid, *case) for case in parse_junit(path)]
+            self._conn.executemany(
+                'INSERT INTO test_cases '
+                '(report_id, module, classname, name, seconds, outcome) '
+                'VALUES (?, ?, ?, ?, ?, ?)', rows)
+        return len(rows)
+
+    def module_durations(self, history=10):
+        """Return the typical duration of each test module in seconds.
+
+        A module's duration in one report is the sum of its test cases;
+        the result is the median over the ``history`` most recent reports
+        that contain the module. Reports where every test of the module
+        was skipped are left out.
+        """
+        rows = self._conn.execute(
+            'SELECT module, report_id, SUM(seconds), '
+            "SUM(outcome != 'skipped') "
+            'FROM test_cases GROUP BY module, report_id '
+            'ORDER BY module, report_id DESC').fetchall()
+        runs = {}
+        for module, _, seconds, executed in rows:
+            if executed:
+                runs.setdefault(module, []).append(seconds)
+        return {module: round(statistics.median(seconds[:history]), 3)
+                for module, seconds in runs.items()}
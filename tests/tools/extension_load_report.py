@@ -0,0 +1,161 @@
+# Copyright (c) Microsoft Corporation. All rights reserved.
+# Licensed under the MIT License.
+"""Aggregate per-extension load times across host and bundle versions.
+
+Every startup profile written to STARTUP_PROFILE_DIR records the load and
+initialization time of each bundle extension (see
+tests/utils/extension_load.py), along with the ``HOST_VERSION`` and
+bundle version under test. This collects the ``*_startup.json`` files of
+any number of runs, e.g. the downloaded startup artifacts of a pipeline,
+and reports per host version, bundle version and extension the median
+and maximum times. Each row is compared with the previous bundle version
+on the same host, so a bump that made an extension slower stands out::
+
+    python -m tests.tools.extension_load_report artifacts/ --output load-times
+"""
+
+import argparse
+import collections
+import csv
+import json
+import logging
+import os
+import pathlib
+import statistics
+import sys
+
+CSV_FIELDS = ['host_version', 'bundle_version', 'name', 'package_ids', 'runs',
+              'median_load_s', 'median_init_s', 'median_total_s', 'max_total_s',
+              'previous_bundle_version', 'delta_total_s']
+
+
+def find_profiles(paths):
+    """Return the ``*_startup.json`` files in ``paths`` (files or directories)."""
+    found = []
+    for path in map(pathlib.Path, paths):
+        found.extend(sorted(path.rglob('*_startup.json')) if path.is_dir() else [path])
+    return found
+
+
+def load_profiles(paths):
+    """Load startup profiles, skipping unreadable files and profiles without extensions."""
+    profiles = []
+    for path in paths:
+        try:
+            with open(path) as f:
+                profile = json.load(f)
+        except (OSError, json.JSONDecodeError) as e:
+            logging.warning(f"Skipping {path}: {e}")
+            continue
+        if profile.get('extensions'):
+            profiles.append(profile)
+    return profiles
+
+
+def version_key(version):
+    """Sort key for dotted versions; non-numeric parts sort as text."""
+    return tuple((0, int(part), '') if part.isdigit() else (1, 0, part)
+                 for part in str(version or '').split('.'))
+
+
+def aggregate(profiles):
+    """Return one row per host version, bundle version and extension.
+
+    Rows are sorted by host version, bundle version and descending median
+    total time. ``delta_total_s`` compares the median total time with the
+    closest earlier bundle version measured on the same host version.
+    """
+    samples = collections.defaultdict(list)
+    package_ids = {}
+    for profile in profiles:
+        metadata = profile.get('metadata', {})
+        host, bundle = metadata.get('host_version'), metadata.get('bundle_version')
+        for extension in profile['extensions']:
+            key = (host, bundle, extension['name'])
+            samples[key].append(extension)
+            package_ids[key] = extension.get('package_ids') or package_ids.get(key, [])
+
+    rows = {}
+    for key, loads in samples.items():
+        totals = [e['total_s'] for e in loads]
+        rows[key] = {
+            'host_version': key[0], 'bundle_version': key[1], 'name': key[2],
+            'package_ids': ' '.join(package_ids[key]), 'runs': len(loads),
+            'median_load_s': round(statistics.median(e['load_s'] for e in loads), 3),
+            'median_init_s': round(statistics.median(e['init_s'] for e in loads), 3),
+            'median_total_s': round(statistics.median(totals), 3),
+            'max_total_s': round(max(totals), 3),
+            'previous_bundle_version': None, 'delta_total_s': None,
+        }
+
+    bundles_by_host = collections.defaultdict(set)
+    for host, bundle, _ in rows:
+        bundles_by_host[host].add(bundle)
+    for (host, bundle, name), row in rows.items():
+        earlier = sorted((b for b in bundles_by_host[host]
+                          if version_key(b) < version_key(bundle)
+                          and (host, b, name) in rows), key=version_key)
+        if earlier:
+            previous = rows[(host, earlier[-1], name)]
+            row['previous_bundle_version'] = earlier[-1]
+            row['delta_total_s'] = round(row['median_total_s'] - previous['median_total_s'], 3)
+
+    return sorted(rows.values(), key=lambda r: (version_key(r['host_version']),
+                                                version_key(r['bundle_version']),
+                                                -r['median_total_s'], r['name']))
+
+
+def write_report(rows, directory, name='extension-load-times'):
+    """Write ``<name>.json`` and ``<name>.csv`` into ``directory``.
+
+    Returns:
+        The paths of the JSON and CSV files.
+    """
+    directory = pathlib.Path(directory)
+    os.makedirs(directory, exist_ok=True)
+
+    json_path = directory / f'{name}.json'
+    with open(json_path, 'w') as f:
+        json.dump(rows, f, indent=2)
+
+    csv_path = directory / f'{name}.csv'
+    with open(csv_path, 'w', newline='') as f:
+        writer = csv.DictWriter(f, fieldnames=CSV_FIELDS)
+        writer.writeheader()
+        writer.writerows(rows)
+    return json_path, csv_path
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument('paths', nargs='+',
+                        help='Startup profile files or directories to search')
+    parser.add_argument('--top', type=int, default=5,
+                        help='Extensions to list per host and bundle version')
+    parser.add_argument('--output', default='extension-load-times',
+                        help='Directory for the JSON and CSV report')
+    args = parser.parse_args(argv)
+    logging.basicConfig(level=logging.INFO, format='%(message)s')
+
+    profiles = load_profiles(find_profiles(args.paths))
+    if not profiles:
+        parser.error("No startup profiles with extension load times found")
+    rows = aggregate(profiles)
+
+    by_version = collections.defaultdict(list)
+    for row in rows:
+        by_version[(row['host_version'], row['bundle_version'])].append(row)
+    for (host, bundle), version_rows in by_version.items():
+        logging.info(f"Host {host or '?'}, bundle {bundle or '?'}:")
+        for row in version_rows[:args.top]:
+            delta = ('' if row['delta_total_s'] is None else
+                     f" ({row['delta_total_s']:+.3f}s vs {row['previous_bundle_version']})")
+            logging.info(f"  {row['median_total_s']:>7.3f}s  {row['name']}{delta}")
+
+    paths = write_report(rows, args.output)
+    print(f"Extension load times written to {paths[0]} and {paths[1]}")
+    return 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
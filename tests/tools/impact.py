@@ -0,0 +1,243 @@
+# Copyright (c) Microsoft Corporation. All rights reserved.
+# Licensed under the MIT License.
+"""Select the emulator test groups a change can affect.
+
+Compares the working tree (or ``--head``) with its merge base with a base
+revision, like ``git diff base...head``, so commits that landed on the
+base branch after the change forked are not counted as part of it:
+
+* Extensions added, removed or changed in ``extensions.json`` are mapped
+  to the binding types they provide, the binding types to the function
+  apps that use them (see binding_index.py) and the apps to the test
+  modules that start them.
+* A change to ``bundleConfig.json`` other than ``bundleVersion``, an
+  extension without bindings (a pinned dependency can affect any of
+  them) or a changed file outside the bundle definition and the emulator
+  tests selects everything.
+* Changed function apps and test modules select themselves. Documentation
+  and ``windowsExclusions.json`` (Windows bundles only; emulator tests run
+  on Linux) select nothing.
+
+The smoke modules always run. The result is ``test-groups.json`` reduced
+to the selected modules, for the matrix generation step::
+
+    python -m tests.tools.impact --base origin/main --output selected.json
+"""
+
+import argparse
+import dataclasses
+import json
+import logging
+import pathlib
+import subprocess
+import sys
+from typing import List, Set
+
+from tests.tools.binding_index import BUILTIN_BINDINGS, index_apps, index_test_modules
+from tests.tools.bundle_manifest import (
+    BUNDLE_CONFIG_JSON,
+    EXTENSIONS_JSON,
+    PROJECT_ROOT,
+    WINDOWS_EXCLUSIONS_JSON,
+    BundleMetadata,
+    extension_bindings,
+    get_bundle_metadata,
+    load_bundle_config,
+    load_extensions,
+    read_at_revision,
+)
+from tests.tools.sharding import DEFAULT_CONFIG, load_test_groups
+
+EMULATOR_TESTS_DIR = pathlib.PurePath('tests') / 'emulator_tests'
+# Cover bundle download, host startup and the storage bindings every app uses
+DEFAULT_SMOKE_MODULES = ('test_connectivity.py', 'test_blob_functions.py')
+IGNORED_SUFFIXES = ('.md',)
+
+
+@dataclasses.dataclass
+class ExtensionChange:
+    name: str
+    id: str
+    change: str  # 'added', 'removed' or 'changed'
+    bindings: Set[str]
+
+
+@dataclasses.dataclass
+class Selection:
+    """Test modules selected for a change, and why."""
+    run_all: bool = False
+    modules: Set[str] = dataclasses.field(default_factory=set)
+    reasons: List[str] = dataclasses.field(default_factory=list)
+
+    def select_all(self, reason):
+        self.run_all = True
+        self.reasons.append(reason)
+
+    def add(self, modules, reason):
+        if modules:
+            self.modules.update(modules)
+            self.reasons.append(f"{reason}: {', '.join(sorted(modules))}")
+
+
+def _key(extension):
+    return extension['id'], extension.get('name')
+
+
+def diff_extensions(old, new):
+    """Return the ExtensionChange of every entry that differs.
+
+    Entries are matched by package id and name; a change reports the
+    bindings of both versions.
+    """
+    old_by_key = {_key(e): e for e in old}
+    new_by_key = {_key(e): e for e in new}
+    changes = []
+    for key in sorted(old_by_key.keys() | new_by_key.keys()):
+        before, after = old_by_key.get(key), new_by_key.get(key)
+        if before == after:
+            continue
+        change = 'added' if before is None else 'removed' if after is None else 'changed'
+        bindings = extension_bindings(before or {}) | extension_bindings(after or {})
+        changes.append(ExtensionChange(name=key[1] or key[0], id=key[0],
+                                       change=change, bindings=bindings))
+    return changes
+
+
+def merge_base(base, head=None):
+    """Return the best common ancestor of ``base`` and ``head`` (default: HEAD)."""
+    result = subprocess.run(['git', 'merge-base', base, head or 'HEAD'], cwd=PROJECT_ROOT,
+                            capture_output=True, text=True, check=True)
+    return result.stdout.strip()
+
+
+def changed_files(base, head=None):
+    """Return the paths changed between ``base`` and ``head`` (default: worktree)."""
+    cmd = ['git', 'diff', '--name-only', base] + ([head] if head else [])
+    result = subprocess.run(cmd, cwd=PROJECT_ROOT, capture_output=True,
+                            text=True, check=True)
+    return [line for line in result.stdout.splitlines() if line]
+
+
+def _metadata_at(revision):
+    """Return the BundleMetadata at ``revision`` (None: the working tree)."""
+    if revision is None:
+        try:
+            return get_bundle_metadata()
+        except FileNotFoundError:
+            return BundleMetadata([])
+    extensions = read_at_revision(EXTENSIONS_JSON, revision)
+    config = read_at_revision(BUNDLE_CONFIG_JSON, revision)
+    return BundleMetadata(load_extensions(text=extensions) if extensions else [],
+                          load_bundle_config(text=config) if config else {})
+
+
+def select(paths, extension_changes=(), config_changes=(), apps=None, modules=None):
+    """Work out which test modules ``paths`` and the bundle changes affect.
+
+    Args:
+        paths: Changed files, relative to the repository root.
+        extension_changes: Result of diff_extensions.
+        config_changes: Names of the bundleConfig.json keys that changed.
+        apps: ``index_apps()`` result (default: the emulator test apps).
+        modules: ``index_test_modules()`` result.
+    """
+    apps = index_apps() if apps is None else apps
+    modules = index_test_modules(app_names=set(apps)) if modules is None else modules
+    users = {}
+    for module, module_apps in modules.items():
+        for app in module_apps:
+            users.setdefault(app, set()).add(module)
+
+    selection = Selection()
+    for key in sorted(set(config_changes) - {'bundleVersion'}):
+        selection.select_all(f"bundleConfig.json: {key} changed")
+
+    for change in extension_changes:
+        bindings = change.bindings - BUILTIN_BINDINGS
+        if not bindings:
+            selection.select_all(f"{change.name} {change.change} "
+                                 f"(no bindings; may affect any extension)")
+            continue
+        affected = {m for app in apps.values()
+                    if app.binding_types & bindings
+                    for m in users.get(app.name, ())}
+        selection.add(affected, f"{change.name} {change.change} "
+                                f"({', '.join(sorted(bindings))})")
+
+    bundle_files = {p.as_posix() for p in (EXTENSIONS_JSON, BUNDLE_CONFIG_JSON,
+                                           WINDOWS_EXCLUSIONS_JSON)}
+    for path in paths:
+        pure = pathlib.PurePosixPath(path)
+        if path in bundle_files or pure.suffix in IGNORED_SUFFIXES:
+            continue
+        parts = pure.parts
+        if parts[:2] == EMULATOR_TESTS_DIR.parts and len(parts) > 2:
+            if parts[2] in modules:
+                selection.add({parts[2]}, f"{path} changed")
+                continue
+            if parts[2] in apps:
+                selection.add(users.get(parts[2], set()), f"{path} changed")
+                continue
+        selection.select_all(f"{path} changed")
+    return selection
+
+
+def filter_test_groups(groups, selection, smoke=DEFAULT_SMOKE_MODULES):
+    """Reduce ``groups`` to the selected modules plus the smoke modules.
+
+    Groups left without modules are dropped.
+    """
+    if selection.run_all:
+        return [dict(group) for group in groups]
+    wanted = selection.modules | set(smoke)
+    result = []
+    for group in groups:
+        files = [f for f in group['files'].split() if f in wanted]
+        if files:
+            result.append({**group, 'files': ' '.join(files)})
+    return result
+
+
+def analyze(base, head=None):
+    """Return the Selection for the changes ``head`` made since it forked from ``base``."""
+    base = merge_base(base, head)
+    paths = changed_files(base, head)
+    extension_changes = []
+    config_changes = []
+    if {EXTENSIONS_JSON.as_posix(), BUNDLE_CONFIG_JSON.as_posix()} & set(paths):
+        old, new = _metadata_at(base), _metadata_at(head)
+        extension_changes = diff_extensions(old.extensions, new.extensions)
+        config_changes = [key for key in old.bundle_config.keys() | new.bundle_config.keys()
+                          if old.bundle_config.get(key) != new.bundle_config.get(key)]
+    return select(paths, extension_changes, config_changes)
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument('--base', required=True, help='Base revision, e.g. origin/main')
+    parser.add_argument('--head', help='Head revision (default: the working tree)')
+    parser.add_argument('--config', default=str(DEFAULT_CONFIG),
+                        help='test-groups.json to select from')
+    parser.add_argument('--smoke', nargs='*', default=list(DEFAULT_SMOKE_MODULES),
+                        help='Test modules that always run')
+    parser.add_argument('--output', help='Write the selected groups here instead of stdout')
+    args = parser.parse_args(argv)
+    logging.basicConfig(level=logging.INFO, format='%(message)s')
+
+    selection = analyze(args.base, args.head)
+    for reason in selection.reasons or ['No test-relevant changes']:
+        logging.info(reason)
+    groups = filter_test_groups(load_test_groups(args.config), selection, args.smoke)
+    logging.info(f"Selected {'all' if selection.run_all else len(groups)} group(s): "
+                 f"{', '.join(g['name'] for g in groups)}")
+
+    output = json.dumps({'testGroups': groups}, indent=4)
+    if args.output:
+        pathlib.Path(args.output).write_text(output)
+    else:
+        print(output)
+    return 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
@@ -0,0 +1,108 @@
+# Copyright (c) Microsoft Corporation. All rights reserved.
+# Licensed under the MIT License.
+"""Check that the bundle provides every binding a function app uses.
+
+A binding missing from the bundle otherwise only shows up after
+``func host start`` has downloaded the bundle, failed to index the
+functions and the harness has given up waiting for a healthy host. The
+checker reads the app's bindings statically (binding_index.py) and looks
+each one up in the ``bindings`` lists of ``extensions.json``. For Windows
+bundles, packages listed in ``windowsExclusions.json`` do not count.
+
+WebHostTestCase runs it before starting a host (disable with
+PREFLIGHT_CHECKS=0); it also runs standalone::
+
+    python -m tests.tools.preflight --platform all
+"""
+
+import argparse
+import dataclasses
+import sys
+
+from tests.tools.binding_index import BUILTIN_BINDINGS, index_app, index_apps
+from tests.tools.bundle_manifest import get_bundle_metadata
+
+PLATFORMS = ('linux', 'windows')
+
+
+@dataclasses.dataclass
+class Problem:
+    app: str
+    function: str
+    line: int
+    message: str
+    # 'error' fails the check; 'warning' is only reported
+    severity: str = 'error'
+
+    def __str__(self):
+        return f"{self.app}/function_app.py:{self.line}: {self.function}: {self.message}"
+
+
+def check_app(app, metadata, platform='linux'):
+    """Return the Problems of the indexed ``app`` against the bundle.
+
+    Args:
+        app: AppBindings from binding_index.
+        metadata: BundleMetadata of the bundle.
+        platform: 'linux' or 'windows'.
+    """
+    problems = []
+    for binding, uses in sorted(app.bindings.items()):
+        if binding in BUILTIN_BINDINGS or metadata.providers(binding, platform):
+            continue
+        everywhere = metadata.providers(binding)
+        if everywhere:
+            message = (f"binding '{binding}' is provided by "
+                       f"{', '.join(e['name'] for e in everywhere)}, which is "
+                       f"excluded from this platform's bundle")
+        else:
+            message = f"binding '{binding}' is not provided by any bundle extension"
+        problems.extend(Problem(app.name, function, line, message)
+                        for function, line in uses)
+    problems.extend(
+        Problem(app.name, '-', line,
+                f"decorator '@{name}' is not known to the pre-flight check",
+                severity='warning')
+        for name, line in app.unknown)
+    return problems
+
+
+def check_app_dir(app_dir, platform, metadata=None):
+    """Check the function app in ``app_dir`` for ``platform``.
+
+    Raises:
+        ValueError: If ``platform`` is not 'linux' or 'windows'.
+    """
+    if platform not in PLATFORMS:
+        raise ValueError(f"Unknown platform '{platform}'. "
+                         f"Valid platforms: {', '.join(PLATFORMS)}")
+    metadata = metadata or get_bundle_metadata()
+    return check_app(index_app(app_dir / 'function_app.py'), metadata, platform)
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument('apps', nargs='*',
+                        help='App folder names under tests/emulator_tests (default: all)')
+    parser.add_argument('--platform', choices=PLATFORMS + ('all',), default='linux')
+    args = parser.parse_args(argv)
+
+    apps = index_apps()
+    unknown = set(args.apps) - set(apps)
+    if unknown:
+        parser.error(f"No such function app: {', '.join(sorted(unknown))}")
+    metadata = get_bundle_metadata()
+    platforms = PLATFORMS if args.platform == 'all' else (args.platform,)
+
+    errors = 0
+    for platform in platforms:
+        for name in args.apps or sorted(apps):
+            for problem in check_app(apps[name], metadata, platform):
+                errors += problem.severity == 'error'
+                print(f"[{platform}] {problem.severity}: {problem}")
+    print(f"{errors} error(s)")
+    return 1 if errors else 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
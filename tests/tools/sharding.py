@@ -0,0 +1,248 @@
+# Copyright (c) Microsoft Corporation. All rights reserved.
+# Licensed under the MIT License.
+"""Balance the emulator test groups using historical test durations.
+
+``eng/ci/config/test-groups.json`` lists the test modules each CI job runs
+and the emulators it starts. This tool rewrites it so the slowest job is
+as short as possible:
+
+1. Modules are grouped by what their job needs (the ``emulators`` and
+   ``stopEventHub`` of the group they are listed in today); modules are
+   only ever placed in a job with the same needs.
+2. Within each of those classes, modules are packed into jobs
+   longest-processing-time first: the slowest module goes to the job with
+   the least work so far.
+3. Starting from one job per class, a job is added to the class with the
+   longest job for as long as the job budget allows and the critical path
+   gets shorter by more than the ``--shard-overhead`` seconds a job spends
+   on setup (emulators, Core Tools, bundle).
+
+Durations come from the SQLite store filled by the ``ingest`` command
+(see durations.py)::
+
+    python -m tests.tools.sharding ingest artifacts/**/test-results-*.xml
+    python -m tests.tools.sharding shard --max-shards 12 \\
+        --output eng/ci/config/test-groups.json
+
+Modules without history are assumed to take the median duration of the
+known modules.
+"""
+
+import argparse
+import glob
+import heapq
+import json
+import logging
+import pathlib
+import statistics
+import sys
+
+from tests.tools.durations import DurationStore
+
+PROJECT_ROOT = pathlib.Path(__file__).parent.parent.parent
+DEFAULT_CONFIG = PROJECT_ROOT / 'eng' / 'ci' / 'config' / 'test-groups.json'
+# Used when there is no history at all
+DEFAULT_MODULE_SECONDS = 120.0
+
+
+def load_test_groups(path=None):
+    with open(path or DEFAULT_CONFIG) as f:
+        return json.load(f)['testGroups']
+
+
+def requirement_of(group):
+    """Return what a job running ``group`` has to set up."""
+    return group['emulators'], group['stopEventHub']
+
+
+def modules_by_requirement(groups):
+    """Map each requirement to the modules that need it, in config order."""
+    modules = {}
+    for group in groups:
+        for module in group['files'].split():
+            modules.setdefault(requirement_of(group), []).append(module)
+    return modules
+
+
+def pack_lpt(durations, shards):
+    """Pack modules into ``shards`` bins, longest first.
+
+    Args:
+        durations: Dict of module name to seconds.
+        shards: Number of bins.
+
+    Returns:
+        List of ``(seconds, modules)`` per non-empty bin, longest first.
+    """
+    bins = [(0.0, index, []) for index in range(shards)]
+    heapq.heapify(bins)
+    for module in sorted(durations, key=lambda m: (-durations[m], m)):
+        total, index, modules = heapq.heappop(bins)
+        modules.append(module)
+        heapq.heappush(bins, (total + durations[module], index, modules))
+    packed = [(round(total, 3), sorted(modules))
+              for total, _, modules in bins if modules]
+    return sorted(packed, key=lambda b: (-b[0], b[1]))
+
+
+def plan_shards(classes, durations, max_shards, shard_overhead=0.0):
+    """Decide how many jobs each requirement class gets and pack them.
+
+    Args:
+        classes: Dict of requirement to module names.
+        durations: Dict of module name to seconds.
+        max_shards: Upper bound on the total number of jobs. Every class
+            gets at least one job, even if that exceeds the bound.
+        shard_overhead: Setup seconds of a job. A job is only added if it
+            shortens the critical path by more than that.
+
+    Returns:
+        Dict of requirement to the ``pack_lpt`` result of its jobs.
+    """
+    counts = {req: 1 for req in classes}
+
+    def pack(req):
+        return pack_lpt({m: durations[m] for m in classes[req]}, counts[req])
+
+    plans = {req: pack(req) for req in classes}
+    while sum(counts.values()) < max_shards:
+        req = max(plans, key=lambda r: plans[r][0][0])
+        if counts[req] >= len(classes[req]):
+            break  # The longest job is a single module
+        counts[req] += 1
+        candidate = pack(req)
+        if plans[req][0][0] - candidate[0][0] <= shard_overhead:
+            # Not worth the setup of another job
+            counts[req] -= 1
+            break
+        plans[req] = candidate
+    return plans
+
+
+def build_test_groups(groups, durations, max_shards, shard_overhead=0.0,
+                      default_seconds=None):
+    """Return a balanced replacement for the ``testGroups`` list.
+
+    A class that keeps a single job keeps the name of its original group.
+    Jobs of a split class get numbered names (``BasicTests1``, ...) and a
+    ``shard`` index but keep their ``group``, which CI conditions and
+    artifact names refer to; a ``perfGate`` flag stays on the first shard.
+    """
+    classes = modules_by_requirement(groups)
+    known = [durations[m] for ms in classes.values() for m in ms if m in durations]
+    if default_seconds is None:
+        default_seconds = statistics.median(known) if known else DEFAULT_MODULE_SECONDS
+    missing = sorted(m for ms in classes.values() for m in ms if m not in durations)
+    if missing:
+        logging.warning(f"No duration history for {', '.join(missing)}; "
+                        f"assuming {default_seconds:.0f}s each")
+    estimates = {m: durations.get(m, default_seconds)
+                 for ms in classes.values() for m in ms}
+
+    templates = {}
+    for group in groups:
+        templates.setdefault(requirement_of(group), group)
+
+    plans = plan_shards(classes, estimates, max_shards, shard_overhead)
+    result = []
+    for req, shards in plans.items():
+        template = dict(templates[req])
+        # Names of the unsplit group, so a split config can be re-balanced
+        base = template.pop('shardOf', None) or {
+            key: template[key] for key in ('name', 'group', 'display')}
+        for index, (seconds, modules) in enumerate(shards, 1):
+            group = {**template, **base}
+            group.pop('shard', None)
+            if len(shards) > 1:
+                group['name'] = f"{base['name']}{index}"
+                group['display'] = f"{base['display']} ({index}/{len(shards)})"
+                group['shard'] = index
+                group['shardOf'] = base
+                # Job-level extras such as the A/B gate run in one job only
+                if index > 1:
+                    group.pop('perfGate', None)
+            group['files'] = ' '.join(modules)
+            group['estimatedSeconds'] = round(seconds + shard_overhead)
+            result.append(group)
+    return result
+
+
+def critical_path(groups):
+    return max((g.get('estimatedSeconds', 0) for g in groups), default=0)
+
+
+def _ingest(args):
+    paths = sorted({p for pattern in args.reports
+                    for p in glob.glob(pattern, recursive=True)})
+    if not paths:
+        logging.error(f"No reports match {args.reports}")
+        return 1
+    with DurationStore(args.db) as store:
+        for path in paths:
+            added = store.ingest(path)
+            logging.info(f"{path}: {added} test cases"
+                         if added else f"{path}: already ingested")
+    return 0
+
+
+def _shard(args):
+    groups = load_test_groups(args.config)
+    with DurationStore(args.db) as store:
+        durations = store.module_durations(history=args.history)
+    balanced = build_test_groups(groups, durations, args.max_shards,
+                                 args.shard_overhead, args.default_duration)
+    for group in balanced:
+        logging.info(f"{group['name']:<16} ~{group['estimatedSeconds']:>5}s  "
+                     f"{group['files']}")
+    logging.info(f"Critical path: ~{critical_path(balanced)}s "
+                 f"over {len(balanced)} jobs")
+
+    output = json.dumps({'testGroups': balanced}, indent=4)
+    if args.output:
+        pathlib.Path(args.output).write_text(output)
+    else:
+        print(output)
+    return 0
+
+
+def _show(args):
+    with DurationStore(args.db) as store:
+        durations = store.module_durations(history=args.history)
+    for module, seconds in sorted(durations.items(), key=lambda d: -d[1]):
+        print(f"{seconds:>9.1f}s  {module}")
+    return 0
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument('--db', default=None,
+                        help='Duration store (default: tests/build/test-durations.db)')
+    parser.add_argument('--history', type=int, default=10,
+                        help='Recent reports per module to take the median of')
+    commands = parser.add_subparsers(dest='command', required=True)
+
+    ingest = commands.add_parser('ingest', help='Add JUnit XML reports to the store')
+    ingest.add_argument('reports', nargs='+', help='Report paths or glob patterns')
+    ingest.set_defaults(func=_ingest)
+
+    shard = commands.add_parser('shard', help='Emit balanced test groups')
+    shard.add_argument('--config', default=str(DEFAULT_CONFIG),
+                       help='Current test-groups.json (source of emulator requirements)')
+    shard.add_argument('--max-shards', type=int, default=12)
+    shard.add_argument('--shard-overhead', type=float, default=90.0,
+                       help='Setup seconds per job')
+    shard.add_argument('--default-duration', type=float, default=None,
+                       help='Seconds assumed for modules without history')
+    shard.add_argument('--output', help='Write the JSON here instead of stdout')
+    shard.set_defaults(func=_shard)
+
+    show = commands.add_parser('show', help='List the typical module durations')
+    show.set_defaults(func=_show)
+
+    args = parser.parse_args(argv)
+    logging.basicConfig(level=logging.INFO, format='%(message)s')
+    return args.func(args)
+
+
+if __name__ == '__main__':
+    sys.exit(main())
@@ -0,0 +1,16 @@
+# Copyright (c) Microsoft Corporation. All rights reserved.
+# Licensed under the MIT License.
+"""Helpers for reading test settings from environment variables."""
+
+import os
+
+
+def is_envvar_true(name, default=False):
+    """Check if an environment variable is set to a 'truthy' value.
+
+    ``default`` is returned when the variable is not set.
+    """
+    value = os.environ.get(name)
+    if value is None:
+        return default
+    return value.strip().lower() in ('1', 'true', 'yes', 'y')
@@ -0,0 +1,114 @@
+# Copyright (c) Microsoft Corporation. All rights reserved.
+# Licensed under the MIT License.
+"""Per-extension load times parsed from host startup output.
+
+With a bundle, the host loads the startup type of every extension in the
+bundle's ``extensions.json`` in turn::
+
+    Loading startup extension 'AzureStorageBlobs'
+    Loaded extension 'AzureStorageBlobs' (5.3.7.0)
+
+An extension's load time runs from its "Loading" line to its "Loaded"
+line. Its initialization time is the gap that follows, until the host
+logs the next extension or starts the JobHost: the startup type's
+``Configure`` and whatever else the host does for that extension before
+moving on. Names are mapped back to the ``extensions.json`` entries of
+the bundle under test.
+"""
+
+import dataclasses
+import re
+from typing import Optional, Tuple
+
+_LOADING_RE = re.compile(r"Loading startup extension '(?P<name>[^']+)'")
+_LOADED_RE = re.compile(r"Loaded extension '(?P<name>[^']+)' \((?P<version>[^)]*)\)")
+# The host has finished with the startup extensions
+EXTENSIONS_DONE_RE = re.compile(r'Starting JobHost|Starting Host \(')
+
+
+@dataclasses.dataclass
+class ExtensionLoad:
+    """Load and initialization of one extension, in seconds after host launch."""
+    name: str
+    start: float
+    loaded: Optional[float] = None
+    end: Optional[float] = None
+    # Assembly version the host logged
+    version: Optional[str] = None
+    # Package ids of the extensions.json entries with this name
+    package_ids: Tuple[str, ...] = ()
+
+    @property
+    def load(self):
+        return (self.loaded if self.loaded is not None else self.end) - self.start
+
+    @property
+    def init(self):
+        return self.end - self.loaded if self.loaded is not None else 0.0
+
+    @property
+    def total(self):
+        return self.end - self.start
+
+    def to_dict(self):
+        return {'name': self.name, 'package_ids': list(self.package_ids),
+                'version': self.version, 'start_s': round(self.start, 3),
+                'load_s': round(self.load, 3), 'init_s': round(self.init, 3),
+                'total_s': round(self.total, 3)}
+
+
+def _package_ids(name, bundle):
+    if bundle is None:
+        return ()
+    entries = bundle.extensions_named(name) or [
+        e for e in bundle.extensions if e['name'].lower() == name.lower()]
+    return tuple(e['id'] for e in entries)
+
+
+def extension_load_times(lines, launched, ready, bundle=None):
+    """Return the ExtensionLoad of every extension the host loaded.
+
+    Args:
+        lines: host_logs.LogLine objects read from the host output.
+        launched: time.monotonic() just before the host process was started.
+        ready: time.monotonic() when the host first reported healthy; closes
+            an extension whose end was not logged.
+        bundle: Optional BundleMetadata used to map names to package ids.
+    """
+    loads = []
+    current = None
+
+    def close(at):
+        if current is not None and current.end is None:
+            if current.loaded is None:
+                current.loaded = at
+            current.end = at
+
+    for line in lines:
+        if line.received > ready:
+            break
+        at = line.received - launched
+        loading = _LOADING_RE.search(line.text)
+        if loading:
+            close(at)
+            current = ExtensionLoad(loading.group('name'), start=at,
+                                    package_ids=_package_ids(loading.group('name'), bundle))
+            loads.append(current)
+            continue
+        loaded = _LOADED_RE.search(line.text)
+        if loaded:
+            name = loaded.group('name')
+            if (current is None or current.name != name or current.loaded is not None
+                    or current.end is not None):
+                # No "Loading" line (e.g. a lower log level): nothing to time the load from
+                close(at)
+                current = ExtensionLoad(name, start=at, package_ids=_package_ids(name, bundle))
+                loads.append(current)
+            current.loaded = at
+            current.version = loaded.group('version')
+            continue
+        if EXTENSIONS_DONE_RE.search(line.text):
+            close(at)
+            current = None
+    close(ready - launched)
+    return loads
@@ -0,0 +1,357 @@
+# Copyright (c) Microsoft Corporation. All rights reserved.
+# Licensed under the MIT License.
+"""Streaming parser and index for Azure Functions host console output.
+
+The host's stdout is read through a pipe by a HostLogReader thread,
+which forwards every line to a HostLogCapture (or any other stream) and
+feeds it into a HostLogIndex. The index keeps the most recent lines
+grouped by category, function name and invocation ID, and lets tests
+block until a specific invocation shows up, e.g.::
+
+    mark = self.webhost.logs.mark()
+    ...
+    self.webhost.wait_for_invocation('queue_trigger', since=mark)
+
+Both the index and the capture are bounded, so memory use does not grow
+with the amount of output a chatty (e.g. Trace level) host produces.
+"""
+
+import collections
+import dataclasses
+import gzip
+import os
+import re
+import threading
+import time
+from datetime import datetime
+from typing import Deque, Dict, Optional
+
+# Core Tools prefixes every host line with "[<ISO-8601 UTC timestamp>] "
+_TIMESTAMP_RE = re.compile(r'^\[(?P<ts>\d{4}-\d{2}-\d{2}T[\d:.]+Z?)\]\s?(?P<msg>.*)$')
+_EXECUTING_RE = re.compile(
+    r"Executing 'Functions\.(?P<name>[^']+)' "
+    r"\(Reason='(?P<reason>.*)', Id=(?P<id>[0-9a-fA-F-]+)\)")
+_EXECUTED_RE = re.compile(
+    r"Executed 'Functions\.(?P<name>[^']+)' "
+    r"\((?P<status>\w+), Id=(?P<id>[0-9a-fA-F-]+), "
+    r"Duration=(?P<duration>\d+)ms\)")
+
+# Categories assigned to lines, checked in order; a line may match several.
+CATEGORY_PATTERNS = [
+    ('invocation', re.compile(r"Execut(?:ing|ed) 'Functions\.")),
+    ('worker', re.compile(r'\bworker\b', re.IGNORECASE)),
+    ('extension', re.compile(r'extension', re.IGNORECASE)),
+    ('host', re.compile(r'\bhost\b', re.IGNORECASE)),
+    ('error', re.compile(r'\b(error|exception|failed)\b', re.IGNORECASE)),
+    # Core Tools / Kestrel could not listen on the requested port
+    ('port_conflict', re.compile(r'Port \d+ is unavailable|address already in use'
+                                 r'|Failed to bind to address', re.IGNORECASE)),
+]
+
+
+def parse_timestamp(value):
+    """Parse a host log timestamp into an aware datetime, or None."""
+    value = value.rstrip('Z')
+    if '.' in value:
+        # .NET prints 7 fractional digits; datetime supports at most 6
+        head, frac = value.split('.', 1)
+        value = f'{head}.{frac[:6]}'
+    try:
+        return datetime.fromisoformat(value + '+00:00')
+    except ValueError:
+        return None
+
+
+@dataclasses.dataclass
+class LogLine:
+    """A single line of host output."""
+    seq: int
+    text: str
+    received: float  # time.monotonic() when the line was read
+    timestamp: Optional[datetime] = None
+    categories: tuple = ()
+
+
+@dataclasses.dataclass
+class Invocation:
+    """A function invocation reconstructed from Executing/Executed lines."""
+    function_name: str
+    invocation_id: str
+    reason: Optional[str] = None
+    status: Optional[str] = None  # None while still running
+    duration_ms: Optional[int] = None
+    started: Optional[LogLine] = None
+    finished: Optional[LogLine] = None
+
+    @property
+    def succeeded(self):
+        return self.status == 'Succeeded'
+
+
+class HostLogIndex:
+    """Thread-safe index of host log lines and function invocations.
+
+    Only the last ``max_lines`` lines are kept in each index. An invocation
+    keeps just its Executing and Executed lines; the last
+    ``max_invocations`` are kept, enough for latency reports to cover the
+    whole of any test or benchmark run.
+    """
+
+    def __init__(self, max_lines=20000, max_invocations=100000):
+        self._condition = threading.Condition()
+        self._max_lines = max_lines
+        self._max_invocations = max_invocations
+        self._seq = 0
+        self.lines: Deque[LogLine] = collections.deque(maxlen=max_lines)
+        self._by_category: Dict[str, Deque[LogLine]] = {}
+        self._by_function: Dict[str, Deque[LogLine]] = {}
+        self._invocations: Dict[str, Invocation] = collections.OrderedDict()
+
+    def _append(self, index, key, line):
+        lines = index.get(key)
+        if lines is None:
+            lines = index[key] = collections.deque(maxlen=self._max_lines)
+        lines.append(line)
+
+    def feed(self, text):
+        """Parse and index one line of host output."""
+        text = text.rstrip('\r\n')
+        timestamp = None
+        message = text
+        match = _TIMESTAMP_RE.match(text)
+        if match:
+            timestamp = parse_timestamp(match.group('ts'))
+            message = match.group('msg')
+
+        categories = tuple(name for name, pattern in CATEGORY_PATTERNS
+                           if pattern.search(message))
+
+        with self._condition:
+            line = LogLine(seq=self._seq, text=text,
+                           received=time.monotonic(), timestamp=timestamp,
+                           categories=categories)
+            self._seq += 1
+            self.lines.append(line)
+            for category in categories:
+                self._append(self._by_category, category, line)
+            if 'invocation' in categories:
+                self._index_invocation(line, message)
+            self._condition.notify_all()
+        return line
+
+    def _index_invocation(self, line, message):
+        match = _EXECUTING_RE.search(message)
+        if match:
+            invocation = self._get_invocation(match, line)
+            invocation.reason = match.group('reason')
+            invocation.started = line
+            return
+
+        match = _EXECUTED_RE.search(message)
+        if match:
+            invocation = self._get_invocation(match, line)
+            invocation.status = match.group('status')
+            invocation.duration_ms = int(match.group('duration'))
+            invocation.finished = line
+
+    def _get_invocation(self, match, line):
+        name, invocation_id = match.group('name'), match.group('id')
+        invocation = self._invocations.get(invocation_id)
+        if invocation is None:
+            invocation = Invocation(function_name=name,
+                                    invocation_id=invocation_id)
+            self._invocations[invocation_id] = invocation
+            if len(self._invocations) > self._max_invocations:
+                self._invocations.popitem(last=False)
+        self._append(self._by_function, name, line)
+        return invocation
+
+    def mark(self):
+        """Return a position to pass as ``since`` to ignore earlier lines."""
+        with self._condition:
+            return self._seq
+
+    def by_category(self, category):
+        with self._condition:
+            return list(self._by_category.get(category, ()))
+
+    def by_function(self, function_name):
+        with self._condition:
+            return list(self._by_function.get(function_name, ()))
+
+    def by_invocation(self, invocation_id):
+        with self._condition:
+            invocation = self._invocations.get(invocation_id)
+            if invocation is None:
+                return []
+            return [line for line in (invocation.started, invocation.finished)
+                    if line is not None]
+
+    def invocations(self, function_name=None, since=0):
+        """Return invocations (optionally of one function) in start order."""
+        with self._condition:
+            return [inv for inv in self._invocations.values()
+                    if (function_name is None
+                        or inv.function_name == function_name)
+                    and _first_seq(inv) >= since]
+
+    def wait_for_invocation(self, function_name, status='Succeeded',
+                            since=0, timeout=30):
+        """Block until an invocation of ``function_name`` completes.
+
+        Args:
+            function_name: Function name as registered with the host.
+            status: Required completion status ('Succeeded', 'Failed'), or
+                None to accept any completed invocation.
+            since: Only consider invocations logged after this mark().
+            timeout: Maximum seconds to wait (default: 30).
+
+        Returns:
+            The matching Invocation.
+
+        Raises:
+            TimeoutError: If no matching invocation completes in time.
+        """
+        deadline = time.monotonic() + timeout
+        with self._condition:
+            while True:
+                for inv in self._invocations.values():
+                    if (inv.function_name == function_name
+                            and inv.status is not None
+                            and (status is None or inv.status == status)
+                            and _first_seq(inv) >= since):
+                        return inv
+                remaining = deadline - time.monotonic()
+                if remaining <= 0:
+                    break
+                self._condition.wait(remaining)
+
+        seen = [f'{inv.invocation_id}: {inv.status or "Running"}'
+                for inv in self.invocations(function_name, since)]
+        raise TimeoutError(
+            f"No {status or 'completed'} invocation of '{function_name}' "
+            f"within {timeout}s. Invocations seen: {seen or 'none'}"
+        )
+
+
+def _first_seq(invocation):
+    line = invocation.started or invocation.finished
+    return line.seq if line is not None else -1
+
+
+class HostLogCapture:
+    """Bounded sink for host output.
+
+    Keeps the last ``tail_lines`` lines in memory for error messages and,
+    if ``archive`` is given, streams everything to a gzip file. Once
+    ``max_archive_bytes`` of (uncompressed, UTF-8) output has been archived,
+    further lines are dropped from the archive; on close() the archive
+    gets a truncation marker followed by the retained tail, so it always
+    holds both the start and the end of the host output.
+
+    Args:
+        passthrough: Optional stream that also receives every line,
+            e.g. sys.stdout when PYAZURE_WEBHOST_DEBUG is set.
+        archive: Optional path of the ``.gz`` archive to write.
+        max_archive_bytes: Cap on the uncompressed archived output.
+        tail_lines: Number of lines kept in memory.
+    """
+
+    def __init__(self, passthrough=None, archive=None,
+                 max_archive_bytes=100 * 1024 * 1024, tail_lines=500):
+        self._lock = threading.Lock()
+        self._passthrough = passthrough
+        self._tail: Deque[str] = collections.deque(maxlen=tail_lines)
+        self.archive = archive
+        self._archive_file = None
+        self._max_archive_bytes = max_archive_bytes
+        self.archived_bytes = 0
+        self.dropped_lines = 0
+        self.closed = False
+        # Set by the first line over the cap; every later line is dropped
+        # too, so the dropped lines are always the end of the output
+        self._truncated = False
+        if archive:
+            os.makedirs(os.path.dirname(os.path.abspath(archive)),
+                        exist_ok=True)
+            self._archive_file = gzip.open(archive, 'wt', encoding='utf-8',
+                                           compresslevel=6)
+
+    def write(self, text):
+        with self._lock:
+            if self.closed:
+                raise ValueError('write to closed HostLogCapture')
+            self._tail.append(text)
+            if self._archive_file is not None:
+                size = len(text.encode('utf-8'))
+                if (not self._truncated
+                        and self.archived_bytes + size <= self._max_archive_bytes):
+                    self._archive_file.write(text)
+                    self.archived_bytes += size
+                else:
+                    self._truncated = True
+                    self.dropped_lines += 1
+        if self._passthrough is not None:
+            self._passthrough.write(text)
+
+    def flush(self):
+        if self._passthrough is not None:
+            self._passthrough.flush()
+
+    def tail(self):
+        """Return the retained end of the host output as one string."""
+        with self._lock:
+            return ''.join(self._tail)
+
+    def close(self):
+        """Finish the archive; the in-memory tail stays readable."""
+        with self._lock:
+            if self.closed:
+                return
+            self.closed = True
+            if self._archive_file is None:
+                return
+            if self.dropped_lines:
+                # Lines that were dropped and are still in the tail
+                retained = list(self._tail)[-self.dropped_lines:]
+                omitted = self.dropped_lines - len(retained)
+                self._archive_file.write(
+                    f'\n... archive size limit of {self._max_archive_bytes} '
+                    f'bytes reached; {omitted} line(s) omitted, '
+                    f'last {len(retained)} line(s) follow ...\n\n')
+                self._archive_file.writelines(retained)
+            self._archive_file.close()
+            self._archive_file = None
+
+
+class HostLogReader:
+    """Reads host output from a pipe, tees it and feeds a HostLogIndex."""
+
+    def __init__(self, pipe, sink=None, index=None):
+        self._pipe = pipe
+        self._sink = sink
+        self.index = index if index is not None else HostLogIndex()
+        self._thread = threading.Thread(target=self._run,
+                                        name='host-log-reader', daemon=True)
+
+    def start(self):
+        self._thread.start()
+        return self
+
+    def join(self, timeout=None):
+        self._thread.join(timeout)
+
+    def _run(self):
+        try:
+            for raw in iter(self._pipe.readline, b''):
+                text = raw.decode('utf-8', errors='replace')
+                if self._sink is not None:
+                    try:
+                        self._sink.write(text)
+                        self._sink.flush()
+                    except (ValueError, OSError):
+                        # Sink was closed during teardown; keep indexing
+                        self._sink = None
+                self.index.feed(text)
+        except (ValueError, OSError):
+            pass  # Pipe closed while the host was shutting down
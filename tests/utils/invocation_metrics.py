@@ -0,0 +1,92 @@
+# Copyright (c) Microsoft Corporation. All rights reserved.
+# Licensed under the MIT License.
+"""Per-function invocation statistics extracted from host logs.
+
+The host logs ``Executed 'Functions.X' (<status>, Id=..., Duration=Nms)``
+for every invocation. WebHostTestCase collects those records from its
+HostLogIndex and, when INVOCATION_REPORT_DIR is set, writes one JSON and
+one CSV report per test class so execution times can be tracked per
+binding across bundle and host versions.
+"""
+
+import csv
+import json
+import math
+import os
+import pathlib
+
+CSV_FIELDS = ['function', 'count', 'succeeded', 'failed', 'error_rate',
+              'mean_ms', 'p50_ms', 'p95_ms', 'p99_ms', 'max_ms']
+
+
+def percentile(values, pct):
+    """Return the ``pct`` percentile of ``values`` (linear interpolation)."""
+    if not values:
+        return None
+    ordered = sorted(values)
+    rank = (len(ordered) - 1) * pct / 100.0
+    low, high = math.floor(rank), math.ceil(rank)
+    if low == high:
+        return float(ordered[low])
+    return ordered[low] + (ordered[high] - ordered[low]) * (rank - low)
+
+
+def summarize_invocations(invocations):
+    """Aggregate completed invocations into per-function statistics.
+
+    Args:
+        invocations: Iterable of host_logs.Invocation. Invocations that are
+            still running (no status yet) are ignored.
+
+    Returns:
+        Dict mapping function name to its statistics, sorted by name.
+    """
+    durations = {}
+    failures = {}
+    for inv in invocations:
+        if inv.status is None:
+            continue
+        durations.setdefault(inv.function_name, []).append(inv.duration_ms)
+        if not inv.succeeded:
+            failures[inv.function_name] = failures.get(inv.function_name, 0) + 1
+
+    summary = {}
+    for name in sorted(durations):
+        values = durations[name]
+        failed = failures.get(name, 0)
+        summary[name] = {
+            'count': len(values),
+            'succeeded': len(values) - failed,
+            'failed': failed,
+            'error_rate': round(failed / len(values), 4),
+            'mean_ms': round(sum(values) / len(values), 2),
+            'p50_ms': percentile(values, 50),
+            'p95_ms': percentile(values, 95),
+            'p99_ms': percentile(values, 99),
+            'max_ms': max(values),
+        }
+    return summary
+
+
+def write_invocation_report(summary, directory, name, metadata=None):
+    """Write ``<name>_invocations.json`` and ``.csv`` into ``directory``.
+
+    Returns:
+        The paths of the JSON and CSV files.
+    """
+    directory = pathlib.Path(directory)
+    os.makedirs(directory, exist_ok=True)
+
+    json_path = directory / f'{name}_invocations.json'
+    with open(json_path, 'w') as f:
+        json.dump({'metadata': metadata or {}, 'functions': summary},
+                  f, indent=2)
+
+    csv_path = directory / f'{name}_invocations.csv'
+    with open(csv_path, 'w', newline='') as f:
+        writer = csv.DictWriter(f, fieldnames=CSV_FIELDS)
+        writer.writeheader()
+        for function_name, stats in summary.items():
+            writer.writerow({'function': function_name, **stats})
+
+    return json_path, csv_path
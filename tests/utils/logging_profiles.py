@@ -0,0 +1,86 @@
+# Copyright (c) Microsoft Corporation. All rights reserved.
+# Licensed under the MIT License.
+"""Named host logging profiles.
+
+A profile sets the host.json log levels per category, the console logging
+mode and whether Core Tools runs with ``--verbose``. The profile is picked
+with WEBHOST_LOG_PROFILE (default: ``debug``, the historical behavior):
+
+* ``debug``: everything at Trace, for investigating failures locally.
+* ``ci``: Information by default, with startup details at Debug so failed
+  runs can still be diagnosed.
+* ``benchmark``: warnings only, so throughput and latency numbers are not
+  skewed by logging.
+
+Every profile keeps the ``Function`` category at Information: the harness
+reads the ``Executing``/``Executed`` lines from the host output to wait
+for invocations and to build latency reports.
+"""
+
+import dataclasses
+import os
+from typing import Dict, Optional
+
+# Environment variable selecting the logging profile
+WEBHOST_LOG_PROFILE = 'WEBHOST_LOG_PROFILE'
+DEFAULT_LOG_PROFILE = 'debug'
+
+
+@dataclasses.dataclass(frozen=True)
+class LoggingProfile:
+    """Host logging configuration for one kind of test run."""
+    name: str
+    log_levels: Dict[str, str]
+    # Value for host:logger:consoleLoggingMode, or None for the host default
+    console_logging_mode: Optional[str]
+    verbose: bool
+
+
+LOGGING_PROFILES = {
+    'debug': LoggingProfile(
+        name='debug',
+        log_levels={'default': 'Trace'},
+        console_logging_mode='always',
+        verbose=True,
+    ),
+    'ci': LoggingProfile(
+        name='ci',
+        log_levels={
+            'default': 'Information',
+            'Host.Startup': 'Debug',
+            'Function': 'Information',
+        },
+        console_logging_mode='always',
+        verbose=True,
+    ),
+    'benchmark': LoggingProfile(
+        name='benchmark',
+        log_levels={
+            'default': 'Warning',
+            'Host.Startup': 'Information',
+            'Function': 'Information',
+            'Host.Function.Console': 'Warning',
+        },
+        console_logging_mode=None,
+        verbose=False,
+    ),
+}
+
+
+def get_logging_profile(name=None):
+    """Return the LoggingProfile called ``name``.
+
+    Args:
+        name: Profile name, or None to use WEBHOST_LOG_PROFILE.
+
+    Raises:
+        ValueError: If the profile does not exist.
+    """
+    if name is None:
+        name = os.environ.get(WEBHOST_LOG_PROFILE) or DEFAULT_LOG_PROFILE
+    try:
+        return LOGGING_PROFILES[name.strip().lower()]
+    except KeyError:
+        raise ValueError(
+            f"Unknown logging profile '{name}'. "
+            f"Valid profiles: {', '.join(LOGGING_PROFILES)}") from None
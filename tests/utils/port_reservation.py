@@ -0,0 +1,176 @@
+# Copyright (c) Microsoft Corporation. All rights reserved.
+# Licensed under the MIT License.
+"""Cross-process port reservation for concurrently started hosts.
+
+Asking the OS for a free port (binding port 0) and passing it to
+``func host start --port`` leaves a window in which another test process
+can be handed the same port. Ports are therefore leased from a table
+shared by all test processes on the machine: a JSON file guarded by an
+exclusive file lock, in PORT_LEASE_DIR (default: a folder in the system
+temp directory). A port is never handed out while another live process
+holds a lease on it; leases of exited processes, or older than
+``max_age`` seconds, are reclaimed.
+"""
+
+import contextlib
+import json
+import os
+import pathlib
+import socket
+import tempfile
+import time
+
+try:
+    import fcntl
+except ImportError:  # Windows
+    fcntl = None
+    import msvcrt
+
+PORT_LEASE_DIR = 'PORT_LEASE_DIR'
+LOCALHOST = '127.0.0.1'
+
+
+def _get_lease_dir():
+    return pathlib.Path(os.environ.get(PORT_LEASE_DIR)
+                        or pathlib.Path(tempfile.gettempdir()) / 'functions-test-ports')
+
+
+@contextlib.contextmanager
+def _exclusive_lock(path):
+    """Hold an exclusive lock on ``path`` across processes."""
+    with open(path, 'a+') as f:
+        if fcntl is not None:
+            fcntl.flock(f, fcntl.LOCK_EX)
+        else:
+            f.seek(0)
+            while True:
+                try:
+                    msvcrt.locking(f.fileno(), msvcrt.LK_LOCK, 1)
+                    break
+                except OSError:
+                    pass  # LK_LOCK gives up after ~10s; keep waiting
+        try:
+            yield
+        finally:
+            if fcntl is not None:
+                fcntl.flock(f, fcntl.LOCK_UN)
+            else:
+                f.seek(0)
+                msvcrt.locking(f.fileno(), msvcrt.LK_UNLCK, 1)
+
+
+def _pid_alive(pid):
+    if pid == os.getpid():
+        return True
+    if fcntl is None:
+        # os.kill(pid, 0) would terminate the process on Windows
+        try:
+            import psutil
+        except ImportError:
+            return True  # Rely on max_age instead
+        return psutil.pid_exists(pid)
+    try:
+        os.kill(pid, 0)
+    except ProcessLookupError:
+        return False
+    except (PermissionError, OSError):
+        # Exists but belongs to someone else, or the check is unsupported
+        return True
+    return True
+
+
+class PortLease:
+    """A port reserved for this process until release() is called."""
+
+    def __init__(self, port, table):
+        self.port = port
+        self._table = table
+
+    def release(self):
+        if self._table is not None:
+            self._table.release(self.port)
+            self._table = None
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc_info):
+        self.release()
+
+    def __repr__(self):
+        return f'PortLease(port={self.port})'
+
+
+class PortLeaseTable:
+    """Lease table shared by all processes using the same directory."""
+
+    def __init__(self, directory=None, max_age=6 * 60 * 60):
+        self.directory = pathlib.Path(directory or _get_lease_dir())
+        self.max_age = max_age
+        os.makedirs(self.directory, exist_ok=True)
+        self._lock_path = self.directory / 'ports.lock'
+        self._leases_path = self.directory / 'ports.json'
+
+    def _read(self):
+        try:
+            with open(self._leases_path) as f:
+                return json.load(f)
+        except (FileNotFoundError, json.JSONDecodeError):
+            return {}
+
+    def _write(self, leases):
+        tmp = self._leases_path.with_suffix(f'.{os.getpid()}.tmp')
+        with open(tmp, 'w') as f:
+            json.dump(leases, f)
+        os.replace(tmp, self._leases_path)
+
+    def _live(self, leases):
+        now = time.time()
+        return {port: lease for port, lease in leases.items()
+                if now - lease['leased_at'] < self.max_age
+                and _pid_alive(lease['pid'])}
+
+    def reserve(self, attempts=50):
+        """Lease a port that is free now and not leased by anyone else.
+
+        Raises:
+            RuntimeError: If no port could be reserved.
+        """
+        with _exclusive_lock(self._lock_path):
+            leases = self._live(self._read())
+            for _ in range(attempts):
+                with socket.socket() as s:
+                    s.bind((LOCALHOST, 0))
+                    port = s.getsockname()[1]
+                if str(port) in leases:
+                    continue
+                leases[str(port)] = {'pid': os.getpid(),
+                                     'leased_at': time.time()}
+                self._write(leases)
+                return PortLease(port, self)
+        raise RuntimeError(f"Could not reserve a free port after {attempts} attempts")
+
+    def release(self, port):
+        with _exclusive_lock(self._lock_path):
+            leases = self._live(self._read())
+            lease = leases.get(str(port))
+            if lease is not None and lease['pid'] == os.getpid():
+                del leases[str(port)]
+            self._write(leases)
+
+    def leases(self):
+        """Return the live leases as ``{port: pid}``."""
+        with _exclusive_lock(self._lock_path):
+            return {int(port): lease['pid']
+                    for port, lease in self._live(self._read()).items()}
+
+
+_table = None
+
+
+def reserve_port():
+    """Lease a port from the machine-wide table in PORT_LEASE_DIR."""
+    global _table
+    if _table is None or _table.directory != _get_lease_dir():
+        _table = PortLeaseTable()
+    return _table.reserve()
@@ -0,0 +1,184 @@
+# Copyright (c) Microsoft Corporation. All rights reserved.
+# Licensed under the MIT License.
+"""Background sampling of host and worker resource usage.
+
+start_webhost starts a ResourceSampler for the ``func`` process. At every
+interval it walks the process tree (the host plus its language worker
+children) and records the total RSS, CPU%, thread count and open handles
+(file descriptors on POSIX, handles on Windows). WebHostTestCase logs the
+peak/average summary at teardown and, when RESOURCE_REPORT_DIR is set,
+writes the full time series per test class.
+
+psutil is optional: without it the sampler logs a warning and records
+nothing.
+"""
+
+import csv
+import dataclasses
+import json
+import logging
+import os
+import pathlib
+import threading
+import time
+from typing import List
+
+try:
+    import psutil
+except ImportError:  # pragma: no cover - depends on the environment
+    psutil = None
+
+METRICS = ['rss_mb', 'cpu_percent', 'threads', 'handles']
+CSV_FIELDS = ['elapsed_s', 'processes', 'worker_processes'] + METRICS
+
+
+@dataclasses.dataclass
+class ResourceSample:
+    """Resource usage of the whole host process tree at one point in time."""
+    elapsed_s: float
+    processes: int
+    worker_processes: int
+    rss_mb: float
+    cpu_percent: float
+    threads: int
+    handles: int
+
+
+def _is_worker(proc):
+    try:
+        return 'python' in proc.name().lower()
+    except (psutil.NoSuchProcess, psutil.AccessDenied):
+        return False
+
+
+def _handles(proc):
+    if hasattr(proc, 'num_fds'):
+        return proc.num_fds()
+    return proc.num_handles()
+
+
+class ResourceSampler:
+    """Samples a process tree on a background thread."""
+
+    def __init__(self, pid, interval=1.0):
+        self.pid = pid
+        self.interval = interval
+        self.samples: List[ResourceSample] = []
+        # psutil.Process objects are kept so cpu_percent() measures the
+        # time since the previous sample of the same process
+        self._processes = {}
+        self._stop = threading.Event()
+        self._thread = threading.Thread(target=self._run,
+                                        name='resource-sampler', daemon=True)
+        self._started = None
+
+    def start(self):
+        if psutil is None:
+            logging.warning("psutil package not available. "
+                            "Host resource usage will not be sampled.")
+            return self
+        self._started = time.monotonic()
+        self._thread.start()
+        return self
+
+    def stop(self):
+        """Stop sampling and return the samples collected so far."""
+        self._stop.set()
+        if self._thread.is_alive():
+            self._thread.join(self.interval + 5)
+        return self.samples
+
+    def _run(self):
+        while not self._stop.is_set():
+            try:
+                sample = self.sample()
+            except psutil.NoSuchProcess:
+                break  # The host exited
+            if sample is not None:
+                self.samples.append(sample)
+            self._stop.wait(self.interval)
+
+    def _tree(self):
+        root = self._processes.get(self.pid)
+        if root is None:
+            root = self._processes[self.pid] = psutil.Process(self.pid)
+        tree = [root]
+        for child in root.children(recursive=True):
+            tree.append(self._processes.setdefault(child.pid, child))
+        return tree
+
+    def sample(self):
+        """Take one sample of the process tree, or None if it is gone."""
+        totals = dict(processes=0, worker_processes=0, rss=0, cpu=0.0,
+                      threads=0, handles=0)
+        for proc in self._tree():
+            try:
+                with proc.oneshot():
+                    totals['rss'] += proc.memory_info().rss
+                    totals['cpu'] += proc.cpu_percent(None)
+                    totals['threads'] += proc.num_threads()
+                    totals['handles'] += _handles(proc)
+            except (psutil.NoSuchProcess, psutil.ZombieProcess):
+                self._processes.pop(proc.pid, None)
+                continue
+            except psutil.AccessDenied:
+                continue
+            totals['processes'] += 1
+            totals['worker_processes'] += _is_worker(proc)
+
+        if not totals['processes']:
+            return None
+        return ResourceSample(
+            elapsed_s=round(time.monotonic() - self._started, 3),
+            processes=totals['processes'],
+            worker_processes=totals['worker_processes'],
+            rss_mb=round(totals['rss'] / (1024 * 1024), 2),
+            cpu_percent=round(totals['cpu'], 1),
+            threads=totals['threads'],
+            handles=totals['handles'],
+        )
+
+
+def summarize_samples(samples):
+    """Return the peak and average of each metric in ``samples``.
+
+    The first sample is left out of the CPU average: psutil reports 0% for
+    a process the first time it is measured.
+    """
+    if not samples:
+        return {}
+    summary = {'samples': len(samples),
+               'duration_s': samples[-1].elapsed_s - samples[0].elapsed_s}
+    for metric in METRICS:
+        values = [getattr(s, metric) for s in samples]
+        if metric == 'cpu_percent' and len(values) > 1:
+            values = values[1:]
+        summary[metric] = {'peak': max(values),
+                           'avg': round(sum(values) / len(values), 2)}
+    return summary
+
+
+def write_resource_report(samples, directory, name, metadata=None):
+    """Write ``<name>_resources.json`` and ``.csv`` into ``directory``.
+
+    Returns:
+        The paths of the JSON and CSV files.
+    """
+    directory = pathlib.Path(directory)
+    os.makedirs(directory, exist_ok=True)
+
+    json_path = directory / f'{name}_resources.json'
+    with open(json_path, 'w') as f:
+        json.dump({'metadata': metadata or {},
+                   'summary': summarize_samples(samples),
+                   'samples': [dataclasses.asdict(s) for s in samples]},
+                  f, indent=2)
+
+    csv_path = directory / f'{name}_resources.csv'
+    with open(csv_path, 'w', newline='') as f:
+        writer = csv.DictWriter(f, fieldnames=CSV_FIELDS)
+        writer.writeheader()
+        for sample in samples:
+            writer.writerow(dataclasses.asdict(sample))
+
+    return json_path, csv_path
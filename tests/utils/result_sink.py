@@ -0,0 +1,133 @@
+# Copyright (c) Microsoft Corporation. All rights reserved.
+# Licensed under the MIT License.
+"""Local HTTP collector for trigger results pushed by function apps.
+
+Trigger functions used to write their result into a fixed blob which the
+tests then polled back through an HTTP function. Instead, the harness
+starts a ResultSink and exposes its address to the host as the
+RESULT_SINK_URL app setting. Trigger functions POST their payload to
+``{RESULT_SINK_URL}/<key>`` (by convention the trigger function name) and
+the test blocks on ``wait_for(key, match=...)`` until a matching payload
+arrives, so verification latency is the trigger latency alone.
+"""
+
+import json
+import logging
+import threading
+import time
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from urllib.parse import unquote
+
+logger = logging.getLogger(__name__)
+
+
+class _ResultHandler(BaseHTTPRequestHandler):
+    """Accepts POST /<key> with a JSON (or plain text) body."""
+
+    def do_POST(self):
+        key = unquote(self.path.strip('/'))
+        if not key:
+            self.send_response(400)
+            self.end_headers()
+            return
+
+        length = int(self.headers.get('Content-Length') or 0)
+        body = self.rfile.read(length).decode('utf-8')
+        try:
+            payload = json.loads(body)
+        except ValueError:
+            payload = body
+
+        self.server.sink.record(key, payload)
+        self.send_response(204)
+        self.end_headers()
+
+    def log_message(self, format, *args):
+        pass  # Results are logged by the sink itself
+
+
+class ResultSink:
+    """In-memory store of pushed trigger results with blocking lookups."""
+
+    def __init__(self, host='127.0.0.1', port=0):
+        self._server = ThreadingHTTPServer((host, port), _ResultHandler)
+        self._server.daemon_threads = True
+        self._server.sink = self
+        self._thread = None
+        self._results = {}
+        self._condition = threading.Condition()
+
+    @property
+    def url(self):
+        host, port = self._server.server_address[:2]
+        return f'http://{host}:{port}'
+
+    def start(self):
+        """Serve requests on a background daemon thread."""
+        if self._thread is None:
+            self._thread = threading.Thread(
+                target=self._server.serve_forever,
+                name='result-sink', daemon=True)
+            self._thread.start()
+            logger.info(f"Result sink listening on {self.url}")
+        return self
+
+    def close(self):
+        """Stop serving and release the port."""
+        if self._thread is not None:
+            self._server.shutdown()
+            self._thread.join()
+            self._thread = None
+        self._server.server_close()
+
+    def record(self, key, payload):
+        """Store a payload under ``key`` and wake up waiting tests."""
+        with self._condition:
+            self._results.setdefault(key, []).append(payload)
+            self._condition.notify_all()
+        logger.debug(f"Result sink received result for {key}")
+
+    def results(self, key):
+        """Return a copy of all payloads received for ``key``."""
+        with self._condition:
+            return list(self._results.get(key, ()))
+
+    def clear(self, key=None):
+        """Forget the payloads for ``key``, or for every key if omitted."""
+        with self._condition:
+            if key is None:
+                self._results.clear()
+            else:
+                self._results.pop(key, None)
+
+    def wait_for(self, key, match=None, timeout=30):
+        """Block until a payload for ``key`` satisfying ``match`` arrives.
+
+        Args:
+            key: Correlation key the function app posts under.
+            match: Optional predicate on the payload. Payloads that do not
+                match (e.g. left over from an earlier test) are skipped.
+            timeout: Maximum seconds to wait (default: 30).
+
+        Returns:
+            The first matching payload.
+
+        Raises:
+            TimeoutError: If no matching payload arrives within the timeout.
+        """
+        deadline = time.monotonic() + timeout
+        with self._condition:
+            while True:
+                for payload in self._results.get(key, ()):
+                    if match is None or match(payload):
+                        return payload
+                remaining = deadline - time.monotonic()
+                if remaining <= 0:
+                    break
+                self._condition.wait(remaining)
+
+        received = len(self.results(key))
+        raise TimeoutError(
+            f"No matching result for '{key}' within {timeout}s "
+            f"({received} non-matching result(s) received)"
+        )
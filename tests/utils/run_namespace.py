@@ -0,0 +1,123 @@
+# Copyright (c) Microsoft Corporation. All rights reserved.
+# Licensed under the MIT License.
+"""Per-run names for the emulator resources function apps use.
+
+Function apps do not hard-code blob paths, storage queues, Kafka topics or
+RabbitMQ queues; they reference the RUN_ID app setting through binding
+expressions::
+
+    @app.blob_output(arg_name="$return",
+                     path="bundle-tests/%RUN_ID%/test-str.txt", ...)
+    @app.queue_trigger(arg_name="msg", queue_name="testqueue-%RUN_ID%", ...)
+
+start_webhost passes RUN_ID to every host, so concurrent runs (and the
+pytest-xdist workers of one run) against the same emulators each get
+their own blobs, queues and topics. RUN_ID defaults to a random id per
+test process; when it is set explicitly (e.g. to the CI build id) the
+xdist worker id is appended so workers still do not share names.
+
+The Event Hubs and Service Bus emulators only serve the entities declared
+in their config.json, so those names stay fixed; the blobs their apps
+write are still per run.
+"""
+
+import logging
+import os
+import re
+import uuid
+
+from tests.utils.env import is_envvar_true
+
+# App setting (and environment variable) holding the run namespace
+RUN_ID = 'RUN_ID'
+# Leave the run's blobs and queues in the emulators after the tests
+KEEP_RUN_RESOURCES = 'KEEP_RUN_RESOURCES'
+# Container that all function apps write their blobs into
+BLOB_CONTAINER = 'bundle-tests'
+
+_run_id = None
+
+
+def _sanitize(value):
+    # Queue, topic and container names allow lowercase letters, digits
+    # and single dashes
+    value = re.sub(r'[^a-z0-9]+', '-', value.lower())
+    return value.strip('-')
+
+
+def get_run_id():
+    """Return the namespace of this test process.
+
+    RUN_ID if set (plus the xdist worker id), otherwise a random id that
+    stays the same for the life of the process.
+    """
+    global _run_id
+    if _run_id is None:
+        base = _sanitize(os.environ.get(RUN_ID, '')) or uuid.uuid4().hex[:8]
+        worker = os.environ.get('PYTEST_XDIST_WORKER')
+        _run_id = f'{base}-{_sanitize(worker)}' if worker else base
+    return _run_id
+
+
+def scoped_name(name):
+    """Return ``name`` in this run's namespace, e.g. ``testqueue-1a2b3c4d``.
+
+    Matches what ``<name>-%RUN_ID%`` resolves to in a binding.
+    """
+    return f'{name}-{get_run_id()}'
+
+
+def scoped_blob_path(blob_name):
+    """Return the path ``bundle-tests/%RUN_ID%/<blob_name>`` resolves to."""
+    return f'{BLOB_CONTAINER}/{get_run_id()}/{blob_name}'
+
+
+def keep_run_resources():
+    """Return whether KEEP_RUN_RESOURCES asks to keep this run's blobs and queues."""
+    return is_envvar_true(KEEP_RUN_RESOURCES)
+
+
+def delete_run_blobs(connection_string):
+    """Delete every blob under ``bundle-tests/<run id>/``.
+
+    Needs azure-storage-blob; without it nothing is deleted.
+
+    Returns:
+        The number of blobs deleted.
+    """
+    try:
+        from azure.storage.blob import ContainerClient
+    except ImportError:
+        logging.warning("azure-storage-blob package not available. "
+                        "Blobs of run %s will not be deleted.", get_run_id())
+        return 0
+
+    container = ContainerClient.from_connection_string(connection_string,
+                                                       BLOB_CONTAINER)
+    if not container.exists():
+        return 0
+    names = [blob.name for blob in
+             container.list_blobs(name_starts_with=f'{get_run_id()}/')]
+    for name in names:
+        container.delete_blob(name, delete_snapshots='include')
+    return len(names)
+
+
+def delete_run_queues(connection_string, names):
+    """Delete the storage queues ``<name>-<run id>`` for each of ``names``.
+
+    Needs azure-storage-queue; without it nothing is deleted.
+    """
+    try:
+        from azure.core.exceptions import ResourceNotFoundError
+        from azure.storage.queue import QueueServiceClient
+    except ImportError:
+        logging.warning("azure-storage-queue package not available. "
+                        "Queues of run %s will not be deleted.", get_run_id())
+        return
+    service = QueueServiceClient.from_connection_string(connection_string)
+    for name in names:
+        try:
+            service.delete_queue(scoped_name(name))
+        except ResourceNotFoundError:
+            pass
@@ -0,0 +1,249 @@
+# Copyright (c) Microsoft Corporation. All rights reserved.
+# Licensed under the MIT License.
+"""Startup phase breakdown for Azure Functions hosts started by the tests.
+
+start_webhost records when the host process was launched and when its
+health check first passed. The lines indexed by HostLogIndex in between
+are matched against STARTUP_PHASES to split the startup time into bundle
+resolution, download, extraction, extension loading, worker start and
+function indexing. Requests served by the mock extension site (see
+MOCK_SITE_ACCESS_LOG in test_setup.py) and the load time of each bundle
+extension (see extension_load.py) are attached to the same timeline.
+
+The profile can be written as a plain JSON timeline or as a Chrome
+trace-event file that opens in chrome://tracing or https://ui.perfetto.dev.
+"""
+
+import dataclasses
+import json
+import os
+import pathlib
+import re
+from typing import List, Optional
+
+from tests.utils.extension_load import EXTENSIONS_DONE_RE, ExtensionLoad, extension_load_times
+
+# Access log written by the mock extension site, one JSON object per line
+MOCK_SITE_ACCESS_LOG = 'MOCK_SITE_ACCESS_LOG'
+
+# (phase, start pattern, end pattern). A phase starts at the first line
+# matching its start pattern and ends at the first later line matching its
+# end pattern; phases whose end is never logged are closed at the start of
+# the next phase that was seen, or at the moment the host became healthy.
+STARTUP_PHASES = [
+    ('bundle_resolution',
+     re.compile(r'Looking for extension bundle'),
+     re.compile(r'Found a matching extension bundle|Downloading extension bundle'
+                r'|Loading extension bundle from')),
+    ('bundle_download',
+     re.compile(r'Downloading extension bundle'),
+     re.compile(r'Extracting extension bundle|Zip extraction complete')),
+    ('bundle_extraction',
+     re.compile(r'Extracting extension bundle'),
+     re.compile(r'Zip extraction complete')),
+    ('extension_loading',
+     re.compile(r'Loading extension bundle from|Loading startup extension'),
+     EXTENSIONS_DONE_RE),
+    ('worker_start',
+     re.compile(r'Starting (?:language )?worker process|'
+                r'Fetching metadata for workerRuntime', re.IGNORECASE),
+     re.compile(r'Worker process started and initialized', re.IGNORECASE)),
+    ('function_indexing',
+     re.compile(r'Loading functions metadata|Reading functions metadata'),
+     re.compile(r'\d+ functions? (?:found|loaded)')),
+]
+
+
+@dataclasses.dataclass
+class Phase:
+    """A startup phase, in seconds relative to the host process launch."""
+    name: str
+    start: float
+    end: float
+    start_line: Optional[str] = None
+    end_line: Optional[str] = None
+
+    @property
+    def duration(self):
+        return self.end - self.start
+
+
+@dataclasses.dataclass
+class Request:
+    """A request served by the mock extension site during startup."""
+    path: str
+    start: float
+    duration: float
+    status: Optional[int] = None
+    size: Optional[int] = None
+
+
+@dataclasses.dataclass
+class StartupProfile:
+    """Timeline of a single host startup."""
+    total: float
+    phases: List[Phase]
+    requests: List[Request]
+    first_output: Optional[float] = None
+    metadata: dict = dataclasses.field(default_factory=dict)
+    extensions: List[ExtensionLoad] = dataclasses.field(default_factory=list)
+
+    def to_dict(self):
+        return {
+            'metadata': self.metadata,
+            'total_s': round(self.total, 3),
+            'first_output_s': (round(self.first_output, 3)
+                               if self.first_output is not None else None),
+            'phases': [
+                {'name': p.name, 'start_s': round(p.start, 3),
+                 'end_s': round(p.end, 3), 'duration_s': round(p.duration, 3),
+                 'start_line': p.start_line, 'end_line': p.end_line}
+                for p in self.phases],
+            'requests': [dataclasses.asdict(r) for r in self.requests],
+            'extensions': [e.to_dict() for e in self.extensions],
+        }
+
+    def to_chrome_trace(self, pid=1):
+        """Return the profile as a Chrome trace-event JSON object."""
+        def us(seconds):
+            return round(seconds * 1_000_000)
+
+        events = [
+            {'name': 'process_name', 'ph': 'M', 'pid': pid,
+             'args': {'name': self.metadata.get('name', 'func host start')}},
+            {'name': 'thread_name', 'ph': 'M', 'pid': pid, 'tid': 1,
+             'args': {'name': 'host startup'}},
+            {'name': 'thread_name', 'ph': 'M', 'pid': pid, 'tid': 2,
+             'args': {'name': 'mock extension site'}},
+            {'name': 'thread_name', 'ph': 'M', 'pid': pid, 'tid': 3,
+             'args': {'name': 'extensions'}},
+            {'name': 'startup', 'cat': 'host', 'ph': 'X', 'pid': pid,
+             'tid': 1, 'ts': 0, 'dur': us(self.total)},
+        ]
+        for phase in self.phases:
+            events.append({
+                'name': phase.name, 'cat': 'phase', 'ph': 'X', 'pid': pid,
+                'tid': 1, 'ts': us(phase.start), 'dur': us(phase.duration),
+                'args': {'start': phase.start_line, 'end': phase.end_line}})
+        for request in self.requests:
+            events.append({
+                'name': request.path, 'cat': 'mock_site', 'ph': 'X',
+                'pid': pid, 'tid': 2, 'ts': us(request.start),
+                'dur': us(request.duration),
+                'args': {'status': request.status, 'size': request.size}})
+        for extension in self.extensions:
+            events.append({
+                'name': extension.name, 'cat': 'extension', 'ph': 'X',
+                'pid': pid, 'tid': 3, 'ts': us(extension.start),
+                'dur': us(extension.total),
+                'args': {'version': extension.version,
+                         'load_s': round(extension.load, 3),
+                         'init_s': round(extension.init, 3)}})
+        return {'traceEvents': events, 'displayTimeUnit': 'ms',
+                'otherData': self.metadata}
+
+    def summary(self):
+        """One-line description of where startup time went."""
+        parts = [f'{p.name}={p.duration:.2f}s' for p in self.phases]
+        return f"startup {self.total:.2f}s: {', '.join(parts) or 'no phases logged'}"
+
+
+def build_startup_profile(lines, launched, launched_wall, ready,
+                          access_log=None, metadata=None, bundle=None):
+    """Split a host startup into phases.
+
+    Args:
+        lines: host_logs.LogLine objects read from the host output.
+        launched: time.monotonic() just before the host process was started.
+        launched_wall: time.time() taken at the same moment, used to place
+            mock site requests (logged in wall-clock time) on the timeline.
+        ready: time.monotonic() when the host first reported healthy.
+        access_log: Optional path of the mock site access log.
+        metadata: Optional dict stored with the profile.
+        bundle: Optional BundleMetadata of the bundle under test, to map
+            the extensions the host loads to their package ids.
+
+    Returns:
+        A StartupProfile with times in seconds relative to ``launched``.
+    """
+    lines = [line for line in lines if line.received <= ready]
+    total = ready - launched
+
+    found = []
+    for name, start_re, end_re in STARTUP_PHASES:
+        start = next((i for i, line in enumerate(lines)
+                      if start_re.search(line.text)), None)
+        if start is None:
+            continue
+        end = next((i for i in range(start + 1, len(lines))
+                    if end_re.search(lines[i].text)), None)
+        found.append((name, start, end))
+
+    phases = []
+    for name, start, end in found:
+        start_line = lines[start]
+        if end is not None:
+            end_time, end_text = lines[end].received, lines[end].text
+        else:
+            # Close the phase at the next phase that began after it
+            later = [lines[s].received for _, s, _ in found if s > start]
+            end_time, end_text = min(later, default=ready), None
+        phases.append(Phase(name=name, start=start_line.received - launched,
+                            end=end_time - launched,
+                            start_line=start_line.text, end_line=end_text))
+    phases.sort(key=lambda p: p.start)
+
+    requests = []
+    if access_log:
+        requests = [
+            Request(path=entry['path'],
+                    start=entry['time'] - launched_wall,
+                    duration=entry.get('duration', 0.0),
+                    status=entry.get('status'), size=entry.get('size'))
+            for entry in read_access_log(access_log)
+            if 0 <= entry['time'] - launched_wall <= total
+        ]
+
+    return StartupProfile(
+        total=total, phases=phases, requests=requests,
+        first_output=lines[0].received - launched if lines else None,
+        metadata=dict(metadata or {}),
+        extensions=extension_load_times(lines, launched, ready, bundle))
+
+
+def read_access_log(path):
+    """Return the entries of a mock site access log, skipping bad lines."""
+    entries = []
+    try:
+        with open(path) as f:
+            for raw in f:
+                try:
+                    entry = json.loads(raw)
+                except json.JSONDecodeError:
+                    continue  # Partially written line
+                if 'time' in entry and 'path' in entry:
+                    entries.append(entry)
+    except FileNotFoundError:
+        pass
+    return entries
+
+
+def write_startup_profile(profile, directory, name, chrome_trace=False):
+    """Write ``<name>_startup.json`` (and ``.trace.json``) into ``directory``.
+
+    Returns:
+        The paths written.
+    """
+    directory = pathlib.Path(directory)
+    os.makedirs(directory, exist_ok=True)
+
+    paths = [directory / f'{name}_startup.json']
+    with open(paths[0], 'w') as f:
+        json.dump(profile.to_dict(), f, indent=2)
+
+    if chrome_trace:
+        paths.append(directory / f'{name}_startup.trace.json')
+        with open(paths[1], 'w') as f:
+            json.dump(profile.to_chrome_trace(), f)
+
+    return paths
@@ -0,0 +1,173 @@
+# Copyright (c) Microsoft Corporation. All rights reserved.
+# Licensed under the MIT License.
+"""Cached installation of function app dependencies.
+
+Test classes list the libraries their function app needs in
+``get_libraries_to_install``. Those are installed into the app's
+``.python_packages/lib/site-packages`` (where the Python worker looks for
+them) in three steps:
+
+1. Wheels are downloaded once into a local wheelhouse (``WHEELHOUSE_DIR``,
+   default ``tests/build/wheelhouse``). With ``WHEELHOUSE_OFFLINE`` set,
+   nothing is downloaded and missing wheels are an error.
+2. Each distinct requirement set is installed once, from the wheelhouse
+   only, into a cache directory keyed by a hash of the requirements,
+   Python version and platform.
+3. The cached tree is hardlinked into the app, so identical sets across
+   apps and runs cost a directory walk instead of a pip install. Files
+   are copied where hardlinks are not possible (e.g. across devices).
+
+Removing ``.python_packages`` at teardown only removes the links.
+"""
+
+import hashlib
+import json
+import logging
+import os
+import pathlib
+import platform
+import shutil
+import subprocess
+import sys
+import tempfile
+
+from tests.utils.env import is_envvar_true
+
+WHEELHOUSE_DIR = 'WHEELHOUSE_DIR'
+# Install from the wheelhouse only, never from the network
+WHEELHOUSE_OFFLINE = 'WHEELHOUSE_OFFLINE'
+
+DEFAULT_WHEELHOUSE = pathlib.Path(__file__).parent.parent / 'build' / 'wheelhouse'
+SITE_PACKAGES = pathlib.Path('.python_packages') / 'lib' / 'site-packages'
+_COMPLETE_MARKER = '.wheelhouse-complete.json'
+
+
+def _normalize(requirement):
+    return ' '.join(requirement.split()).lower().replace('_', '-')
+
+
+def requirements_key(requirements, python_version=None):
+    """Return the cache key of a requirement set.
+
+    The key covers the normalized, de-duplicated requirements, the Python
+    major.minor version and the platform, since wheels differ by all three.
+    """
+    python_version = python_version or f'{sys.version_info.major}.{sys.version_info.minor}'
+    payload = json.dumps({
+        'requirements': sorted({_normalize(r) for r in requirements}),
+        'python': python_version,
+        'platform': f'{sys.platform}-{platform.machine().lower()}',
+    }, sort_keys=True)
+    return hashlib.sha256(payload.encode('utf-8')).hexdigest()[:16]
+
+
+def get_wheelhouse():
+    """Return the wheelhouse directory (WHEELHOUSE_DIR or the default)."""
+    return pathlib.Path(os.environ.get(WHEELHOUSE_DIR) or DEFAULT_WHEELHOUSE)
+
+
+def _pip(*args):
+    cmd = [sys.executable, '-m', 'pip', *args,
+           '--disable-pip-version-check', '--no-input', '--quiet']
+    logging.info(f"Running: {' '.join(cmd)}")
+    subprocess.run(cmd, check=True)
+
+
+def _install_from_wheelhouse(requirements, wheelhouse, target):
+    _pip('install', '--no-index', '--find-links', str(wheelhouse),
+         '--only-binary=:all:', '--target', str(target), *requirements)
+
+
+def build_cache(requirements, wheelhouse, cache_dir, offline=False):
+    """Install ``requirements`` into ``cache_dir`` using the wheelhouse.
+
+    Wheels missing from the wheelhouse are downloaded first unless
+    ``offline``. The tree is built in a temporary directory and renamed
+    into place, so concurrent workers never see a partial install.
+    """
+    cache_dir = pathlib.Path(cache_dir)
+    if (cache_dir / _COMPLETE_MARKER).exists():
+        return cache_dir
+
+    os.makedirs(wheelhouse, exist_ok=True)
+    os.makedirs(cache_dir.parent, exist_ok=True)
+    staging = pathlib.Path(tempfile.mkdtemp(prefix=f'{cache_dir.name}.',
+                                            dir=cache_dir.parent))
+    try:
+        try:
+            _install_from_wheelhouse(requirements, wheelhouse, staging)
+        except subprocess.CalledProcessError:
+            if offline:
+                raise RuntimeError(
+                    f"Wheels for {requirements} are missing from {wheelhouse} "
+                    f"and {WHEELHOUSE_OFFLINE} is set") from None
+            _pip('download', '--only-binary=:all:', '--dest', str(wheelhouse),
+                 *requirements)
+            _install_from_wheelhouse(requirements, wheelhouse, staging)
+
+        with open(staging / _COMPLETE_MARKER, 'w') as f:
+            json.dump({'requirements': list(requirements),
+                       'python': sys.version.split()[0]}, f)
+        try:
+            os.rename(staging, cache_dir)
+        except OSError:
+            # Another worker finished the same set first
+            if not (cache_dir / _COMPLETE_MARKER).exists():
+                raise
+    finally:
+        if staging.exists():
+            shutil.rmtree(staging, ignore_errors=True)
+    return cache_dir
+
+
+def materialize(source, target):
+    """Hardlink the tree at ``source`` into ``target`` (copying if needed).
+
+    Returns:
+        The number of files linked and copied, as a tuple.
+    """
+    source, target = pathlib.Path(source), pathlib.Path(target)
+    linked = copied = 0
+    for root, _, files in os.walk(source):
+        dest_root = target / pathlib.Path(root).relative_to(source)
+        os.makedirs(dest_root, exist_ok=True)
+        for name in files:
+            if name == _COMPLETE_MARKER:
+                continue
+            src, dest = pathlib.Path(root) / name, dest_root / name
+            if dest.exists():
+                dest.unlink()
+            try:
+                os.link(src, dest)
+                linked += 1
+            except OSError:
+                shutil.copy2(src, dest)
+                copied += 1
+    return linked, copied
+
+
+def install_libraries(app_root, requirements, wheelhouse=None, offline=None):
+    """Install ``requirements`` into ``app_root``'s .python_packages.
+
+    Args:
+        app_root: Function app directory.
+        requirements: pip requirement strings, e.g. ``['azure-eventhub']``.
+        wheelhouse: Wheel directory (default: WHEELHOUSE_DIR or
+            tests/build/wheelhouse).
+        offline: Never download (default: WHEELHOUSE_OFFLINE).
+
+    Returns:
+        The site-packages directory the libraries were placed in.
+    """
+    wheelhouse = pathlib.Path(wheelhouse or get_wheelhouse())
+    if offline is None:
+        offline = is_envvar_true(WHEELHOUSE_OFFLINE)
+
+    key = requirements_key(requirements)
+    cache_dir = build_cache(requirements, wheelhouse,
+                            wheelhouse / 'installed' / key, offline=offline)
+    target = pathlib.Path(app_root) / SITE_PACKAGES
+    linked, copied = materialize(cache_dir, target)
+    logging.info(f"Installed {requirements} into {target} from cache {key} "
+                 f"({linked} files linked, {copied} copied)")
+    return target